@@ -1,17 +1,23 @@
 from __future__ import annotations
 
+import calendar
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, timedelta
 from collections import defaultdict
+from statistics import median
+from typing import TYPE_CHECKING, Mapping, Sequence
 
 from expense_analyzer.parser import Transaction
-from expense_analyzer.categorize import categorize_transaction
-from expense_analyzer.normalize import normalize_description
+from expense_analyzer.categorize import DEFAULT_RULES, CategoryRule, categorize_many, enrich_many
+
+if TYPE_CHECKING:
+    from expense_analyzer.classifier import CategoryModel
+    from expense_analyzer.sketches import SpendingStats
 
 
 @dataclass(frozen=True)
 class Summary:
-    month: str  # YYYY-MM
+    month: str  # YYYY-MM (or another period key, see rollup.period_key)
     income_total: float
     expense_total: float
     net_total: float
@@ -26,6 +32,40 @@ class Alert:
     amount: float
     reason: str
 
+@dataclass(frozen=True)
+class RecurringCharge:
+    merchant: str
+    category: str
+    cadence: str  # weekly | monthly | yearly
+    typical_amount: float
+    annual_cost: float
+    occurrences: int
+    first_date: str
+    last_date: str
+    next_expected: str
+
+
+# cadence name -> (typical interval days, min interval, max interval, periods per year)
+# (the typical interval only classifies gaps; next dates step by calendar month/year)
+CADENCES: dict[str, tuple[int, int, int, float]] = {
+    "weekly": (7, 6, 8, 52.0),
+    "monthly": (30, 26, 35, 12.0),
+    "yearly": (365, 355, 375, 1.0),
+}
+
+
+def _next_charge(last: date, cadence: str) -> date:
+    """
+    The date one cadence after `last`: 7 days, or the same day one calendar
+    month/year later, clamped to the end of a shorter month (Jan 31 -> Feb 28).
+    """
+    if cadence == "weekly":
+        return last + timedelta(days=7)
+    months = 1 if cadence == "monthly" else 12
+    idx = last.year * 12 + last.month - 1 + months
+    year, month = divmod(idx, 12)
+    return date(year, month + 1, min(last.day, calendar.monthrange(year, month + 1)[1]))
+
 
 def month_key(d: date) -> str:
     """
@@ -34,29 +74,43 @@ def month_key(d: date) -> str:
     return f"{d.year:04d}-{d.month:02d}"
 
 
-def build_monthly_summary(transactions: list[Transaction]) -> dict[str, Summary]:
+def build_monthly_summary(
+    transactions: list[Transaction],
+    stats: SpendingStats | None = None,
+    aliases: Mapping[str, str] | None = None,
+    model: CategoryModel | None = None,
+    rules: Sequence[CategoryRule] = DEFAULT_RULES,
+) -> dict[str, Summary]:
     """
     Build one Summary per month.
 
     Conventions:
     - Income: amount > 0
     - Expense: amount < 0 (stored as positive totals in expense_total and by_category)
+    If `stats` is given, every expense is also fed into it in the same pass.
+    `rules`, `aliases` and `model` decide merchants and categories (see `enrich_many`).
     """
+    if stats is None:
+        categories = categorize_many(transactions, rules, aliases, model)
+    else:
+        merchants, categories = enrich_many(transactions, rules, aliases, model)
+        for txn, merchant, cat in zip(transactions, merchants, categories):
+            if txn.amount <= 0:
+                stats.add(merchant, cat, -txn.amount)
+
     # group transactions by month
-    buckets: dict[str, list[Transaction]] = defaultdict(list)
-    for txn in transactions:
-        buckets[month_key(txn.posted_date)].append(txn)
+    buckets: dict[str, list[tuple[Transaction, str]]] = defaultdict(list)
+    for txn, cat in zip(transactions, categories):
+        buckets[month_key(txn.posted_date)].append((txn, cat))
 
     results: dict[str, Summary] = {}
 
-    for month, txns in sorted(buckets.items()):
+    for month, items in sorted(buckets.items()):
         income = 0.0
         expenses = 0.0
         by_cat: dict[str, float] = defaultdict(float)
 
-        for txn in txns:
-            cat = categorize_transaction(txn)
-
+        for txn, cat in items:
             if txn.amount > 0:
                 income += txn.amount
             else:
@@ -76,11 +130,71 @@ def build_monthly_summary(transactions: list[Transaction]) -> dict[str, Summary]
     return results
 
 
+class RunningMonthlyTotals:
+    """
+    Monthly income/expense/category totals that can be updated incrementally.
+
+    Totals are kept in integer cents so repeated updates never drift, and
+    `add` reports which months changed so callers only rebuild those.
+    `rules`, `aliases` and `model` decide categories (see `enrich_many`).
+    """
+
+    def __init__(
+        self,
+        aliases: Mapping[str, str] | None = None,
+        model: CategoryModel | None = None,
+        rules: Sequence[CategoryRule] = DEFAULT_RULES,
+    ) -> None:
+        self.aliases = aliases
+        self.model = model
+        self.rules = rules
+        self._income: dict[str, int] = defaultdict(int)
+        self._expenses: dict[str, int] = defaultdict(int)
+        self._by_cat: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def __contains__(self, month: str) -> bool:
+        return month in self._income or month in self._expenses
+
+    def months(self) -> list[str]:
+        return sorted(set(self._income) | set(self._expenses))
+
+    def add(self, transactions: list[Transaction]) -> set[str]:
+        """
+        Fold transactions into the totals and return the set of affected months.
+        """
+        touched: set[str] = set()
+        for txn, cat in zip(transactions, categorize_many(transactions, self.rules, self.aliases, self.model)):
+            month = month_key(txn.posted_date)
+            cents = round(txn.amount * 100)
+            if txn.amount > 0:
+                self._income[month] += cents
+            else:
+                self._expenses[month] += -cents
+                self._by_cat[month][cat] += -cents
+            touched.add(month)
+        return touched
+
+    def summary(self, month: str) -> Summary:
+        income = self._income.get(month, 0)
+        expenses = self._expenses.get(month, 0)
+        by_cat = self._by_cat.get(month, {})
+        return Summary(
+            month=month,
+            income_total=income / 100,
+            expense_total=expenses / 100,
+            net_total=(income - expenses) / 100,
+            by_category={k: v / 100 for k, v in sorted(by_cat.items(), key=lambda kv: kv[1], reverse=True)},
+        )
+
+
 def detect_unusual_spending(
     transactions: list[Transaction],
     multiplier: float = 2.5,
     min_amount: float = 50.0,
     min_samples: int = 3,
+    aliases: Mapping[str, str] | None = None,
+    model: CategoryModel | None = None,
+    rules: Sequence[CategoryRule] = DEFAULT_RULES,
 ) -> dict[str, list[Alert]]:
     """
     Detect unusually large expenses per month and category.
@@ -93,16 +207,16 @@ def detect_unusual_spending(
     """
     # Build month/category buckets of expense amounts
     buckets: dict[tuple[str, str], list[float]] = defaultdict(list)
-    expense_items: list[tuple[str, str, Transaction]] = []
+    expense_items: list[tuple[str, str, str, Transaction]] = []
 
-    for txn in transactions:
+    merchants, categories = enrich_many(transactions, rules, aliases, model)
+    for txn, merchant, category in zip(transactions, merchants, categories):
         if txn.amount >= 0:
             continue
 
         month = month_key(txn.posted_date)
-        category = categorize_transaction(txn)
         buckets[(month, category)].append(abs(txn.amount))
-        expense_items.append((month, category, txn))
+        expense_items.append((month, category, merchant, txn))
 
     # Compute averages
     avg_by_bucket: dict[tuple[str, str], float] = {}
@@ -111,12 +225,11 @@ def detect_unusual_spending(
 
     # Detect outliers
     alerts_by_month: dict[str, list[Alert]] = defaultdict(list)
-    for month, category, txn in expense_items:
+    for month, category, merchant, txn in expense_items:
         spent = abs(txn.amount)
         avg = avg_by_bucket[(month, category)]
 
         if spent >= min_amount and spent >= multiplier * avg and len(buckets[(month, category)]) >= min_samples:
-            merchant = normalize_description(txn.description)
             alerts_by_month[month].append(
                 Alert(
                     month=month,
@@ -130,3 +243,179 @@ def detect_unusual_spending(
 
     return alerts_by_month
 
+
+def detect_unusual_spending_rolling(
+    transactions: list[Transaction],
+    window_months: int = 3,
+    multiplier: float = 2.5,
+    min_amount: float = 50.0,
+    min_samples: int = 3,
+    aliases: Mapping[str, str] | None = None,
+    model: CategoryModel | None = None,
+    rules: Sequence[CategoryRule] = DEFAULT_RULES,
+) -> dict[str, list[Alert]]:
+    """
+    Detect unusually large expenses against a rolling per-category baseline.
+
+    Rule:
+    - Only expenses (amount < 0)
+    - The baseline for a month+category is the average expense amount of that
+      category over the previous `window_months` months (current month excluded)
+    - Flag any expense that is >= multiplier x baseline and >= min_amount,
+      when the baseline has at least min_samples expenses
+    Window sums and counts slide one month at a time (add the newest month,
+    drop the oldest), so the whole history is evaluated in O(n).
+    Returns a dict keyed by month -> list[Alert]
+    """
+    if window_months < 1:
+        raise ValueError("window_months must be >= 1")
+
+    # per month index (year * 12 + month - 1): category -> [cents, count]
+    month_totals: dict[int, dict[str, list[int]]] = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+    expense_items: dict[int, list[tuple[str, str, Transaction]]] = defaultdict(list)
+
+    merchants, categories = enrich_many(transactions, rules, aliases, model)
+    for txn, merchant, category in zip(transactions, merchants, categories):
+        if txn.amount >= 0:
+            continue
+
+        idx = txn.posted_date.year * 12 + txn.posted_date.month - 1
+        totals = month_totals[idx][category]
+        totals[0] += round(-txn.amount * 100)
+        totals[1] += 1
+        expense_items[idx].append((category, merchant, txn))
+
+    alerts_by_month: dict[str, list[Alert]] = defaultdict(list)
+    if not expense_items:
+        return alerts_by_month
+
+    window: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+    first, last = min(expense_items), max(expense_items)
+
+    for idx in range(first, last + 1):
+        # slide: month idx-1 enters the window, month idx-1-window_months leaves it
+        for category, (cents, count) in month_totals.get(idx - 1, {}).items():
+            window[category][0] += cents
+            window[category][1] += count
+        for category, (cents, count) in month_totals.get(idx - 1 - window_months, {}).items():
+            window[category][0] -= cents
+            window[category][1] -= count
+
+        for category, merchant, txn in expense_items.get(idx, []):
+            cents, count = window.get(category, (0, 0))
+            if count < min_samples:
+                continue
+
+            avg = cents / count / 100
+            spent = abs(txn.amount)
+            if spent >= min_amount and spent >= multiplier * avg:
+                month = month_key(txn.posted_date)
+                alerts_by_month[month].append(
+                    Alert(
+                        month=month,
+                        category=category,
+                        posted_date=str(txn.posted_date),
+                        merchant=merchant,
+                        amount=round(spent, 2),
+                        reason=f"High spend vs {window_months}-month category average (${avg:.2f})",
+                    )
+                )
+
+    return alerts_by_month
+
+
+def _split_amount_bands(items: list[tuple[int, int]], tolerance: float) -> list[list[tuple[int, int]]]:
+    """
+    Split (cents, ordinal) items into bands of similar amounts.
+    Items are sorted by amount; a new band starts when an amount exceeds the
+    band's smallest amount by more than `tolerance`.
+    """
+    items.sort()
+    bands: list[list[tuple[int, int]]] = []
+    band: list[tuple[int, int]] = []
+    floor = 0
+    for cents, ordinal in items:
+        if band and cents > floor * (1 + tolerance):
+            bands.append(band)
+            band = []
+        if not band:
+            floor = cents
+        band.append((cents, ordinal))
+    if band:
+        bands.append(band)
+    return bands
+
+
+def detect_recurring_charges(
+    transactions: list[Transaction],
+    amount_tolerance: float = 0.1,
+    min_occurrences: int = 3,
+    min_regular_share: float = 0.75,
+    aliases: Mapping[str, str] | None = None,
+    model: CategoryModel | None = None,
+    rules: Sequence[CategoryRule] = DEFAULT_RULES,
+) -> list[RecurringCharge]:
+    """
+    Detect recurring charges (subscriptions, memberships, rent...).
+
+    Rules:
+    - Only expenses (amount < 0)
+    - Group by normalized merchant, then split each merchant into bands of
+      amounts within `amount_tolerance` of each other
+    - Sort each band by date; if the median gap between charges fits a
+      cadence in CADENCES, at least `min_regular_share` of the gaps fit it
+      and the band has >= min_occurrences charges, it is reported as recurring
+    Cost is O(n log n) overall: one sort per merchant and per band.
+    Returns charges sorted by estimated annual cost (highest first).
+    """
+    merchants, categories = enrich_many(transactions, rules, aliases, model)
+
+    by_merchant: dict[str, list[tuple[int, int]]] = defaultdict(list)
+    category_by_merchant: dict[str, str] = {}
+    for txn, merchant, category in zip(transactions, merchants, categories):
+        if txn.amount >= 0:
+            continue
+        by_merchant[merchant].append((round(-txn.amount * 100), txn.posted_date.toordinal()))
+        category_by_merchant[merchant] = category
+
+    min_occurrences = max(min_occurrences, 2)
+
+    results: list[RecurringCharge] = []
+    for merchant, items in by_merchant.items():
+        if len(items) < min_occurrences:
+            continue
+
+        for band in _split_amount_bands(items, amount_tolerance):
+            if len(band) < min_occurrences:
+                continue
+
+            ordinals = sorted({ordinal for _cents, ordinal in band})
+            if len(ordinals) < min_occurrences:
+                continue
+
+            gaps = [b - a for a, b in zip(ordinals, ordinals[1:])]
+            gap = median(gaps)
+            for cadence, (_typical, low, high, per_year) in CADENCES.items():
+                if not low <= gap <= high:
+                    continue
+                if sum(1 for g in gaps if low <= g <= high) < min_regular_share * len(gaps):
+                    break
+
+                amount = median(cents for cents, _ordinal in band) / 100
+                results.append(
+                    RecurringCharge(
+                        merchant=merchant,
+                        category=category_by_merchant[merchant],
+                        cadence=cadence,
+                        typical_amount=round(amount, 2),
+                        annual_cost=round(amount * per_year, 2),
+                        occurrences=len(band),
+                        first_date=str(date.fromordinal(ordinals[0])),
+                        last_date=str(date.fromordinal(ordinals[-1])),
+                        next_expected=str(_next_charge(date.fromordinal(ordinals[-1]), cadence)),
+                    )
+                )
+                break
+
+    results.sort(key=lambda r: (-r.annual_cost, r.merchant))
+    return results
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Mapping, Sequence
+
+from expense_analyzer.parser import load_transactions
+from expense_analyzer.analyze import build_monthly_summary, detect_unusual_spending
+from expense_analyzer.budget import evaluate_budgets
+from expense_analyzer.categorize import DEFAULT_RULES, CategoryRule
+from expense_analyzer.reporting import ensure_reports_dir, write_consolidated_json
+from expense_analyzer.settings_store import DEFAULT_SETTINGS, load_settings
+from expense_analyzer.storage import load_manual_entries
+
+if TYPE_CHECKING:
+    from expense_analyzer.classifier import CategoryModel
+
+
+@dataclass(frozen=True)
+class Tenant:
+    name: str
+    statements: tuple[Path, ...]
+    out_dir: Path
+    settings: Path | None = None
+    manual: Path | None = None
+
+
+@dataclass(frozen=True)
+class TenantResult:
+    name: str
+    ok: bool
+    out_dir: str
+    transactions: int = 0
+    months: int = 0
+    alerts: int = 0
+    seconds: float = 0.0
+    error: str = ""
+    files: list[str] = field(default_factory=list)
+
+
+def load_manifest(manifest_path: Path, out_root: Path) -> list[Tenant]:
+    """
+    Read a batch manifest: a JSON list (or {"tenants": [...]}) of objects with
+    "name", "statements" (list of CSV paths) and optional "settings",
+    "manual" and "out_dir". Relative paths are resolved against the manifest's
+    directory; the default output directory is out_root/<name>.
+    Raises ValueError for an invalid manifest.
+    """
+    data = json.loads(manifest_path.read_text(encoding="utf-8"))
+    if isinstance(data, dict):
+        data = data.get("tenants")
+    if not isinstance(data, list):
+        raise ValueError("Manifest must be a list of tenants (or an object with a 'tenants' list)")
+
+    base = manifest_path.parent
+
+    def resolve(value: str | None) -> Path | None:
+        return None if not value else (base / value).resolve()
+
+    def optional_path(name: str, item: dict, key: str) -> Path | None:
+        value = item.get(key)
+        if value is not None and not isinstance(value, str):
+            raise ValueError(f"Tenant {name}: '{key}' must be a path string")
+        return resolve(value)
+
+    tenants: list[Tenant] = []
+    seen: set[str] = set()
+    for i, item in enumerate(data, start=1):
+        if not isinstance(item, dict):
+            raise ValueError(f"Tenant #{i} must be an object")
+        name = str(item.get("name") or "").strip()
+        if not name or "/" in name or "\\" in name or name in (".", ".."):
+            raise ValueError(f"Tenant #{i} needs a name that is usable as a directory name")
+        if name in seen:
+            raise ValueError(f"Duplicate tenant name: {name}")
+        seen.add(name)
+
+        statements = item.get("statements")
+        if (
+            not isinstance(statements, list)
+            or not statements
+            or not all(isinstance(s, str) and s for s in statements)
+        ):
+            raise ValueError(f"Tenant {name}: 'statements' must be a non-empty list of CSV paths")
+
+        tenants.append(
+            Tenant(
+                name=name,
+                statements=tuple(resolve(s) for s in statements),
+                out_dir=optional_path(name, item, "out_dir") or (out_root / name).resolve(),
+                settings=optional_path(name, item, "settings"),
+                manual=optional_path(name, item, "manual"),
+            )
+        )
+    return tenants
+
+
+def run_tenant(
+    tenant: Tenant,
+    as_of: date | None = None,
+    aliases: Mapping[str, str] | None = None,
+    model: CategoryModel | None = None,
+    rules: Sequence[CategoryRule] = DEFAULT_RULES,
+) -> TenantResult:
+    """
+    Parse, analyze and report one tenant into its own output directory.
+    `rules`, `aliases` and `model` decide categories (see `enrich_many`).
+
+    Any error is captured in the result (and in error.txt) instead of being
+    raised, so one bad tenant never stops the batch.
+    """
+    started = time.perf_counter()
+    out_dir = tenant.out_dir
+    error_path = out_dir / "error.txt"
+
+    try:
+        out_dir = ensure_reports_dir(out_dir)
+        transactions = []
+        for csv_path in tenant.statements:
+            try:
+                transactions.extend(load_transactions(csv_path))
+            except ValueError as e:
+                raise ValueError(f"{csv_path.name}: {e}") from e
+        if tenant.manual is not None:
+            transactions.extend(load_manual_entries(tenant.manual))
+
+        summaries = build_monthly_summary(transactions, aliases=aliases, model=model, rules=rules)
+        alerts = detect_unusual_spending(transactions, aliases=aliases, model=model, rules=rules)
+        settings = load_settings(tenant.settings) if tenant.settings is not None else DEFAULT_SETTINGS
+        budgets = evaluate_budgets(summaries, settings, as_of)
+
+        files = [write_consolidated_json(out_dir, summaries.values())]
+        for filename, payload in (
+            ("alerts.json", {month: [asdict(a) for a in items] for month, items in alerts.items()}),
+            ("budgets.json", {month: asdict(b) for month, b in budgets.items()}),
+        ):
+            path = out_dir / filename
+            path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+            files.append(path)
+        error_path.unlink(missing_ok=True)
+
+        return TenantResult(
+            name=tenant.name,
+            ok=True,
+            out_dir=str(out_dir),
+            transactions=len(transactions),
+            months=len(summaries),
+            alerts=sum(len(items) for items in alerts.values()),
+            seconds=round(time.perf_counter() - started, 3),
+            files=[str(p) for p in files],
+        )
+    except Exception as e:
+        if out_dir.is_dir():
+            error_path.write_text(traceback.format_exc(), encoding="utf-8")
+        return TenantResult(
+            name=tenant.name,
+            ok=False,
+            out_dir=str(out_dir),
+            seconds=round(time.perf_counter() - started, 3),
+            error=f"{type(e).__name__}: {e}",
+        )
+
+
+def run_batch(
+    tenants: list[Tenant],
+    workers: int | None = None,
+    as_of: date | None = None,
+    on_result: Callable[[TenantResult], None] | None = None,
+    aliases: Mapping[str, str] | None = None,
+    model: CategoryModel | None = None,
+    rules: Sequence[CategoryRule] = DEFAULT_RULES,
+) -> list[TenantResult]:
+    """
+    Run every tenant on a process pool and return results in manifest order.
+
+    The pool's workers are long-lived: each one imports the package once and
+    then runs many tenants, so startup cost is paid per worker rather than
+    per tenant. With one worker (or one tenant) everything runs in-process.
+    `on_result` is called as each tenant finishes.
+    """
+    workers = workers or os.cpu_count() or 1
+    results: dict[str, TenantResult] = {}
+
+    if workers <= 1 or len(tenants) <= 1:
+        for tenant in tenants:
+            results[tenant.name] = run_tenant(tenant, as_of, aliases, model, rules)
+            if on_result:
+                on_result(results[tenant.name])
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tenants))) as pool:
+            futures = {pool.submit(run_tenant, tenant, as_of, aliases, model, rules): tenant for tenant in tenants}
+            for future in as_completed(futures):
+                tenant = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:  # the worker itself died (e.g. killed or out of memory)
+                    result = TenantResult(tenant.name, False, str(tenant.out_dir), error=f"{type(e).__name__}: {e}")
+                results[tenant.name] = result
+                if on_result:
+                    on_result(result)
+
+    return [results[t.name] for t in tenants]
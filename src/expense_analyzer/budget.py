@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import calendar
+from dataclasses import dataclass
+from datetime import date
+
+from expense_analyzer.analyze import Summary
+from expense_analyzer.categories import CategoryTree, category_depth, category_parts, normalize_category
+from expense_analyzer.settings_store import BudgetSettings
+
+
+@dataclass(frozen=True)
+class CategoryBudget:
+    category: str
+    budget: float
+    spent: float
+    remaining: float
+    projected: float  # month-end spend at the current burn rate (== spent for closed months)
+
+
+@dataclass(frozen=True)
+class MonthBudget:
+    month: str
+    income_total: float
+    income_target: float
+    expense_total: float
+    net_total: float
+    savings_goal: float
+    days_elapsed: int
+    days_in_month: int
+    projected_expenses: float
+    categories: list[CategoryBudget]
+
+
+def _days(month: str, as_of: date) -> tuple[int, int]:
+    """
+    Return (days elapsed, days in month) for a YYYY-MM key as of `as_of`.
+    Past months are complete; the month containing `as_of` is partial.
+    """
+    year, mon = int(month[:4]), int(month[5:7])
+    days_in_month = calendar.monthrange(year, mon)[1]
+    if (year, mon) == (as_of.year, as_of.month):
+        return as_of.day, days_in_month
+    return days_in_month, days_in_month
+
+
+def evaluate_budgets(
+    summaries: dict[str, Summary],
+    settings: BudgetSettings,
+    as_of: date | None = None,
+    depth: int | None = None,
+) -> dict[str, MonthBudget]:
+    """
+    Compare category budgets with actual spend for every month.
+
+    Works from precomputed monthly summaries (one pass, no re-aggregation).
+    For the month containing `as_of` (default: today) spend is projected to
+    month end with a daily burn rate: spent / days elapsed x days in month.
+
+    Budgets may be set at any level of the category hierarchy ("Food" or
+    "Food/Coffee"); a parent's spend includes all of its subcategories.
+    `depth` limits the rows to categories at most that many levels deep.
+    """
+    if depth is not None and depth < 1:
+        raise ValueError("Depth must be at least 1")
+    as_of = as_of or date.today()
+    budgets = {normalize_category(cat): float(amount) for cat, amount in settings.category_budgets.items()}
+
+    results: dict[str, MonthBudget] = {}
+    for month, s in summaries.items():
+        elapsed, days_in_month = _days(month, as_of)
+        scale = days_in_month / elapsed
+
+        tree = CategoryTree(s.by_category)
+
+        categories = [
+            CategoryBudget(
+                category=cat,
+                budget=round(budgets.get(cat, 0.0), 2),
+                spent=tree.total(cat),
+                remaining=round(budgets.get(cat, 0.0) - tree.total(cat), 2),
+                projected=round(tree.total(cat) * scale, 2),
+            )
+            for cat in sorted(set(budgets) | set(tree.nodes), key=category_parts)
+            if depth is None or category_depth(cat) <= depth
+        ]
+
+        results[month] = MonthBudget(
+            month=month,
+            income_total=s.income_total,
+            income_target=float(settings.income_target),
+            expense_total=s.expense_total,
+            net_total=s.net_total,
+            savings_goal=float(settings.savings_goal),
+            days_elapsed=elapsed,
+            days_in_month=days_in_month,
+            projected_expenses=round(s.expense_total * scale, 2),
+            categories=categories,
+        )
+
+    return results
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import sys
+from array import array
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Generic, Iterable, TypeVar
+
+from expense_analyzer.analyze import Alert, Summary
+from expense_analyzer.categorize import RULESET_VERSION
+from expense_analyzer.sketches import SpendingStats
+
+
+T = TypeVar("T")
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+_DIGESTS = "digests.json"
+_SUFFIX = ".entry"
+_U32 = struct.Struct("<I")
+
+
+def default_cache_dir() -> Path:
+    """
+    The per-user cache directory: $XDG_CACHE_HOME (or the platform's user
+    cache location) / expense-analyzer. Never relative to the working directory.
+    """
+    base = os.environ.get("XDG_CACHE_HOME")
+    if not base:
+        if sys.platform == "win32":
+            base = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+        elif sys.platform == "darwin":
+            base = str(Path.home() / "Library" / "Caches")
+        else:
+            base = str(Path.home() / ".cache")
+    return Path(base) / "expense-analyzer"
+
+
+@dataclass(frozen=True)
+class Codec(Generic[T]):
+    """
+    How a kind of result is stored: plain data only, never executable pickles.
+    `decode` raises ValueError (or KeyError/TypeError/struct.error) on a bad entry.
+    """
+
+    encode: Callable[[T], bytes]
+    decode: Callable[[bytes], T]
+
+
+JSON_CODEC: Codec[Any] = Codec(
+    encode=lambda value: json.dumps(value).encode("utf-8"),
+    decode=lambda raw: json.loads(raw.decode("utf-8")),
+)
+
+SUMMARIES_CODEC: Codec[dict[str, Summary]] = Codec(
+    encode=lambda summaries: JSON_CODEC.encode({k: asdict(s) for k, s in summaries.items()}),
+    decode=lambda raw: {k: Summary(**s) for k, s in JSON_CODEC.decode(raw).items()},
+)
+
+ALERTS_CODEC: Codec[dict[str, list[Alert]]] = Codec(
+    encode=lambda alerts: JSON_CODEC.encode({k: [asdict(a) for a in v] for k, v in alerts.items()}),
+    decode=lambda raw: {k: [Alert(**a) for a in v] for k, v in JSON_CODEC.decode(raw).items()},
+)
+
+STATS_CODEC: Codec[SpendingStats] = Codec(
+    encode=lambda stats: JSON_CODEC.encode(stats.to_dict()),
+    decode=lambda raw: SpendingStats.from_dict(JSON_CODEC.decode(raw)),
+)
+
+
+def _encode_rows(rows: tuple[array, array, list[str], list[str], list[str]]) -> bytes:
+    ordinals, amounts, descriptions, merchants, categories = rows
+    header = json.dumps([descriptions, merchants, categories]).encode("utf-8")
+    return _U32.pack(len(header)) + header + ordinals.tobytes() + amounts.tobytes()
+
+
+def _decode_rows(raw: bytes) -> tuple[array, array, list[str], list[str], list[str]]:
+    (size,) = _U32.unpack_from(raw)
+    descriptions, merchants, categories = json.loads(raw[_U32.size : _U32.size + size].decode("utf-8"))
+    ordinals, amounts = array("i"), array("d")
+    body = raw[_U32.size + size :]
+    split = len(descriptions) * ordinals.itemsize
+    ordinals.frombytes(body[:split])
+    amounts.frombytes(body[split:])
+    if not len(ordinals) == len(amounts) == len(merchants) == len(categories) == len(descriptions):
+        raise ValueError("Truncated cache entry")
+    return ordinals, amounts, descriptions, merchants, categories
+
+
+# parsed rows as packed columns: (date ordinals, amounts, descriptions, merchants, categories)
+ROWS_CODEC: Codec[tuple[array, array, list[str], list[str], list[str]]] = Codec(_encode_rows, _decode_rows)
+
+
+def file_digest(path: Path) -> str:
+    """
+    BLAKE2b digest of a file's contents, read in 1 MB blocks.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class AnalysisCache:
+    """
+    Content-addressed on-disk cache for analysis results.
+
+    Rules:
+    - An entry's key hashes the kind of result, the digests of its input
+      files, the ruleset version and the parameters, so changing any of them
+      simply misses the cache (nothing has to be invalidated)
+    - File digests are remembered per (size, mtime), so unchanged files are
+      not re-hashed; entries for files that no longer exist are pruned
+    - Reads refresh an entry's mtime; when the directory grows past
+      `max_bytes` the least recently used entries are deleted
+    Entries are written with a Codec (JSON and packed arrays), so a planted
+    file can at worst be rejected, never executed.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._digests: dict[str, list] | None = None
+
+    def _digest(self, path: Path) -> str:
+        if self._digests is None:
+            try:
+                self._digests = json.loads((self.cache_dir / _DIGESTS).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._digests = {}
+
+        st = path.stat()
+        name = str(path.resolve())
+        known = self._digests.get(name)
+        if known and known[0] == st.st_size and known[1] == st.st_mtime_ns:
+            return known[2]
+
+        digest = file_digest(path)
+        self._digests = {k: v for k, v in self._digests.items() if os.path.exists(k)}
+        self._digests[name] = [st.st_size, st.st_mtime_ns, digest]
+        self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        (self.cache_dir / _DIGESTS).write_text(json.dumps(self._digests), encoding="utf-8")
+        return digest
+
+    def key(self, kind: str, inputs: Iterable[Path], params: dict[str, Any]) -> str:
+        payload = {
+            "kind": kind,
+            "inputs": [self._digest(p) for p in inputs],
+            "ruleset": RULESET_VERSION,
+            "params": params,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def get_or_compute(
+        self,
+        kind: str,
+        inputs: Iterable[Path],
+        params: dict[str, Any],
+        compute: Callable[[], T],
+        codec: Codec[T] = JSON_CODEC,
+    ) -> T:
+        """
+        Return the cached result for (kind, inputs, params), computing and storing it on a miss.
+        """
+        path = self.cache_dir / f"{kind}-{self.key(kind, inputs, params)}{_SUFFIX}"
+        try:
+            value = codec.decode(path.read_bytes())
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError, struct.error):
+            path.unlink(missing_ok=True)  # unreadable or from an incompatible version
+        else:
+            os.utime(path)
+            return value
+
+        value = compute()
+        self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(codec.encode(value))
+        os.replace(tmp, path)
+        self.evict()
+        return value
+
+    def evict(self) -> int:
+        """
+        Delete least recently used entries until the cache fits in max_bytes
+        (the digest memo counts towards the size). Returns the number of entries removed.
+        """
+        entries = []
+        for path in self.cache_dir.glob(f"*{_SUFFIX}"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+
+        total = sum(size for _mtime, size, _path in entries)
+        try:
+            total += (self.cache_dir / _DIGESTS).stat().st_size
+        except FileNotFoundError:
+            pass
+        removed = 0
+        for _mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        for path in self.cache_dir.glob(f"*{_SUFFIX}"):
+            path.unlink(missing_ok=True)
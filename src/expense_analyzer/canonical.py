@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import json
+import re
+import zlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Iterable, Mapping
+
+
+# common bank abbreviations, expanded before comparing merchants
+ABBREVIATIONS: dict[str, str] = {
+    "AMZN": "AMAZON",
+    "MKTP": "MARKETPLACE",
+    "MKTPLACE": "MARKETPLACE",
+    "WM": "WALMART",
+    "WMT": "WALMART",
+    "SQ": "",
+    "TST": "",
+    "PAYPAL": "",
+}
+
+# payment processors that put their name before the merchant: "SQ *BLUE BOTTLE" -> "BLUE BOTTLE"
+_PROCESSOR_PREFIX = re.compile(r"^(?:%s)\s*\*\s*" % "|".join(k for k, v in ABBREVIATIONS.items() if not v))
+_PROCESSOR_REF = re.compile(r"\*.*$")  # "AMZN MKTP US*2K3" -> "AMZN MKTP US"
+_DOMAIN = re.compile(r"\.(COM|NET|ORG|CO\.UK)\b")
+_NON_ALNUM = re.compile(r"[^A-Z0-9]+")
+
+_NGRAM = 3
+_BANDS = 6
+_ROWS = 2
+# each salt XORed into the 32-bit shingle hashes acts as one MinHash permutation
+_SALTS = [zlib.crc32(f"minhash-{i}".encode()) for i in range(_BANDS * _ROWS)]
+
+# in blocks bigger than this, members are only compared with the block's cluster
+# leaders (at most this many), so a generic block cannot make comparisons quadratic
+MAX_BLOCK_SIZE = 200
+
+
+def canonical_form(merchant: str) -> str:
+    """
+    Reduce a normalized merchant to the part that identifies the business:
+    drop processor prefixes ("SQ *"), processor references after '*', domains,
+    tokens with digits and known prefixes, and expand abbreviations such as
+    AMZN -> AMAZON.
+    """
+    text = _PROCESSOR_PREFIX.sub("", merchant.upper())
+    text = _DOMAIN.sub(" ", _PROCESSOR_REF.sub("", text))
+    tokens = []
+    for token in _NON_ALNUM.sub(" ", text).split():
+        if any(ch.isdigit() for ch in token):
+            continue
+        token = ABBREVIATIONS.get(token, token)
+        if token:
+            tokens.append(token)
+    return " ".join(tokens) or merchant
+
+
+def _shingles(text: str) -> set[int]:
+    padded = f" {text} "
+    return {zlib.crc32(padded[i : i + _NGRAM].encode("utf-8")) for i in range(len(padded) - _NGRAM + 1)}
+
+
+def _block_keys(text: str, shingles: set[int]) -> list[tuple]:
+    """
+    MinHash band keys plus a first-token key; strings sharing any key are compared.
+    """
+    mins = [min(map(salt.__xor__, shingles)) for salt in _SALTS]
+    keys: list[tuple] = [(band, *mins[band * _ROWS : (band + 1) * _ROWS]) for band in range(_BANDS)]
+
+    first = text.split(" ", 1)[0]
+    if len(first) >= 4:
+        keys.append(("token", first))
+    return keys
+
+
+def _similar(a: set[int], b: set[int], threshold: float) -> bool:
+    """
+    Jaccard similarity, or overlap (containment) for a clearly contained name
+    such as AMAZON within AMAZON PRIME.
+    """
+    common = len(a & b)
+    if common / (len(a) + len(b) - common) >= threshold:
+        return True
+    smaller = min(len(a), len(b))
+    return smaller >= 6 and common / smaller >= 0.9
+
+
+def build_alias_map(
+    merchant_counts: Mapping[str, int],
+    threshold: float = 0.6,
+    on_capped: Callable[[str, int], None] | None = None,
+) -> dict[str, str]:
+    """
+    Cluster merchant variants and map each variant to its cluster's canonical name.
+
+    Rules:
+    - Merchants are compared on `canonical_form` using character trigrams
+    - Only merchants that share a MinHash band or first token (a "block") are
+      compared, so the cost is near-linear in the number of distinct merchants
+    - Blocks larger than MAX_BLOCK_SIZE are capped: members (most frequent
+      first) are only compared with the block's first MAX_BLOCK_SIZE cluster
+      leaders, and `on_capped(sample merchant, block size)` is called
+    - The canonical name of a cluster is its most frequent member
+    Returns {variant: canonical} for variants that differ from their canonical name.
+    """
+    merchants = list(merchant_counts)
+    forms = [canonical_form(m) for m in merchants]
+
+    # identical canonical forms are merged up front without any comparisons
+    form_index: dict[str, int] = {}
+    parent = list(range(len(merchants)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int) -> None:
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[rj] = ri
+
+    representatives: list[int] = []
+    for i, form in enumerate(forms):
+        if form in form_index:
+            union(form_index[form], i)
+        else:
+            form_index[form] = i
+            representatives.append(i)
+
+    shingles = {i: _shingles(forms[i]) for i in representatives}
+    blocks: dict[tuple, list[int]] = defaultdict(list)
+    for i in representatives:
+        for key in _block_keys(forms[i], shingles[i]):
+            blocks[key].append(i)
+
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        if len(members) <= MAX_BLOCK_SIZE:
+            for x, i in enumerate(members):
+                for j in members[x + 1 :]:
+                    if find(i) != find(j) and _similar(shingles[i], shingles[j], threshold):
+                        union(i, j)
+            continue
+
+        members = sorted(members, key=lambda i: -merchant_counts[merchants[i]])
+        if on_capped is not None:
+            on_capped(merchants[members[0]], len(members))
+        leaders: list[int] = []
+        for i in members:
+            leader = next((j for j in leaders if _similar(shingles[i], shingles[j], threshold)), None)
+            if leader is not None:
+                union(leader, i)
+            elif len(leaders) < MAX_BLOCK_SIZE:
+                leaders.append(i)
+
+    clusters: dict[int, list[int]] = defaultdict(list)
+    for i in range(len(merchants)):
+        clusters[find(i)].append(i)
+
+    aliases: dict[str, str] = {}
+    for members in clusters.values():
+        if len(members) < 2:
+            continue
+        canonical = merchants[max(members, key=lambda i: (merchant_counts[merchants[i]], -len(merchants[i])))]
+        for i in members:
+            if merchants[i] != canonical:
+                aliases[merchants[i]] = canonical
+    return aliases
+
+
+def count_merchants(merchants: Iterable[str]) -> dict[str, int]:
+    counts: dict[str, int] = defaultdict(int)
+    for merchant in merchants:
+        counts[merchant] += 1
+    return dict(counts)
+
+
+def save_alias_map(path: Path, aliases: Mapping[str, str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"version": 1, "aliases": dict(sorted(aliases.items()))}, indent=2), encoding="utf-8")
+
+
+def load_alias_map(path: Path) -> dict[str, str]:
+    """
+    Load an alias map saved by `save_alias_map`. Returns {} if the file doesn't exist.
+    """
+    if not path.exists():
+        return {}
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    aliases = data.get("aliases", {}) if isinstance(data, dict) else {}
+    return {str(k): str(v) for k, v in aliases.items()}
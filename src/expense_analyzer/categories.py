@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Iterator, Mapping
+
+from expense_analyzer.analyze import Summary
+
+
+SEPARATOR = "/"
+
+
+def category_parts(category: str) -> tuple[str, ...]:
+    """
+    Split a category path such as "Food/Coffee" into its levels.
+    Blank levels and surrounding whitespace are ignored ("Food / Coffee" == "Food/Coffee").
+    """
+    return tuple(part.strip() for part in category.split(SEPARATOR) if part.strip())
+
+
+def normalize_category(category: str) -> str:
+    return SEPARATOR.join(category_parts(category)) or category.strip()
+
+
+def parent_category(category: str) -> str | None:
+    parts = category_parts(category)
+    return SEPARATOR.join(parts[:-1]) if len(parts) > 1 else None
+
+
+def category_depth(category: str) -> int:
+    return max(len(category_parts(category)), 1)
+
+
+@dataclass(frozen=True)
+class CategoryNode:
+    path: str
+    depth: int
+    own: float  # spend booked directly on this category
+    total: float  # own spend plus every descendant's
+    children: tuple[str, ...]
+
+
+class CategoryTree:
+    """
+    Category totals at every level of a "Parent/Child" hierarchy.
+
+    Built from leaf aggregates (e.g. Summary.by_category) in one bottom-up
+    pass: nodes are visited deepest first and each adds its total to its
+    parent, so every parent total costs one addition per child no matter how
+    many transactions are behind it. Amounts are summed in integer cents.
+    """
+
+    def __init__(self, by_category: Mapping[str, float]) -> None:
+        own: dict[str, int] = {}
+        for category, amount in by_category.items():
+            path = normalize_category(category)
+            own[path] = own.get(path, 0) + round(amount * 100)
+            parent = parent_category(path)
+            while parent is not None and parent not in own:
+                own[parent] = 0
+                parent = parent_category(parent)
+
+        totals = dict(own)
+        children: dict[str, list[str]] = {path: [] for path in own}
+        for path in sorted(own, key=category_depth, reverse=True):
+            parent = parent_category(path)
+            if parent is not None:
+                totals[parent] += totals[path]
+                children[parent].append(path)
+
+        self.nodes: dict[str, CategoryNode] = {
+            path: CategoryNode(
+                path=path,
+                depth=category_depth(path),
+                own=own[path] / 100,
+                total=totals[path] / 100,
+                children=tuple(sorted(children[path], key=category_parts)),
+            )
+            for path in sorted(own, key=category_parts)
+        }
+
+    def __contains__(self, category: str) -> bool:
+        return normalize_category(category) in self.nodes
+
+    def total(self, category: str) -> float:
+        """
+        Total spend of a category and everything below it (0.0 if unknown).
+        """
+        node = self.nodes.get(normalize_category(category))
+        return node.total if node else 0.0
+
+    def roots(self) -> list[CategoryNode]:
+        return [node for node in self.nodes.values() if node.depth == 1]
+
+    def walk(self) -> Iterator[CategoryNode]:
+        """
+        Nodes depth-first, each parent before its children, siblings by total (largest first).
+        """
+        stack = sorted(self.roots(), key=lambda n: (n.total, n.path))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(sorted((self.nodes[c] for c in node.children), key=lambda n: (n.total, n.path)))
+
+    def at_depth(self, depth: int) -> dict[str, float]:
+        """
+        Totals with the hierarchy cut at `depth` (1 = top-level categories only).
+
+        Rules:
+        - Nodes at `depth` report their subtree total
+        - Shallower nodes keep only their own spend (leaves, or spend booked
+          directly on a parent), so the values still add up to the total
+        - Sorted by total, largest first (like Summary.by_category)
+        """
+        if depth < 1:
+            raise ValueError("Depth must be at least 1")
+
+        cut: dict[str, float] = {}
+        for node in self.nodes.values():
+            if node.depth == depth:
+                cut[node.path] = node.total
+            elif node.depth < depth and node.own:
+                cut[node.path] = node.own
+        return dict(sorted(cut.items(), key=lambda kv: kv[1], reverse=True))
+
+
+def summary_at_depth(summary: Summary, depth: int | None) -> Summary:
+    """
+    The same summary with by_category rolled up to `depth` (None = leaf categories, unchanged).
+    """
+    if depth is None:
+        return summary
+    return replace(summary, by_category=CategoryTree(summary.by_category).at_depth(depth))
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from dataclasses import dataclass
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable, Mapping, Sequence
 
 from expense_analyzer.parser import Transaction
-from expense_analyzer.normalize import normalize_description
+from expense_analyzer.normalize import NORMALIZE_RULES, normalize_description
 
+if TYPE_CHECKING:
+    from expense_analyzer.classifier import CategoryModel
 
 
 @dataclass(frozen=True)
@@ -24,6 +28,19 @@ DEFAULT_RULES: list[CategoryRule] = [
 ]
 
 
+def ruleset_version(rules: Iterable[CategoryRule] = DEFAULT_RULES) -> str:
+    """
+    Short fingerprint of the merchant normalization and category rules.
+    Exports store it so precomputed merchants and categories are only
+    reused while the rules that produced them are unchanged.
+    """
+    payload = json.dumps([NORMALIZE_RULES, [(r.category, r.keywords) for r in rules]])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+
+RULESET_VERSION = ruleset_version()
+
+
 def categorize_description(description: str, rules: Iterable[CategoryRule] = DEFAULT_RULES) -> str:
     """
     Categorize a transaction description using keyword matching.
@@ -53,3 +70,86 @@ def categorize_transaction(txn: Transaction) -> str:
 
     merchant = normalize_description(txn.description)
     return categorize_description(merchant)
+
+
+def enrich_many(
+    transactions: Sequence[Transaction],
+    rules: Iterable[CategoryRule] = DEFAULT_RULES,
+    aliases: Mapping[str, str] | None = None,
+    model: CategoryModel | None = None,
+) -> tuple[list[str], list[str]]:
+    """
+    Normalize and categorize many transactions at once.
+
+    Returns two lists parallel to `transactions`: merchants and categories.
+    Each distinct description is normalized once and each distinct merchant
+    is matched against the rules once, so the cost scales with the number of
+    distinct merchants instead of the number of rows.
+
+    With an alias map (see `canonical.build_alias_map`) merchants are reported
+    under their canonical name. The category still comes from the merchant's
+    own text first; the canonical name is only tried when that is Uncategorized.
+
+    With a trained `model` (see `classifier.train_model`), merchants the rules
+    leave Uncategorized get the model's prediction when it is confident enough.
+    Like the rules, the model runs once per distinct merchant.
+
+    Transactions loaded from an enriched export with the current ruleset
+    version carry their merchant and category, which replace the rule
+    match; the alias and model fallbacks still apply to them.
+    """
+    rules = tuple(rules)
+    precomputed = ruleset_version(rules) == RULESET_VERSION
+    aliases = aliases or {}
+    merchant_by_desc: dict[str, str] = {}
+    category_by_merchant: dict[str, str] = {}
+    fallback_by_canonical: dict[str, str] = {}
+
+    merchants: list[str] = []
+    categories: list[str] = []
+
+    for txn in transactions:
+        if precomputed and txn.merchant is not None and txn.category is not None:
+            merchant, category = txn.merchant, txn.category
+        else:
+            merchant = merchant_by_desc.get(txn.description)
+            if merchant is None:
+                merchant = normalize_description(txn.description)
+                merchant_by_desc[txn.description] = merchant
+
+            if txn.amount > 0:
+                category = "Income"
+            else:
+                category = category_by_merchant.get(merchant)
+                if category is None:
+                    category = category_by_merchant[merchant] = categorize_description(merchant, rules)
+
+        canonical = aliases.get(merchant, merchant)
+        merchants.append(canonical)
+
+        # same fallbacks whether the category was computed or precomputed
+        if category == "Uncategorized":
+            fallback = fallback_by_canonical.get(canonical)
+            if fallback is None:
+                fallback = categorize_description(canonical, rules)
+                if fallback == "Uncategorized" and model is not None:
+                    fallback = model.predict(canonical) or fallback
+                fallback_by_canonical[canonical] = fallback
+            category = fallback
+        categories.append(category)
+
+    return merchants, categories
+
+
+def categorize_many(
+    transactions: Sequence[Transaction],
+    rules: Iterable[CategoryRule] = DEFAULT_RULES,
+    aliases: Mapping[str, str] | None = None,
+    model: CategoryModel | None = None,
+) -> list[str]:
+    """
+    Categorize many transactions at once (see `enrich_many`).
+    Returns a list of categories parallel to `transactions`.
+    """
+    _merchants, categories = enrich_many(transactions, rules, aliases, model)
+    return categories
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import csv
+import json
+import math
+import re
+import struct
+import sys
+import zlib
+from array import array
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterable
+
+
+_MAGIC = b"EXANBAY1"
+_U32 = struct.Struct("<I")
+_TOKEN = re.compile(r"[a-z]+")
+
+HASH_BITS = 20
+
+
+def merchant_features(merchant: str, hash_bits: int = HASH_BITS) -> list[int]:
+    """
+    Hashed features of a merchant: its words plus the character trigrams of
+    each word (so "STARBUCKSCO" still shares most features with "STARBUCKS").
+    """
+    mask = (1 << hash_bits) - 1
+    features = []
+    for word in _TOKEN.findall(merchant.lower()):
+        features.append(zlib.crc32(word.encode()) & mask)
+        padded = f"<{word}>"
+        features.extend(zlib.crc32(padded[i : i + 3].encode()) & mask for i in range(len(padded) - 2))
+    return features
+
+
+class CategoryModel:
+    """
+    Multinomial naive Bayes over hashed merchant features.
+
+    Only features seen in training are stored, as per-class log-probability
+    offsets from the class's "unseen feature" log-probability. Scoring a
+    merchant is then one dict lookup per feature and a few additions per
+    class, and the model file stays small.
+    """
+
+    def __init__(
+        self,
+        classes: list[str],
+        priors: array,
+        unseen: array,
+        weights: dict[int, array],
+        hash_bits: int = HASH_BITS,
+    ) -> None:
+        self.classes = classes
+        self.priors = priors
+        self.unseen = unseen
+        self.weights = weights
+        self.hash_bits = hash_bits
+
+    def probabilities(self, merchant: str) -> list[float]:
+        features = merchant_features(merchant, self.hash_bits)
+        scores = [p + len(features) * u for p, u in zip(self.priors, self.unseen)]
+        for f in features:
+            offsets = self.weights.get(f)
+            if offsets is not None:
+                scores = [s + o for s, o in zip(scores, offsets)]
+
+        top = max(scores)
+        exp = [math.exp(s - top) for s in scores]
+        total = sum(exp)
+        return [e / total for e in exp]
+
+    def predict(self, merchant: str, min_confidence: float = 0.6) -> str | None:
+        """
+        Most likely category, or None when its probability is below `min_confidence`.
+        """
+        if not self.classes:
+            return None
+        probs = self.probabilities(merchant)
+        best = max(range(len(probs)), key=probs.__getitem__)
+        return self.classes[best] if probs[best] >= min_confidence else None
+
+
+def train_model(
+    samples: Iterable[tuple[str, str]],
+    alpha: float = 1.0,
+    hash_bits: int = HASH_BITS,
+) -> CategoryModel:
+    """
+    Train on (merchant, category) pairs with Laplace smoothing `alpha`.
+    """
+    class_docs: dict[str, int] = defaultdict(int)
+    counts: dict[str, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    for merchant, category in samples:
+        class_docs[category] += 1
+        for f in merchant_features(merchant, hash_bits):
+            counts[category][f] += 1
+
+    classes = sorted(class_docs)
+    if not classes:
+        raise ValueError("No labeled samples to train on")
+
+    vocab = set().union(*(counts[c].keys() for c in classes))
+    docs = sum(class_docs.values())
+    priors = array("f", [math.log(class_docs[c] / docs) for c in classes])
+
+    denominators = [sum(counts[c].values()) + alpha * len(vocab) for c in classes]
+    unseen = array("f", [math.log(alpha / d) for d in denominators])
+    weights = {
+        f: array("f", [math.log((counts[c].get(f, 0) + alpha) / d) - u for c, d, u in zip(classes, denominators, unseen)])
+        for f in sorted(vocab)
+    }
+    return CategoryModel(classes, priors, unseen, weights, hash_bits)
+
+
+def load_labeled_export(csv_path: Path) -> list[tuple[str, str]]:
+    """
+    Read (merchant, category) training pairs from an enriched export
+    (see export.EXPORT_FIELDS). Income and Uncategorized rows are skipped.
+    """
+    samples = []
+    with csv_path.open("r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        if not {"merchant", "category"}.issubset(reader.fieldnames or []):
+            raise ValueError(f"{csv_path.name}: CSV must contain merchant and category columns")
+        for row in reader:
+            category = (row.get("category") or "").strip()
+            merchant = (row.get("merchant") or "").strip()
+            if merchant and category and category not in ("Income", "Uncategorized"):
+                samples.append((merchant, category))
+    return samples
+
+
+def save_model(path: Path, model: CategoryModel) -> None:
+    """
+    Persist a model: magic, u32 header length, JSON header, then float32
+    priors, unseen log-probs, u32 feature ids and a float32 offset matrix.
+    """
+    features = array("I", model.weights)
+    header = {
+        "classes": model.classes,
+        "hash_bits": model.hash_bits,
+        "features": len(features),
+        "byteorder": sys.byteorder,
+    }
+    raw_header = json.dumps(header).encode("utf-8")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as f:
+        f.write(_MAGIC)
+        f.write(_U32.pack(len(raw_header)))
+        f.write(raw_header)
+        model.priors.tofile(f)
+        model.unseen.tofile(f)
+        features.tofile(f)
+        for offsets in model.weights.values():
+            offsets.tofile(f)
+
+
+def load_model(path: Path) -> CategoryModel:
+    """
+    Load a model written by `save_model`. Raises ValueError for other files
+    and for truncated or corrupt ones.
+    """
+    with path.open("rb") as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"Not a category model: {path}")
+        try:
+            (header_len,) = _U32.unpack(f.read(4))
+            header = json.loads(f.read(header_len).decode("utf-8"))
+
+            def read(typecode: str, length: int) -> array:
+                values = array(typecode)
+                values.fromfile(f, length)
+                if header["byteorder"] != sys.byteorder:
+                    values.byteswap()
+                return values
+
+            n_classes = len(header["classes"])
+            priors = read("f", n_classes)
+            unseen = read("f", n_classes)
+            features = read("I", header["features"])
+            matrix = read("f", header["features"] * n_classes)
+            hash_bits = header["hash_bits"]
+        except (EOFError, ValueError, struct.error, KeyError, TypeError) as e:
+            raise ValueError(f"Truncated or corrupt category model: {path}") from e
+
+    weights = {f: matrix[i * n_classes : (i + 1) * n_classes] for i, f in enumerate(features)}
+    return CategoryModel(header["classes"], priors, unseen, weights, hash_bits)
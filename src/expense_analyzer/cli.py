@@ -1,62 +1,498 @@
 from __future__ import annotations
 
+import json
+from array import array
+from dataclasses import asdict
+from datetime import date
 from pathlib import Path
+from typing import Iterator, Sequence
+
 import typer
 from rich.console import Console
 from rich.table import Table
 
-from expense_analyzer.parser import load_transactions
-from expense_analyzer.categorize import categorize_transaction
-from expense_analyzer.analyze import build_monthly_summary
-from expense_analyzer.reporting import ensure_reports_dir, write_monthly_summary_json
-from expense_analyzer.validators import validate_month
+from expense_analyzer.parser import (
+    IngestReport,
+    RejectLimitExceeded,
+    Transaction,
+    count_lines,
+    head_transactions,
+    iter_transactions,
+    iter_transactions_tolerant,
+    load_transactions,
+    sample_transactions,
+    tail_transactions,
+)
+from expense_analyzer.categorize import DEFAULT_RULES, CategoryRule, enrich_many
+from expense_analyzer.canonical import build_alias_map, count_merchants, load_alias_map, save_alias_map
 from expense_analyzer.normalize import normalize_description
-from expense_analyzer.analyze import detect_unusual_spending
+from expense_analyzer.classifier import CategoryModel, load_labeled_export, load_model, save_model, train_model
+from expense_analyzer.analyze import Alert, Summary, build_monthly_summary
+from expense_analyzer.cache import (
+    ALERTS_CODEC,
+    ROWS_CODEC,
+    STATS_CODEC,
+    SUMMARIES_CODEC,
+    AnalysisCache,
+    default_cache_dir,
+)
+from expense_analyzer.sketches import SpendingStats
+from expense_analyzer.budget import evaluate_budgets
+from expense_analyzer.categories import CategoryTree, category_parts, summary_at_depth
+from expense_analyzer.compare import COMPARE_MODES, CategoryDelta, compare_months
+from expense_analyzer.forecast import forecast_spending, project_month_end
+from expense_analyzer.settings_store import load_category_rules, load_settings
+from expense_analyzer.rollup import PERIODS, RollupCube, load_rollup, save_rollup
+from expense_analyzer.reporting import (
+    REPORT_FORMATS,
+    ensure_reports_dir,
+    monthly_summary_path,
+    write_consolidated_json,
+    write_monthly_summary_json,
+    write_summaries_ndjson,
+)
+from expense_analyzer.validators import validate_month
+from expense_analyzer.analyze import (
+    detect_unusual_spending,
+    detect_unusual_spending_rolling,
+    detect_recurring_charges,
+)
+from expense_analyzer.dedupe import DroppedRow, dedupe_statement_files, write_dropped_report
+from expense_analyzer.parallel import load_transactions_parallel
+from expense_analyzer.formats import BUILTIN_PROFILES, resolve_profile
+from expense_analyzer.export import EXPORT_FORMATS, export_transactions
+from expense_analyzer.watch import StatementWatcher
+from expense_analyzer.search import IndexStale, SearchIndex, append_index, load_index, save_index
+from expense_analyzer.server import Dataset, serve as serve_dataset
+from expense_analyzer.batch import TenantResult, load_manifest, run_batch
 
 
 app = typer.Typer(add_completion=False)
 console = Console()
 
+REJECTS_OPTION = typer.Option(None, "--rejects", help="Skip bad rows and write them (with line and reason) to this CSV.")
+MAX_ERRORS_OPTION = typer.Option(None, "--max-errors", help="Skip bad rows, but abort after this many rejects.")
+MAX_ERROR_RATE_OPTION = typer.Option(None, "--max-error-rate", help="Skip bad rows, but abort above this reject rate (0-1).")
+WORKERS_OPTION = typer.Option(
+    1,
+    "--workers",
+    help="Parse one large CSV with N processes (0 = all cores). Ignored with reject options.",
+)
+PERIOD_OPTION = typer.Option("month", "--period", help=f"Group results by {', '.join(PERIODS)}.")
+PROFILE_OPTION = typer.Option(
+    None,
+    "--profile",
+    help=f"Bank format profile: auto, {', '.join(BUILTIN_PROFILES)} or a .json profile file.",
+)
+ALIASES_OPTION = typer.Option(None, "--aliases", help="Merchant alias map JSON written by the canonicalize command.")
+MODEL_OPTION = typer.Option(None, "--model", help="Category model trained with the train command (fallback for Uncategorized).")
+RULES_OPTION = typer.Option(
+    None,
+    "--rules",
+    help='Settings JSON whose "category_rules" come before the built-in rules (e.g. nested Food/Coffee).',
+)
+CACHE_OPTION = typer.Option(True, "--cache/--no-cache", help="Reuse cached results for unchanged inputs.")
+DEDUPE_OPTION = typer.Option(
+    None,
+    "--dedupe",
+    help="Overlapping statement CSV to merge in, dropping rows it shares with the main CSV (repeatable).",
+)
+DEPTH_OPTION = typer.Option(0, "--depth", help="Roll nested categories (Parent/Child) up to this many levels (0 = all levels).")
+INDEX_OPTION = typer.Option(Path("data/search.idx"), "--index", help="Search index file.")
+
+
+def _load(
+    csv_path: Path,
+    rejects: Path | None = None,
+    max_errors: int | None = None,
+    max_error_rate: float | None = None,
+    profile: str | None = None,
+    workers: int = 1,
+    dedupe_with: list[Path] | None = None,
+) -> list[Transaction]:
+    """
+    Load transactions strictly, or tolerantly when any reject option is given
+    (see `_iter_load`).
+    """
+    return list(_iter_load(csv_path, rejects, max_errors, max_error_rate, profile, workers, dedupe_with))
+
+
+def _iter_load(
+    csv_path: Path,
+    rejects: Path | None = None,
+    max_errors: int | None = None,
+    max_error_rate: float | None = None,
+    profile: str | None = None,
+    workers: int = 1,
+    dedupe_with: list[Path] | None = None,
+) -> Iterator[Transaction]:
+    """
+    Stream transactions strictly, or tolerantly when any reject option is given.
+    In tolerant mode a summary of rejected rows is printed at the end.
+    With `dedupe_with`, those statements are merged in and rows that appear
+    in more than one statement are kept once. Parallel parsing (`workers`)
+    still materializes the file.
+    """
+    try:
+        fmt = resolve_profile(profile, csv_path) if profile else None
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+    tolerant = rejects is not None or max_errors is not None or max_error_rate is not None
+    if dedupe_with:
+        if tolerant:
+            raise typer.BadParameter("--dedupe cannot be combined with reject options.")
+        dropped: list[DroppedRow] = []
+        yield from dedupe_statement_files([csv_path, *dedupe_with], on_drop=dropped.append, profile=fmt)
+        if dropped:
+            console.print(f"[yellow]Dropped {len(dropped)} duplicate row(s)[/yellow] from overlapping statements")
+        return
+
+    if not tolerant:
+        if workers != 1:
+            yield from load_transactions_parallel(csv_path, workers or None, fmt)
+        else:
+            yield from iter_transactions(csv_path, fmt)
+        return
+
+    report = IngestReport()
+    try:
+        yield from iter_transactions_tolerant(csv_path, report, rejects, max_errors, max_error_rate, fmt)
+    except RejectLimitExceeded as e:
+        console.print(f"[bold red]Aborted:[/bold red] {e}")
+        raise typer.Exit(1)
+
+    if report.rejected:
+        reasons = ", ".join(f"{kind}: {count}" for kind, count in report.reasons.most_common())
+        console.print(f"[yellow]Rejected {report.rejected} of {report.rows_read} row(s)[/yellow] ({reasons})")
+        if rejects is not None:
+            console.print(f"- Rejected rows: {rejects}")
+
+
+def _update_search_index(
+    index_path: Path,
+    csv_paths: list[Path],
+    rebuild: bool = False,
+    search_index: SearchIndex | None = None,
+) -> tuple[SearchIndex, int]:
+    """
+    Add rows appended to `csv_paths` to the index (loaded from `index_path`
+    unless an in-memory `search_index` is passed) and persist only those rows.
+    An index whose files were removed or rewritten (or `rebuild`) is rebuilt from scratch.
+    A row that cannot be parsed raises ValueError after the other files are saved.
+    """
+    if rebuild:
+        search_index = SearchIndex()
+    elif search_index is None:
+        search_index = load_index(index_path)
+
+    before = len(search_index)
+    try:
+        try:
+            search_index.update(csv_paths)
+        except IndexStale:
+            rebuild, before = True, 0
+            search_index = SearchIndex()
+            search_index.update(csv_paths)
+    finally:  # rows from readable files are kept even if another file has a bad row
+        if rebuild:
+            save_index(index_path, search_index)
+        else:
+            append_index(index_path, search_index)
+    return search_index, len(search_index) - before
+
+
+def _load_aliases(aliases_path: Path | None) -> dict[str, str] | None:
+    if aliases_path is None:
+        return None
+    if not aliases_path.exists():
+        raise typer.BadParameter(f"Alias map not found: {aliases_path}")
+    return load_alias_map(aliases_path)
+
+
+def _load_model(model_path: Path | None) -> CategoryModel | None:
+    if model_path is None:
+        return None
+    if not model_path.exists():
+        raise typer.BadParameter(f"Category model not found: {model_path}")
+    try:
+        return load_model(model_path)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+
+def _load_rules(rules_path: Path | None) -> Sequence[CategoryRule]:
+    if rules_path is None:
+        return DEFAULT_RULES
+    if not rules_path.exists():
+        raise typer.BadParameter(f"Rules file not found: {rules_path}")
+    try:
+        return load_category_rules(rules_path)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+
+def _period_summaries(
+    txns: list[Transaction],
+    period: str,
+    month: str = "",
+    aliases: dict[str, str] | None = None,
+    model: CategoryModel | None = None,
+    rules: Sequence[CategoryRule] = DEFAULT_RULES,
+) -> dict[str, Summary]:
+    """
+    Summaries per month (the default) or per period from a rollup cube,
+    optionally filtered to one month.
+    """
+    if period not in PERIODS:
+        raise typer.BadParameter(f"Period must be one of: {', '.join(PERIODS)}")
+
+    if period == "month":
+        summaries = build_monthly_summary(txns, aliases=aliases, model=model, rules=rules)
+    else:
+        summaries = RollupCube.build(txns, aliases, model, rules).summaries(period)
+
+    return _select_month(summaries, period, month)
+
+
+def _select_month(summaries: dict[str, Summary], period: str, month: str) -> dict[str, Summary]:
+    if not month:
+        return summaries
+
+    if period != "month":
+        raise typer.BadParameter("--month can only be used with --period month.")
+    month = validate_month(month)
+    if month not in summaries:
+        available = ", ".join(summaries.keys()) or "(none)"
+        raise typer.BadParameter(f"Month not found. Available months: {available}")
+    return {month: summaries[month]}
+
+
+def _open_cache(
+    use_cache: bool,
+    rejects: Path | None = None,
+    max_errors: int | None = None,
+    max_error_rate: float | None = None,
+) -> AnalysisCache | None:
+    # tolerant loads report (and write) rejected rows while reading, so they always run
+    if not use_cache or rejects is not None or max_errors is not None or max_error_rate is not None:
+        return None
+    return AnalysisCache(default_cache_dir())
+
+
+def _cache_inputs(csv_path: Path, profile: str | None, *extra: Path | None) -> list[Path]:
+    """
+    Files whose contents decide a cached result: the CSV, a .json profile, alias maps, models.
+    """
+    inputs = [csv_path, *(p for p in extra if p is not None)]
+    if profile and profile.endswith(".json"):
+        inputs.append(Path(profile))
+    return inputs
+
+
+def _cached_transactions(
+    cache: AnalysisCache,
+    csv_path: Path,
+    profile: str | None,
+    workers: int,
+    dedupe_with: list[Path] | None = None,
+    rules_path: Path | None = None,
+) -> list[Transaction]:
+    """
+    Parsed and enriched transactions, cached as packed columns. The returned
+    transactions carry their merchant and category, so analysis skips both
+    steps (with the built-in rules; custom `rules_path` rules re-categorize).
+    """
+    rules = _load_rules(rules_path)
+
+    def compute() -> tuple:
+        txns = _load(csv_path, profile=profile, workers=workers, dedupe_with=dedupe_with)
+        merchants, categories = enrich_many(txns, rules)
+        return (
+            array("i", (t.posted_date.toordinal() for t in txns)),
+            array("d", (t.amount for t in txns)),
+            [t.description for t in txns],
+            merchants,
+            categories,
+        )
+
+    ordinals, amounts, descriptions, merchants, categories = cache.get_or_compute(
+        "rows",
+        _cache_inputs(csv_path, profile, rules_path, *(dedupe_with or [])),
+        {"profile": profile, "rules": rules_path is not None},
+        compute,
+        ROWS_CODEC,
+    )
+    return [
+        Transaction(date.fromordinal(o), d, a, m, c)
+        for o, a, d, m, c in zip(ordinals, amounts, descriptions, merchants, categories)
+    ]
+
+
+def _cube_summaries(
+    cube_path: Path,
+    period: str,
+    month: str,
+    aliases_path: Path | None = None,
+    model_path: Path | None = None,
+    dedupe_with: list[Path] | None = None,
+    rules_path: Path | None = None,
+) -> dict[str, Summary]:
+    """
+    Summaries read from a cube saved by `rollup --save`: one prefix-sum lookup
+    per period and category, without touching the transactions.
+    """
+    if period not in PERIODS:
+        raise typer.BadParameter(f"Period must be one of: {', '.join(PERIODS)}")
+    if aliases_path is not None or model_path is not None or rules_path is not None or dedupe_with:
+        raise typer.BadParameter("--aliases, --model, --rules and --dedupe cannot be applied to a saved rollup cube.")
+    try:
+        cube = load_rollup(cube_path)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    return _select_month(cube.summaries(period), period, month)
+
+
+def _summaries_for(
+    csv_path: Path,
+    period: str,
+    month: str,
+    rejects: Path | None,
+    max_errors: int | None,
+    max_error_rate: float | None,
+    profile: str | None,
+    workers: int,
+    use_cache: bool,
+    aliases_path: Path | None = None,
+    model_path: Path | None = None,
+    dedupe_with: list[Path] | None = None,
+    rules_path: Path | None = None,
+) -> dict[str, Summary]:
+    if csv_path.suffix == ".rollup":
+        return _cube_summaries(csv_path, period, month, aliases_path, model_path, dedupe_with, rules_path)
+
+    aliases = _load_aliases(aliases_path)
+    model = _load_model(model_path)
+    rules = _load_rules(rules_path)
+
+    cache = _open_cache(use_cache, rejects, max_errors, max_error_rate)
+    if cache is None:
+        txns = _load(csv_path, rejects, max_errors, max_error_rate, profile, workers, dedupe_with)
+        return _period_summaries(txns, period, month, aliases, model, rules)
+
+    params = {
+        "period": period,
+        "profile": profile,
+        "aliases": aliases_path is not None,
+        "model": model_path is not None,
+        "rules": rules_path is not None,
+    }
+    summaries = cache.get_or_compute(
+        "summaries",
+        _cache_inputs(csv_path, profile, aliases_path, model_path, rules_path, *(dedupe_with or [])),
+        params,
+        lambda: _period_summaries(
+            _cached_transactions(cache, csv_path, profile, workers, dedupe_with, rules_path),
+            period,
+            "",
+            aliases,
+            model,
+            rules,
+        ),
+        SUMMARIES_CODEC,
+    )
+    return _select_month(summaries, period, month)
+
 
 @app.command()
-def preview(csv_path: Path) -> None:
+def preview(
+    csv_path: Path,
+    rows: int = typer.Option(20, "--rows", help="Number of rows to show from the start of the file."),
+    sample: int = typer.Option(0, "--sample", help="Show a uniform random sample of N rows instead (reads the whole file once)."),
+    tail: int = typer.Option(0, "--tail", help="Show the last N rows instead (reads from the end of the file)."),
+    seed: int = typer.Option(None, "--seed", help="Random seed for --sample."),
+    count: bool = typer.Option(False, "--count", help="Also count the rows (fast line count, no parsing)."),
+    profile: str = PROFILE_OPTION,
+    aliases_path: Path = ALIASES_OPTION,
+    model_path: Path = MODEL_OPTION,
+    rules_path: Path = RULES_OPTION,
+) -> None:
     """
     Preview parsed transactions and inferred categories from a CSV file.
     """
-    txns = load_transactions(csv_path)
+    if sample and tail:
+        raise typer.BadParameter("Use either --sample or --tail, not both.")
+    if min(rows, sample, tail) < 0:
+        raise typer.BadParameter("Row counts must not be negative.")
+    try:
+        fmt = resolve_profile(profile, csv_path) if profile else None
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    aliases = _load_aliases(aliases_path)
+    model = _load_model(model_path)
+    rules = _load_rules(rules_path)
 
-    table = Table(title=f"Preview: {csv_path.name}")
+    if sample:
+        shown, title = sample_transactions(csv_path, sample, fmt, seed), f"Sample of {sample}"
+    elif tail:
+        shown, title = tail_transactions(csv_path, tail, fmt), f"Last {tail}"
+    else:
+        shown, title = head_transactions(csv_path, rows, fmt), f"First {rows}"
+
+    table = Table(title=f"Preview: {csv_path.name} ({title.lower()})")
     table.add_column("Date", style="bold")
     table.add_column("Amount", justify="right")
     table.add_column("Merchant")
     table.add_column("Category")
     table.add_column("Description", overflow="fold")
 
-    for txn in txns[:20]:
-        merchant = normalize_description(txn.description)
-        category = categorize_transaction(txn)
+    merchants, categories = enrich_many(shown, rules, aliases, model)
+    for txn, merchant, category in zip(shown, merchants, categories):
         table.add_row(str(txn.posted_date), f"{txn.amount:.2f}", merchant, category, txn.description)
 
     console.print(table)
-    console.print(f"[bold]Loaded:[/bold] {len(txns)} transactions")
+    if count:
+        console.print(f"[bold]Rows:[/bold] {max(count_lines(csv_path) - 1, 0)} (line count, excluding the header)")
 
 @app.command()
 def summary(
     csv_path: Path,
     month: str = typer.Option("", "--month", help="Filter results to a specific month (YYYY-MM)."),
+    rejects: Path = REJECTS_OPTION,
+    max_errors: int = MAX_ERRORS_OPTION,
+    max_error_rate: float = MAX_ERROR_RATE_OPTION,
+    profile: str = PROFILE_OPTION,
+    workers: int = WORKERS_OPTION,
+    period: str = PERIOD_OPTION,
+    aliases_path: Path = ALIASES_OPTION,
+    model_path: Path = MODEL_OPTION,
+    rules_path: Path = RULES_OPTION,
+    use_cache: bool = CACHE_OPTION,
+    depth: int = DEPTH_OPTION,
+    dedupe_with: list[Path] = DEDUPE_OPTION,
 ) -> None:
     """
     Print a monthly summary (income, expenses, net) and category breakdown.
+    Nested categories are shown as a tree with parent totals.
+    A .rollup cube saved by `rollup --save` can be given instead of the CSV.
     """
-    txns = load_transactions(csv_path)
-    summaries = build_monthly_summary(txns)
-
-    if month:
-        month = validate_month(month)
-        if month not in summaries:
-            available = ", ".join(summaries.keys()) or "(none)"
-            raise typer.BadParameter(f"Month not found. Available months: {available}")
-        summaries = {month: summaries[month]}
+    if depth < 0:
+        raise typer.BadParameter("--depth must be 0 or more.")
+    summaries = _summaries_for(
+        csv_path,
+        period,
+        month,
+        rejects,
+        max_errors,
+        max_error_rate,
+        profile,
+        workers,
+        use_cache,
+        aliases_path,
+        model_path,
+        dedupe_with,
+        rules_path,
+    )
 
     for month_key, s in summaries.items():
         console.print(f"\n[bold]{month_key}[/bold]")
@@ -68,8 +504,82 @@ def summary(
         table.add_column("Category")
         table.add_column("Total", justify="right")
 
-        for cat, total in s.by_category.items():
-            table.add_row(cat, f"{total:.2f}")
+        for node in CategoryTree(s.by_category).walk():
+            if not depth or node.depth <= depth:
+                label = "  " * (node.depth - 1) + category_parts(node.path)[-1]
+                table.add_row(label, f"{node.total:.2f}", style="bold" if node.children else "")
+
+        console.print(table)
+
+
+@app.command()
+def compare(
+    csv_path: Path,
+    mode: str = typer.Option("mom", "--mode", help="mom (month over month) or yoy (year over year)."),
+    month: str = typer.Option("", "--month", help="Only show the comparison for this month (YYYY-MM)."),
+    fmt: str = typer.Option("table", "--format", help="table or json."),
+    rejects: Path = REJECTS_OPTION,
+    max_errors: int = MAX_ERRORS_OPTION,
+    max_error_rate: float = MAX_ERROR_RATE_OPTION,
+    profile: str = PROFILE_OPTION,
+    workers: int = WORKERS_OPTION,
+    aliases_path: Path = ALIASES_OPTION,
+    model_path: Path = MODEL_OPTION,
+    rules_path: Path = RULES_OPTION,
+) -> None:
+    """
+    Compare category spend with the previous month or the same month last year.
+    """
+    if mode not in COMPARE_MODES:
+        raise typer.BadParameter(f"Mode must be one of: {', '.join(COMPARE_MODES)}")
+    if fmt not in ("table", "json"):
+        raise typer.BadParameter("Format must be one of: table, json")
+
+    aliases = _load_aliases(aliases_path)
+    model = _load_model(model_path)
+    rules = _load_rules(rules_path)
+    txns = _load(csv_path, rejects, max_errors, max_error_rate, profile, workers)
+    comparisons = compare_months(build_monthly_summary(txns, aliases=aliases, model=model, rules=rules), mode)
+
+    if month:
+        month = validate_month(month)
+        comparisons = [c for c in comparisons if c.month == month]
+
+    if fmt == "json":
+        typer.echo(json.dumps([asdict(c) for c in comparisons], indent=2))
+        return
+
+    if not comparisons:
+        console.print("[yellow]No months to compare.[/yellow]")
+        return
+
+    def pct(d: CategoryDelta) -> str:
+        if d.new:
+            return "new"
+        return "-" if d.pct_change is None else f"{d.pct_change:+.1f}%"
+
+    for c in comparisons:
+        no_data = " (no data)" if c.expenses.new else ""
+        console.print(f"\n[bold]{c.month}[/bold] vs {c.baseline}{no_data}")
+        table = Table(title="Change by category")
+        table.add_column("Category")
+        table.add_column(c.baseline, justify="right")
+        table.add_column(c.month, justify="right")
+        table.add_column("Change", justify="right")
+        table.add_column("%", justify="right")
+
+        for d in [*c.categories, c.expenses, c.income]:
+            is_total = d is c.expenses or d is c.income
+            worse = d.delta < 0 if d is c.income else d.delta > 0
+            color = "red" if worse else "green"
+            table.add_row(
+                d.category,
+                f"{d.previous:.2f}",
+                f"{d.current:.2f}",
+                f"[{color}]{d.delta:+.2f}[/{color}]",
+                pct(d),
+                style="bold" if is_total else "",
+            )
 
         console.print(table)
 
@@ -79,26 +589,63 @@ def report(
     csv_path: Path,
     out_dir: Path = typer.Option(Path("reports"), "--out-dir", help="Output directory for report files."),
     month: str = typer.Option("", "--month", help="Generate report for a specific month (YYYY-MM)."),
+    rejects: Path = REJECTS_OPTION,
+    max_errors: int = MAX_ERRORS_OPTION,
+    max_error_rate: float = MAX_ERROR_RATE_OPTION,
+    profile: str = PROFILE_OPTION,
+    workers: int = WORKERS_OPTION,
+    period: str = PERIOD_OPTION,
+    fmt: str = typer.Option(
+        "json",
+        "--format",
+        help="json (one file per month), consolidated (one JSON document) or ndjson (one summary per line).",
+    ),
+    compact: bool = typer.Option(False, "--compact", help="Write JSON without indentation."),
+    aliases_path: Path = ALIASES_OPTION,
+    model_path: Path = MODEL_OPTION,
+    rules_path: Path = RULES_OPTION,
+    use_cache: bool = CACHE_OPTION,
+    depth: int = DEPTH_OPTION,
+    dedupe_with: list[Path] = DEDUPE_OPTION,
 ) -> None:
     """
-    Generate JSON reports for each month found in the CSV.
+    Generate JSON reports for each month found in the CSV
+    (or in a .rollup cube saved by `rollup --save`).
     """
-    txns = load_transactions(csv_path)
-    summaries = build_monthly_summary(txns)
+    if fmt not in REPORT_FORMATS:
+        raise typer.BadParameter(f"Format must be one of: {', '.join(REPORT_FORMATS)}")
+    if depth < 0:
+        raise typer.BadParameter("--depth must be 0 or more.")
 
-    if month:
-        month = validate_month(month)
-        if month not in summaries:
-            available = ", ".join(summaries.keys()) or "(none)"
-            raise typer.BadParameter(f"Month not found. Available months: {available}")
-        summaries = {month: summaries[month]}
+    summaries = _summaries_for(
+        csv_path,
+        period,
+        month,
+        rejects,
+        max_errors,
+        max_error_rate,
+        profile,
+        workers,
+        use_cache,
+        aliases_path,
+        model_path,
+        dedupe_with,
+        rules_path,
+    )
+    if depth:
+        summaries = {key: summary_at_depth(s, depth) for key, s in summaries.items()}
 
     reports_dir = ensure_reports_dir(out_dir)
 
     created = []
-    for _month, s in summaries.items():
-        out_path = write_monthly_summary_json(reports_dir, s)
-        created.append(out_path)
+    if fmt == "consolidated":
+        created.append(write_consolidated_json(reports_dir, summaries.values(), compact=compact))
+    elif fmt == "ndjson":
+        created.append(write_summaries_ndjson(reports_dir, summaries.values()))
+    else:
+        for _month, s in summaries.items():
+            out_path = write_monthly_summary_json(reports_dir, s, compact=compact)
+            created.append(out_path)
 
     console.print(f"[bold green]Created {len(created)} report file(s):[/bold green]")
     for p in created:
@@ -112,17 +659,79 @@ def alerts(
     multiplier: float = typer.Option(2.5, "--multiplier", help="Alert threshold multiplier vs category average."),
     min_amount: float = typer.Option(50.0, "--min-amount", help="Minimum expense amount to consider for alerts."),
     min_samples: int = typer.Option(3, "--min-samples", help="Minimum number of samples in a category to enable alerts."),
+    window: int = typer.Option(
+        0,
+        "--window",
+        help="Compare against a rolling N-month category baseline instead of the current month (0 = off).",
+    ),
+    rejects: Path = REJECTS_OPTION,
+    max_errors: int = MAX_ERRORS_OPTION,
+    max_error_rate: float = MAX_ERROR_RATE_OPTION,
+    profile: str = PROFILE_OPTION,
+    workers: int = WORKERS_OPTION,
+    aliases_path: Path = ALIASES_OPTION,
+    model_path: Path = MODEL_OPTION,
+    rules_path: Path = RULES_OPTION,
+    use_cache: bool = CACHE_OPTION,
+    dedupe_with: list[Path] = DEDUPE_OPTION,
 ) -> None:
     """
     Show unusually large expenses based on category averages.
     """
-    txns = load_transactions(csv_path)
-    alerts_by_month = detect_unusual_spending(
-        txns,
-        multiplier=multiplier,
-        min_amount=min_amount,
-        min_samples=min_samples,
-    )
+    if window < 0:
+        raise typer.BadParameter("Window must be 0 (off) or a positive number of months.")
+
+    aliases = _load_aliases(aliases_path)
+    model = _load_model(model_path)
+    rules = _load_rules(rules_path)
+    cache = _open_cache(use_cache, rejects, max_errors, max_error_rate)
+
+    def compute() -> dict[str, list[Alert]]:
+        if cache is None:
+            txns = _load(csv_path, rejects, max_errors, max_error_rate, profile, workers, dedupe_with)
+        else:
+            txns = _cached_transactions(cache, csv_path, profile, workers, dedupe_with, rules_path)
+        if window:
+            return detect_unusual_spending_rolling(
+                txns,
+                window_months=window,
+                multiplier=multiplier,
+                min_amount=min_amount,
+                min_samples=min_samples,
+                aliases=aliases,
+                model=model,
+                rules=rules,
+            )
+        return detect_unusual_spending(
+            txns,
+            multiplier=multiplier,
+            min_amount=min_amount,
+            min_samples=min_samples,
+            aliases=aliases,
+            model=model,
+            rules=rules,
+        )
+
+    if cache is None:
+        alerts_by_month = compute()
+    else:
+        params = {
+            "multiplier": multiplier,
+            "min_amount": min_amount,
+            "min_samples": min_samples,
+            "window": window,
+            "profile": profile,
+            "aliases": aliases_path is not None,
+            "model": model_path is not None,
+            "rules": rules_path is not None,
+        }
+        alerts_by_month = cache.get_or_compute(
+            "alerts",
+            _cache_inputs(csv_path, profile, aliases_path, model_path, rules_path, *(dedupe_with or [])),
+            params,
+            compute,
+            ALERTS_CODEC,
+        )
 
     if month:
         month = validate_month(month)
@@ -151,6 +760,615 @@ def alerts(
     if not any_alerts:
         console.print("[green]No unusual spending detected.[/green]")
 
+@app.command()
+def recurring(
+    csv_path: Path,
+    tolerance: float = typer.Option(0.1, "--tolerance", help="Relative amount tolerance within a recurring charge."),
+    min_occurrences: int = typer.Option(3, "--min-occurrences", help="Minimum number of charges to call it recurring."),
+    aliases_path: Path = ALIASES_OPTION,
+    model_path: Path = MODEL_OPTION,
+    rules_path: Path = RULES_OPTION,
+) -> None:
+    """
+    Detect recurring charges such as subscriptions and memberships.
+    """
+    aliases = _load_aliases(aliases_path)
+    model = _load_model(model_path)
+    rules = _load_rules(rules_path)
+    txns = load_transactions(csv_path)
+    charges = detect_recurring_charges(
+        txns,
+        amount_tolerance=tolerance,
+        min_occurrences=min_occurrences,
+        aliases=aliases,
+        model=model,
+        rules=rules,
+    )
+
+    if not charges:
+        console.print("[green]No recurring charges detected.[/green]")
+        return
+
+    table = Table(title="Recurring charges")
+    table.add_column("Merchant", style="bold")
+    table.add_column("Category")
+    table.add_column("Cadence")
+    table.add_column("Amount", justify="right")
+    table.add_column("Per year", justify="right")
+    table.add_column("Count", justify="right")
+    table.add_column("Last")
+    table.add_column("Next expected")
+
+    for c in charges:
+        table.add_row(
+            c.merchant,
+            c.category,
+            c.cadence,
+            f"{c.typical_amount:.2f}",
+            f"{c.annual_cost:.2f}",
+            str(c.occurrences),
+            c.last_date,
+            c.next_expected,
+        )
+
+    console.print(table)
+
+
+@app.command()
+def export(
+    csv_path: Path,
+    out_path: Path = typer.Option(..., "--out", help="Output file for the enriched export."),
+    fmt: str = typer.Option("csv", "--format", help=f"Export format: {', '.join(EXPORT_FORMATS)}."),
+    rejects: Path = REJECTS_OPTION,
+    max_errors: int = MAX_ERRORS_OPTION,
+    max_error_rate: float = MAX_ERROR_RATE_OPTION,
+    profile: str = PROFILE_OPTION,
+    workers: int = WORKERS_OPTION,
+    aliases_path: Path = ALIASES_OPTION,
+    model_path: Path = MODEL_OPTION,
+    rules_path: Path = RULES_OPTION,
+) -> None:
+    """
+    Export enriched transactions (date, amount, merchant, category, description).
+    Rows are streamed to the output in batches.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise typer.BadParameter(f"Format must be one of: {', '.join(EXPORT_FORMATS)}")
+
+    aliases = _load_aliases(aliases_path)
+    model = _load_model(model_path)
+    rules = _load_rules(rules_path)
+    txns = _iter_load(csv_path, rejects, max_errors, max_error_rate, profile, workers)
+    out_path.expanduser().resolve().parent.mkdir(parents=True, exist_ok=True)
+    try:
+        count = export_transactions(out_path, txns, fmt, aliases, model, rules)
+    except ValueError as e:  # a bad row in strict mode
+        raise typer.BadParameter(str(e))
+
+    console.print(f"[bold green]Exported {count} transaction(s) ({fmt}):[/bold green] {out_path}")
+
+@app.command()
+def dedupe(
+    csv_paths: list[Path],
+    out_path: Path = typer.Option(..., "--out", help="Merged CSV with duplicates removed."),
+    report_path: Path = typer.Option(None, "--report", help="Optional CSV listing the dropped rows."),
+) -> None:
+    """
+    Merge overlapping statement CSVs, dropping rows that appear in more than one.
+    """
+    import csv
+
+    dropped: list[DroppedRow] = []
+    kept = 0
+
+    out_path.expanduser().resolve().parent.mkdir(parents=True, exist_ok=True)
+    with out_path.open("w", encoding="utf-8", newline="", buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(("date", "description", "amount"))
+        for txn in dedupe_statement_files(csv_paths, on_drop=dropped.append):
+            writer.writerow((str(txn.posted_date), txn.description, f"{txn.amount:.2f}"))
+            kept += 1
+
+    console.print(f"[bold green]Kept {kept} transaction(s), dropped {len(dropped)} duplicate(s):[/bold green] {out_path}")
+
+    if report_path is not None:
+        write_dropped_report(report_path, dropped)
+        console.print(f"- Dropped rows report: {report_path}")
+
+@app.command()
+def watch(
+    statement_dir: Path,
+    out_dir: Path = typer.Option(Path("reports"), "--out-dir", help="Output directory for report files."),
+    interval: float = typer.Option(2.0, "--interval", help="Seconds between directory polls."),
+    once: bool = typer.Option(False, "--once", help="Process the directory once and exit."),
+    index_path: Path = typer.Option(None, "--index", help="Also keep this search index up to date."),
+    aliases_path: Path = ALIASES_OPTION,
+    model_path: Path = MODEL_OPTION,
+    rules_path: Path = RULES_OPTION,
+) -> None:
+    """
+    Watch a directory of statement CSVs and keep monthly JSON reports up to date.
+    """
+    import time
+
+    if not statement_dir.is_dir():
+        raise typer.BadParameter(f"Not a directory: {statement_dir}")
+
+    watcher = StatementWatcher(
+        statement_dir, aliases=_load_aliases(aliases_path), model=_load_model(model_path), rules=_load_rules(rules_path)
+    )
+    reports_dir = ensure_reports_dir(out_dir)
+    if not once:
+        console.print(f"[bold]Watching[/bold] {statement_dir} (Ctrl+C to stop)")
+
+    search_index = None
+    reported_errors: dict[Path, str] = {}
+    try:
+        while True:
+            try:
+                months = watcher.poll()
+            except OSError as e:  # e.g. a file removed between listing and reading it
+                console.print(f"[red]Error:[/red] {e}")
+                months = set()
+
+            for path, error in watcher.errors.items():
+                if reported_errors.get(path) != error:
+                    console.print(f"[red]Skipping {path.name} until it is fixed:[/red] {error}")
+            reported_errors = dict(watcher.errors)
+
+            for month_key in sorted(months):
+                if month_key in watcher.totals:
+                    write_monthly_summary_json(reports_dir, watcher.totals.summary(month_key))
+                else:  # its rows are gone (file removed or rewritten)
+                    monthly_summary_path(reports_dir, month_key).unlink(missing_ok=True)
+            if months:
+                console.print(f"[bold green]Updated {len(months)} report(s):[/bold green] {', '.join(sorted(months))}")
+                if index_path is not None:
+                    try:
+                        search_index, _added = _update_search_index(
+                            index_path, sorted(statement_dir.glob("*.csv")), search_index=search_index
+                        )
+                    except (OSError, ValueError) as e:
+                        console.print(f"[red]Search index skipped a file:[/red] {e}")
+
+            if once:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        console.print("Stopped.")
+
+@app.command()
+def index(
+    csv_paths: list[Path],
+    index_path: Path = INDEX_OPTION,
+    rebuild: bool = typer.Option(False, "--rebuild", help="Discard the saved index and index every file again."),
+) -> None:
+    """
+    Add statement CSVs to the search index (only rows appended since the last run are read).
+    """
+    try:
+        search_index, added = _update_search_index(index_path, csv_paths, rebuild)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    console.print(f"[bold green]Indexed {added} new row(s)[/bold green] ({len(search_index)} total)")
+    console.print(f"- Index: {index_path}")
+
+
+@app.command()
+def search(
+    query: str,
+    index_path: Path = INDEX_OPTION,
+    date_from: str = typer.Option("", "--from", help="First date (YYYY-MM-DD)."),
+    date_to: str = typer.Option("", "--to", help="Last date (YYYY-MM-DD)."),
+    min_amount: float = typer.Option(None, "--min-amount", help="Minimum absolute amount."),
+    max_amount: float = typer.Option(None, "--max-amount", help="Maximum absolute amount."),
+    limit: int = typer.Option(50, "--limit", help="Maximum number of results (newest first)."),
+) -> None:
+    """
+    Find transactions whose merchant or description contains QUERY, using the search index.
+    """
+    if not index_path.exists():
+        raise typer.BadParameter(f"Search index not found: {index_path} (run the index command first)")
+    try:
+        first = date.fromisoformat(date_from) if date_from else None
+        last = date.fromisoformat(date_to) if date_to else None
+    except ValueError:
+        raise typer.BadParameter("--from and --to must be in YYYY-MM-DD format.")
+
+    try:
+        hits = load_index(index_path).search(query, first, last, min_amount, max_amount, limit)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+    if not hits:
+        console.print("[yellow]No matching transactions.[/yellow]")
+        return
+
+    table = Table(title=f"Search: {query}")
+    table.add_column("Date", style="bold")
+    table.add_column("Amount", justify="right")
+    table.add_column("Merchant")
+    table.add_column("Description", overflow="fold")
+    for hit in hits:
+        table.add_row(str(hit.posted_date), f"{hit.amount:.2f}", hit.merchant, hit.description)
+    console.print(table)
+
+
+@app.command()
+def serve(
+    csv_paths: list[Path],
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to bind (localhost by default)."),
+    port: int = typer.Option(8765, "--port", help="TCP port to listen on."),
+    settings_path: Path = typer.Option(None, "--settings", help="Budget settings JSON for /budget queries."),
+    reload_interval: float = typer.Option(2.0, "--reload-interval", help="Seconds between checks for changed files."),
+    aliases_path: Path = ALIASES_OPTION,
+    model_path: Path = MODEL_OPTION,
+    rules_path: Path = RULES_OPTION,
+) -> None:
+    """
+    Serve summary, alerts and budget queries over HTTP/JSON from in-memory data.
+    """
+    import asyncio
+
+    aliases = _load_aliases(aliases_path)
+    model = _load_model(model_path)
+    rules = _load_rules(rules_path)
+    try:
+        dataset = Dataset(csv_paths, settings_path, aliases, model, rules)
+    except FileNotFoundError as e:
+        raise typer.BadParameter(f"File not found: {e.filename}")
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    console.print(
+        f"[bold]Serving[/bold] {len(dataset.transactions)} transactions on http://{host}:{port} "
+        "(/months, /summary, /alerts, /budget; Ctrl+C to stop)"
+    )
+
+    try:
+        asyncio.run(serve_dataset(dataset, host=host, port=port, reload_interval=reload_interval))
+    except KeyboardInterrupt:
+        console.print("Stopped.")
+
+@app.command()
+def rollup(
+    source: Path,
+    period: str = PERIOD_OPTION,
+    start: str = typer.Option("", "--from", help="First day to include (YYYY-MM-DD)."),
+    end: str = typer.Option("", "--to", help="Last day to include (YYYY-MM-DD)."),
+    save: Path = typer.Option(None, "--save", help="Persist the rollup cube to this file."),
+    rules_path: Path = RULES_OPTION,
+) -> None:
+    """
+    Print income/expense/net per period from a CSV or a saved .rollup cube.
+    """
+    if period not in PERIODS:
+        raise typer.BadParameter(f"Period must be one of: {', '.join(PERIODS)}")
+    try:
+        first = date.fromisoformat(start) if start else None
+        last = date.fromisoformat(end) if end else None
+    except ValueError:
+        raise typer.BadParameter("--from/--to must be in YYYY-MM-DD format.")
+
+    if source.suffix == ".rollup" and rules_path is not None:
+        raise typer.BadParameter("--rules cannot be applied to a saved rollup cube.")
+    rules = _load_rules(rules_path)
+    try:
+        if source.suffix == ".rollup":
+            cube = load_rollup(source)
+        else:
+            cube = RollupCube.build(load_transactions(source), rules=rules)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    if save is not None:
+        save_rollup(save, cube)
+        console.print(f"[bold green]Saved rollup:[/bold green] {save}")
+
+    table = Table(title=f"Totals by {period}")
+    table.add_column("Period", style="bold")
+    table.add_column("Income", justify="right")
+    table.add_column("Expenses", justify="right")
+    table.add_column("Net", justify="right")
+
+    for key, s in cube.summaries(period, first, last).items():
+        table.add_row(key, f"{s.income_total:.2f}", f"{s.expense_total:.2f}", f"{s.net_total:.2f}")
+
+    console.print(table)
+
+@app.command()
+def stats(
+    csv_paths: list[Path],
+    top: int = typer.Option(50, "--top", help="Number of top merchants by spend to show."),
+    quantiles: str = typer.Option("0.5,0.9,0.99", "--quantiles", help="Comma-separated expense quantiles per category."),
+    aliases_path: Path = ALIASES_OPTION,
+    model_path: Path = MODEL_OPTION,
+    rules_path: Path = RULES_OPTION,
+    use_cache: bool = CACHE_OPTION,
+) -> None:
+    """
+    Show top merchants by spend and expense percentiles per category (bounded memory).
+    Each file's sketches are cached, so only new or changed files are read again.
+    """
+    try:
+        qs = [float(q) for q in quantiles.split(",") if q.strip()]
+    except ValueError:
+        raise typer.BadParameter("Quantiles must be numbers between 0 and 1, e.g. 0.5,0.9,0.99")
+    if not qs or any(not 0 <= q <= 1 for q in qs):
+        raise typer.BadParameter("Quantiles must be numbers between 0 and 1, e.g. 0.5,0.9,0.99")
+
+    aliases = _load_aliases(aliases_path)
+    model = _load_model(model_path)
+    rules = _load_rules(rules_path)
+
+    capacity = max(1000, top * 20)
+    cache = _open_cache(use_cache)
+
+    def file_stats(csv_path: Path) -> SpendingStats:
+        stats = SpendingStats(merchant_capacity=capacity)
+        build_monthly_summary(load_transactions(csv_path), stats=stats, aliases=aliases, model=model, rules=rules)
+        return stats
+
+    # one sketch per file, merged, so each file is summarized (and cached) independently
+    combined = SpendingStats(merchant_capacity=capacity)
+    for csv_path in csv_paths:
+        if cache is None:
+            combined.merge(file_stats(csv_path))
+            continue
+        params = {
+            "capacity": capacity,
+            "aliases": aliases_path is not None,
+            "model": model_path is not None,
+            "rules": rules_path is not None,
+        }
+        combined.merge(
+            cache.get_or_compute(
+                "stats",
+                _cache_inputs(csv_path, None, aliases_path, model_path, rules_path),
+                params,
+                lambda: file_stats(csv_path),
+                STATS_CODEC,
+            )
+        )
+
+    table = Table(title=f"Top {top} merchants by spend")
+    table.add_column("Merchant", style="bold")
+    table.add_column("Spend (est.)", justify="right")
+    for merchant, spend in combined.merchants.top(top):
+        table.add_row(merchant, f"{spend:.2f}")
+    console.print(table)
+
+    table = Table(title="Expense amount percentiles")
+    table.add_column("Category", style="bold")
+    table.add_column("Count", justify="right")
+    for q in qs:
+        table.add_column(f"p{q * 100:g}", justify="right")
+    for category, sketch in sorted(combined.amounts.items()):
+        table.add_row(category, str(sketch.count), *(f"{sketch.quantile(q):.2f}" for q in qs))
+    console.print(table)
+
+@app.command()
+def train(
+    export_paths: list[Path],
+    out_path: Path = typer.Option(Path("data/category_model.bin"), "--out", help="Where to save the model."),
+    alpha: float = typer.Option(1.0, "--alpha", help="Laplace smoothing."),
+) -> None:
+    """
+    Train the fallback category model on labeled exports (merchant and category columns).
+    """
+    if alpha <= 0:
+        raise typer.BadParameter("Alpha must be positive.")
+
+    samples = []
+    for export_path in export_paths:
+        try:
+            samples.extend(load_labeled_export(export_path))
+        except ValueError as e:
+            raise typer.BadParameter(str(e))
+    if not samples:
+        raise typer.BadParameter("No labeled rows found (Income and Uncategorized rows are skipped).")
+
+    model = train_model(samples, alpha)
+    save_model(out_path, model)
+
+    console.print(f"[bold green]Trained on {len(samples)} row(s)[/bold green]: {', '.join(model.classes)}")
+    console.print(f"- Model: {out_path} ({out_path.stat().st_size} bytes)")
+
+
+@app.command()
+def canonicalize(
+    csv_paths: list[Path],
+    out_path: Path = typer.Option(Path("data/merchant_aliases.json"), "--out", help="Where to save the alias map."),
+    threshold: float = typer.Option(0.6, "--threshold", help="Trigram similarity needed to merge two merchants (0-1)."),
+    show: int = typer.Option(20, "--show", help="Number of merged merchant groups to print."),
+) -> None:
+    """
+    Group merchant variants (e.g. AMZN MKTP / AMAZON.COM) and save an alias map for --aliases.
+    """
+    if not 0 < threshold <= 1:
+        raise typer.BadParameter("Threshold must be between 0 and 1.")
+
+    merchants = count_merchants(
+        normalize_description(txn.description) for csv_path in csv_paths for txn in load_transactions(csv_path)
+    )
+    capped: list[tuple[str, int]] = []
+    aliases = build_alias_map(merchants, threshold, on_capped=lambda merchant, size: capped.append((merchant, size)))
+    save_alias_map(out_path, aliases)
+
+    groups: dict[str, list[str]] = {}
+    for variant, canonical in aliases.items():
+        groups.setdefault(canonical, []).append(variant)
+
+    table = Table(title="Merged merchants")
+    table.add_column("Canonical", style="bold")
+    table.add_column("Variants", overflow="fold")
+    for canonical, variants in sorted(groups.items(), key=lambda kv: len(kv[1]), reverse=True)[:show]:
+        table.add_row(canonical, ", ".join(sorted(variants)))
+    console.print(table)
+
+    console.print(f"[bold]Merchants:[/bold] {len(merchants)} distinct, {len(aliases)} merged into {len(groups)} group(s)")
+    console.print(f"- Alias map: {out_path}")
+    if capped:
+        largest = ", ".join(f"{merchant} ({size})" for merchant, size in sorted(capped, key=lambda c: -c[1])[:3])
+        console.print(
+            f"[yellow]{len(capped)} large merchant block(s) compared against cluster leaders only:[/yellow] {largest}"
+        )
+
+
+@app.command()
+def budget(
+    csv_path: Path,
+    settings_path: Path = typer.Option(Path("data/settings.json"), "--settings", help="Budget settings JSON."),
+    month: str = typer.Option("", "--month", help="Show a specific month (YYYY-MM)."),
+    as_of: str = typer.Option("", "--as-of", help="Date used for the burn-rate projection (YYYY-MM-DD, default today)."),
+    depth: int = DEPTH_OPTION,
+    aliases_path: Path = ALIASES_OPTION,
+    model_path: Path = MODEL_OPTION,
+    rules_path: Path = RULES_OPTION,
+) -> None:
+    """
+    Compare category budgets with actual spending for every month, with a burn-rate projection.
+    Budgets can be set on parent categories ("Food") as well as subcategories ("Food/Coffee").
+    """
+    if depth < 0:
+        raise typer.BadParameter("--depth must be 0 or more.")
+
+    try:
+        as_of_date = date.fromisoformat(as_of) if as_of else None
+    except ValueError:
+        raise typer.BadParameter("--as-of must be in YYYY-MM-DD format.")
+
+    aliases = _load_aliases(aliases_path)
+    model = _load_model(model_path)
+    rules = _load_rules(rules_path)
+    summaries = _period_summaries(load_transactions(csv_path), "month", month, aliases, model, rules)
+    budgets = evaluate_budgets(summaries, load_settings(settings_path), as_of_date, depth or None)
+
+    for month_key, b in budgets.items():
+        console.print(f"\n[bold]{month_key}[/bold]")
+        console.print(f"Income:   [green]{b.income_total:.2f}[/green] / target {b.income_target:.2f}")
+        console.print(f"Expenses: [red]{b.expense_total:.2f}[/red]")
+        if b.days_elapsed < b.days_in_month:
+            console.print(
+                f"Projected: [red]{b.projected_expenses:.2f}[/red] (day {b.days_elapsed} of {b.days_in_month})"
+            )
+        console.print(f"Net:      [bold]{b.net_total:.2f}[/bold] / savings goal {b.savings_goal:.2f}")
+
+        table = Table(title="Budget vs. actual")
+        table.add_column("Category")
+        table.add_column("Budget", justify="right")
+        table.add_column("Spent", justify="right")
+        table.add_column("Remaining", justify="right")
+        table.add_column("Projected", justify="right")
+
+        for c in b.categories:
+            projected = f"{c.projected:.2f}"
+            if c.budget and c.projected > c.budget:
+                projected = f"[red]{projected}[/red]"
+            table.add_row(c.category, f"{c.budget:.2f}", f"{c.spent:.2f}", f"{c.remaining:.2f}", projected)
+
+        console.print(table)
+
+
+@app.command()
+def forecast(
+    csv_path: Path,
+    months: int = typer.Option(3, "--months", help="Number of months to forecast."),
+    settings_path: Path = typer.Option(Path("data/settings.json"), "--settings", help="Budget settings JSON."),
+    as_of: str = typer.Option("", "--as-of", help="Forecast from this date (YYYY-MM-DD, default today)."),
+    aliases_path: Path = ALIASES_OPTION,
+    model_path: Path = MODEL_OPTION,
+    rules_path: Path = RULES_OPTION,
+) -> None:
+    """
+    Forecast spend per category for the next months and this month's month-end net.
+    """
+    if months < 1:
+        raise typer.BadParameter("--months must be at least 1.")
+    try:
+        as_of_date = date.fromisoformat(as_of) if as_of else date.today()
+    except ValueError:
+        raise typer.BadParameter("--as-of must be in YYYY-MM-DD format.")
+
+    aliases = _load_aliases(aliases_path)
+    model = _load_model(model_path)
+    rules = _load_rules(rules_path)
+    summaries = build_monthly_summary(load_transactions(csv_path), aliases=aliases, model=model, rules=rules)
+    fc = forecast_spending(summaries, months, as_of_date)
+    settings = load_settings(settings_path)
+
+    table = Table(title="Forecast")
+    table.add_column("Category")
+    table.add_column("Model")
+    for month_key in fc.months:
+        table.add_column(month_key, justify="right")
+
+    for series in [*fc.categories, fc.expenses, fc.income]:
+        style = "bold" if series is fc.expenses or series is fc.income else ""
+        table.add_row(series.name, series.method, *(f"{v:.2f}" for v in series.values), style=style)
+    console.print(table)
+
+    end = project_month_end(summaries, fc, as_of_date)
+    console.print(f"\n[bold]{end.month} month-end projection[/bold]")
+    console.print(f"Income:   [green]{end.income:.2f}[/green] / target {settings.income_target:.2f}")
+    console.print(f"Expenses: [red]{end.expenses:.2f}[/red]")
+    color = "green" if end.net >= settings.savings_goal else "red"
+    console.print(f"Net:      [{color}]{end.net:.2f}[/{color}] / savings goal {settings.savings_goal:.2f}")
+
+
+@app.command()
+def batch(
+    manifest: Path,
+    out_dir: Path = typer.Option(Path("reports/batch"), "--out-dir", help="Root directory for per-tenant outputs."),
+    workers: int = typer.Option(0, "--workers", help="Worker processes (0 = all cores)."),
+    as_of: str = typer.Option("", "--as-of", help="Date used for budget projections (YYYY-MM-DD, default today)."),
+    aliases_path: Path = ALIASES_OPTION,
+    model_path: Path = MODEL_OPTION,
+    rules_path: Path = RULES_OPTION,
+) -> None:
+    """
+    Parse, analyze and report every tenant in a JSON manifest on a process pool.
+    Each tenant writes to its own directory; failures are recorded in error.txt.
+    """
+    if workers < 0:
+        raise typer.BadParameter("--workers must be 0 or more.")
+    try:
+        as_of_date = date.fromisoformat(as_of) if as_of else None
+    except ValueError:
+        raise typer.BadParameter("--as-of must be in YYYY-MM-DD format.")
+    try:
+        tenants = load_manifest(manifest, out_dir)
+    except (OSError, ValueError) as e:
+        raise typer.BadParameter(str(e))
+
+    def progress(result: TenantResult) -> None:
+        status = "[green]ok[/green]" if result.ok else "[red]failed[/red]"
+        console.print(f"{result.name}: {status} ({result.seconds:.2f}s)")
+
+    results = run_batch(
+        tenants,
+        workers=workers or None,
+        as_of=as_of_date,
+        on_result=progress,
+        aliases=_load_aliases(aliases_path),
+        model=_load_model(model_path),
+        rules=_load_rules(rules_path),
+    )
+
+    table = Table(title="Batch")
+    table.add_column("Tenant")
+    table.add_column("Status")
+    table.add_column("Transactions", justify="right")
+    table.add_column("Months", justify="right")
+    table.add_column("Alerts", justify="right")
+    table.add_column("Output / error")
+    for r in results:
+        if r.ok:
+            table.add_row(r.name, "[green]ok[/green]", str(r.transactions), str(r.months), str(r.alerts), r.out_dir)
+        else:
+            table.add_row(r.name, "[red]failed[/red]", "-", "-", "-", r.error)
+    console.print(table)
+
+    if not all(r.ok for r in results):
+        raise typer.Exit(1)
 
 
 def main() -> None:
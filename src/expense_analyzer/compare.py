@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from expense_analyzer.analyze import Summary
+
+
+# mode -> number of months between a month and its baseline
+COMPARE_MODES: dict[str, int] = {"mom": 1, "yoy": 12}
+
+
+@dataclass(frozen=True)
+class CategoryDelta:
+    category: str
+    current: float
+    previous: float
+    delta: float
+    pct_change: float | None  # None when the baseline is zero
+    new: bool = False  # no spend in the baseline (compared against 0.0)
+
+
+@dataclass(frozen=True)
+class MonthComparison:
+    month: str
+    baseline: str
+    income: CategoryDelta
+    expenses: CategoryDelta
+    categories: list[CategoryDelta]
+
+
+def shift_month(month: str, months: int) -> str:
+    """
+    Move a YYYY-MM key by a number of months (negative = back in time).
+    """
+    idx = int(month[:4]) * 12 + int(month[5:7]) - 1 + months
+    return f"{idx // 12:04d}-{idx % 12 + 1:02d}"
+
+
+def _delta(category: str, current: float, previous: float | None) -> CategoryDelta:
+    # work in cents so deltas of 2-decimal totals don't pick up float noise
+    cur, prev = round(current * 100), round((previous or 0.0) * 100)
+    return CategoryDelta(
+        category=category,
+        current=cur / 100,
+        previous=prev / 100,
+        delta=(cur - prev) / 100,
+        pct_change=round((cur - prev) / prev * 100, 1) if prev else None,
+        new=previous is None,
+    )
+
+
+def compare_months(summaries: dict[str, Summary], mode: str = "mom") -> list[MonthComparison]:
+    """
+    Per-category spend deltas between every month and its baseline month.
+
+    Rules:
+    - mode "mom" compares with the previous month, "yoy" with the same month a year earlier
+    - Works from precomputed monthly summaries: each comparison is two dict
+      lookups, so the whole history is compared in one pass
+    - Missing baseline values (a month or category with no data) count as 0.0
+      and the row is marked `new`
+    - Categories are sorted by absolute change (largest first)
+    """
+    if mode not in COMPARE_MODES:
+        raise ValueError(f"Mode must be one of: {', '.join(COMPARE_MODES)}")
+
+    results: list[MonthComparison] = []
+    for month in sorted(summaries):
+        baseline = shift_month(month, -COMPARE_MODES[mode])
+        prev = summaries.get(baseline)
+        prev_categories = prev.by_category if prev is not None else {}
+
+        cur = summaries[month]
+        categories = [
+            _delta(cat, cur.by_category.get(cat, 0.0), prev_categories.get(cat))
+            for cat in set(cur.by_category) | set(prev_categories)
+        ]
+        categories.sort(key=lambda d: (-abs(d.delta), d.category))
+
+        results.append(
+            MonthComparison(
+                month=month,
+                baseline=baseline,
+                income=_delta("Income", cur.income_total, prev.income_total if prev is not None else None),
+                expenses=_delta("Expenses", cur.expense_total, prev.expense_total if prev is not None else None),
+                categories=categories,
+            )
+        )
+
+    return results
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import csv
+import tempfile
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Sequence
+
+from expense_analyzer.parser import Transaction, iter_transactions
+from expense_analyzer.normalize import normalize_description
+from expense_analyzer.analyze import month_key
+
+if TYPE_CHECKING:
+    from expense_analyzer.formats import FormatProfile
+
+
+DedupeKey = tuple[int, int, str]  # (date ordinal, amount in cents, merchant)
+
+# rows held in memory before the month partitions are appended to disk
+SPILL_BUFFER_ROWS = 100_000
+
+
+@dataclass(frozen=True)
+class DroppedRow:
+    source: str
+    posted_date: str
+    amount: float
+    merchant: str
+    description: str
+    reason: str
+
+
+@dataclass(frozen=True)
+class DedupeResult:
+    transactions: list[Transaction]
+    dropped: list[DroppedRow]
+
+
+class _DedupeIndex:
+    """
+    Hash index of (date, cents, merchant) keys.
+
+    Legitimate repeats inside one statement are kept: for each key we keep
+    as many rows as the source that contains it most often, so only the
+    overlap between sources is dropped.
+    """
+
+    def __init__(self) -> None:
+        self._kept: dict[DedupeKey, int] = defaultdict(int)
+        self._seen: dict[tuple[int, DedupeKey], int] = defaultdict(int)
+        self._merchants: dict[str, str] = {}
+
+    def merchant(self, description: str) -> str:
+        merchant = self._merchants.get(description)
+        if merchant is None:
+            merchant = normalize_description(description)
+            self._merchants[description] = merchant
+        return merchant
+
+    def offer(self, source_idx: int, txn: Transaction) -> str | None:
+        """
+        Register a row and return None if it is kept, or the merchant if it is a duplicate.
+        """
+        merchant = self.merchant(txn.description)
+        key = (txn.posted_date.toordinal(), round(txn.amount * 100), merchant)
+
+        self._seen[(source_idx, key)] += 1
+        if self._seen[(source_idx, key)] <= self._kept[key]:
+            return merchant
+
+        self._kept[key] += 1
+        return None
+
+
+def _dropped(source: str, txn: Transaction, merchant: str) -> DroppedRow:
+    return DroppedRow(
+        source=source,
+        posted_date=str(txn.posted_date),
+        amount=txn.amount,
+        merchant=merchant,
+        description=txn.description,
+        reason="Duplicate of a row from an earlier statement",
+    )
+
+
+def dedupe_transactions(
+    sources: Sequence[Iterable[Transaction]],
+    source_names: Sequence[str] | None = None,
+) -> DedupeResult:
+    """
+    Merge several statements in memory, dropping rows that appear in more than one.
+
+    Rows are keyed on (posted date, amount in cents, normalized merchant).
+    Same-day repeats within one statement are preserved by occurrence counting.
+    """
+    names = list(source_names or [f"source {i + 1}" for i in range(len(sources))])
+    index = _DedupeIndex()
+
+    kept: list[Transaction] = []
+    dropped: list[DroppedRow] = []
+    for source_idx, txns in enumerate(sources):
+        for txn in txns:
+            merchant = index.offer(source_idx, txn)
+            if merchant is None:
+                kept.append(txn)
+            else:
+                dropped.append(_dropped(names[source_idx], txn, merchant))
+
+    return DedupeResult(transactions=kept, dropped=dropped)
+
+
+def dedupe_statement_files(
+    csv_paths: Sequence[Path],
+    on_drop: Callable[[DroppedRow], None] | None = None,
+    work_dir: Path | None = None,
+    profile: FormatProfile | None = None,
+) -> Iterator[Transaction]:
+    """
+    Stream the deduplicated union of several statement CSVs, month by month.
+
+    Rows are first partitioned into one temporary file per month, then each
+    month is deduplicated with its own hash index. Only one month is held in
+    memory at a time, so inputs can be much larger than RAM. Partition rows
+    are buffered and appended in batches, so no file stays open between
+    batches however many months there are.
+    Dropped rows are passed to `on_drop`.
+    """
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        tmp_dir = Path(tmp)
+        months: set[str] = set()
+        buffers: dict[str, list[tuple]] = defaultdict(list)
+        buffered = 0
+
+        def flush() -> None:
+            for month, rows in buffers.items():
+                with (tmp_dir / f"{month}.csv").open("a", encoding="utf-8", newline="") as f:
+                    csv.writer(f).writerows(rows)
+            months.update(buffers)
+            buffers.clear()
+
+        for source_idx, csv_path in enumerate(csv_paths):
+            for txn in iter_transactions(csv_path, profile):
+                buffers[month_key(txn.posted_date)].append(
+                    (source_idx, txn.posted_date.toordinal(), repr(txn.amount), txn.description)
+                )
+                buffered += 1
+                if buffered >= SPILL_BUFFER_ROWS:
+                    flush()
+                    buffered = 0
+        flush()
+
+        for month in sorted(months):
+            index = _DedupeIndex()
+            with (tmp_dir / f"{month}.csv").open("r", encoding="utf-8", newline="") as f:
+                for raw_idx, raw_ordinal, raw_amount, description in csv.reader(f):
+                    source_idx = int(raw_idx)
+                    txn = Transaction(
+                        posted_date=date.fromordinal(int(raw_ordinal)),
+                        description=description,
+                        amount=float(raw_amount),
+                    )
+                    merchant = index.offer(source_idx, txn)
+                    if merchant is None:
+                        yield txn
+                    elif on_drop is not None:
+                        on_drop(_dropped(str(csv_paths[source_idx]), txn, merchant))
+
+
+def write_dropped_report(out_path: Path, dropped: Iterable[DroppedRow]) -> int:
+    """
+    Write dropped duplicate rows to CSV and return how many were written.
+    """
+    count = 0
+    with out_path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(("source", "date", "amount", "merchant", "description", "reason"))
+        for row in dropped:
+            writer.writerow((row.source, row.posted_date, f"{row.amount:.2f}", row.merchant, row.description, row.reason))
+            count += 1
+    return count
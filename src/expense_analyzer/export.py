@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import csv
+import json
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from datetime import date
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Iterable, Iterator, Mapping, Sequence
+
+from expense_analyzer.parser import Transaction
+from expense_analyzer.categorize import DEFAULT_RULES, CategoryRule, enrich_many, ruleset_version
+
+if TYPE_CHECKING:
+    from expense_analyzer.classifier import CategoryModel
+
+
+EXPORT_FIELDS = ("date", "amount", "merchant", "category", "description", "ruleset")
+EXPORT_FORMATS = ("csv", "jsonl", "columnar")
+
+BATCH_SIZE = 10_000
+_BUFFER_SIZE = 1 << 20
+
+# Columnar layout (little-endian):
+#   magic, row count (u32), then per column:
+#   date     -> int32 ordinals
+#   amount   -> int64 cents
+#   strings  -> u32 table size, (u32 length, UTF-8 bytes) per table entry, u32 indices
+_COLUMNAR_MAGIC = b"EXACOL2\0"
+_U32 = struct.Struct("<I")
+
+
+@dataclass(frozen=True)
+class EnrichedColumns:
+    dates: list[date]
+    amounts: list[float]
+    merchants: list[str]
+    categories: list[str]
+    descriptions: list[str]
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+
+def _batches(
+    transactions: Iterable[Transaction],
+    batch_size: int,
+    aliases: Mapping[str, str] | None = None,
+    model: CategoryModel | None = None,
+    rules: Sequence[CategoryRule] = DEFAULT_RULES,
+) -> Iterator[list[tuple[Transaction, str, str]]]:
+    """
+    Enrich and yield transactions `batch_size` at a time, so a stream is never held in memory.
+    `rules`, `aliases` and `model` are applied as in `enrich_many`.
+    """
+    it = iter(transactions)
+    while batch := list(islice(it, batch_size)):
+        merchants, categories = enrich_many(batch, rules, aliases, model)
+        yield list(zip(batch, merchants, categories))
+
+
+def write_enriched_csv(
+    out_path: Path,
+    transactions: Iterable[Transaction],
+    batch_size: int = BATCH_SIZE,
+    aliases: Mapping[str, str] | None = None,
+    model: CategoryModel | None = None,
+    rules: Sequence[CategoryRule] = DEFAULT_RULES,
+) -> int:
+    """
+    Write enriched transactions as CSV (see EXPORT_FIELDS).
+    Rows are streamed in batches through a large buffer. Returns the row count.
+    The ruleset column lets `load_transactions` reuse merchant and category.
+    """
+    count = 0
+    version = ruleset_version(rules)
+    with out_path.open("w", encoding="utf-8", newline="", buffering=_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_FIELDS)
+        for batch in _batches(transactions, batch_size, aliases, model, rules):
+            writer.writerows(
+                (str(txn.posted_date), f"{txn.amount:.2f}", merchant, category, txn.description, version)
+                for txn, merchant, category in batch
+            )
+            count += len(batch)
+    return count
+
+
+def write_enriched_jsonl(
+    out_path: Path,
+    transactions: Iterable[Transaction],
+    batch_size: int = BATCH_SIZE,
+    aliases: Mapping[str, str] | None = None,
+    model: CategoryModel | None = None,
+    rules: Sequence[CategoryRule] = DEFAULT_RULES,
+) -> int:
+    """
+    Write enriched transactions as JSON Lines, one object per transaction.
+    Rows are streamed in batches. Returns the row count.
+    """
+    count = 0
+    version = ruleset_version(rules)
+    dumps = json.dumps
+    with out_path.open("w", encoding="utf-8", buffering=_BUFFER_SIZE) as f:
+        for batch in _batches(transactions, batch_size, aliases, model, rules):
+            f.write(
+                "".join(
+                    dumps(
+                        {
+                            "date": str(txn.posted_date),
+                            "amount": round(txn.amount, 2),
+                            "merchant": merchant,
+                            "category": category,
+                            "description": txn.description,
+                            "ruleset": version,
+                        }
+                    )
+                    + "\n"
+                    for txn, merchant, category in batch
+                )
+            )
+            count += len(batch)
+    return count
+
+
+def _to_le(arr: array) -> bytes:
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _from_le(typecode: str, raw: bytes) -> array:
+    arr = array(typecode)
+    arr.frombytes(raw)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+class _StringColumn:
+    """
+    A dictionary-encoded string column built row by row.
+    """
+
+    def __init__(self) -> None:
+        self.table: dict[str, int] = {}
+        self.indices = array("I")
+
+    def append(self, value: str) -> None:
+        index = self.table.get(value)
+        if index is None:
+            index = self.table[value] = len(self.table)
+        self.indices.append(index)
+
+    def write(self, f: BinaryIO) -> None:
+        # length-prefixed entries: any string, including ones containing NUL, round-trips
+        f.write(_U32.pack(len(self.table)))
+        for value in self.table:
+            raw = value.encode("utf-8")
+            f.write(_U32.pack(len(raw)))
+            f.write(raw)
+        f.write(_to_le(self.indices))
+
+
+def _read_exact(f: BinaryIO, size: int) -> bytes:
+    raw = f.read(size)
+    if len(raw) != size:
+        raise ValueError("Columnar export is truncated")
+    return raw
+
+
+def _read_string_column(f: BinaryIO, rows: int) -> list[str]:
+    (table_size,) = _U32.unpack(_read_exact(f, 4))
+    table = []
+    for _ in range(table_size):
+        (size,) = _U32.unpack(_read_exact(f, 4))
+        table.append(_read_exact(f, size).decode("utf-8"))
+    indices = _from_le("I", _read_exact(f, rows * 4))
+    try:
+        return [table[i] for i in indices]
+    except IndexError:
+        raise ValueError("Columnar export has a corrupt string table") from None
+
+
+def write_enriched_columnar(
+    out_path: Path,
+    transactions: Iterable[Transaction],
+    batch_size: int = BATCH_SIZE,
+    aliases: Mapping[str, str] | None = None,
+    model: CategoryModel | None = None,
+    rules: Sequence[CategoryRule] = DEFAULT_RULES,
+) -> int:
+    """
+    Write enriched transactions in a compact binary columnar format.
+
+    Dates are stored as day ordinals, amounts as integer cents and string
+    columns are dictionary-encoded, so reloading skips CSV parsing and
+    normalization entirely. Rows are consumed in batches and only the
+    packed columns are kept until the file is written. Returns the row count.
+    """
+    ordinals = array("i")
+    cents = array("q")
+    merchants, categories, descriptions = _StringColumn(), _StringColumn(), _StringColumn()
+    for batch in _batches(transactions, batch_size, aliases, model, rules):
+        for txn, merchant, category in batch:
+            ordinals.append(txn.posted_date.toordinal())
+            cents.append(round(txn.amount * 100))
+            merchants.append(merchant)
+            categories.append(category)
+            descriptions.append(txn.description)
+
+    with out_path.open("wb", buffering=_BUFFER_SIZE) as f:
+        f.write(_COLUMNAR_MAGIC)
+        f.write(_U32.pack(len(ordinals)))
+        f.write(_to_le(ordinals))
+        f.write(_to_le(cents))
+        merchants.write(f)
+        categories.write(f)
+        descriptions.write(f)
+
+    return len(ordinals)
+
+
+def load_enriched_columnar(path: Path) -> EnrichedColumns:
+    """
+    Load a file written by `write_enriched_columnar`.
+    Raises ValueError if the file is not a valid columnar export.
+    """
+    with path.open("rb") as f:
+        if f.read(len(_COLUMNAR_MAGIC)) != _COLUMNAR_MAGIC:
+            raise ValueError(f"Not a columnar export: {path}")
+
+        (rows,) = _U32.unpack(_read_exact(f, 4))
+        ordinals = _from_le("i", _read_exact(f, rows * 4))
+        cents = _from_le("q", _read_exact(f, rows * 8))
+        merchants = _read_string_column(f, rows)
+        categories = _read_string_column(f, rows)
+        descriptions = _read_string_column(f, rows)
+
+    return EnrichedColumns(
+        dates=list(map(date.fromordinal, ordinals)),
+        amounts=[c / 100 for c in cents],
+        merchants=merchants,
+        categories=categories,
+        descriptions=descriptions,
+    )
+
+
+def export_transactions(
+    out_path: Path,
+    transactions: Iterable[Transaction],
+    fmt: str = "csv",
+    aliases: Mapping[str, str] | None = None,
+    model: CategoryModel | None = None,
+    rules: Sequence[CategoryRule] = DEFAULT_RULES,
+) -> int:
+    """
+    Export enriched transactions in one of EXPORT_FORMATS and return the row count.
+    Raises ValueError for an unknown format.
+    """
+    if fmt == "csv":
+        return write_enriched_csv(out_path, transactions, aliases=aliases, model=model, rules=rules)
+    if fmt == "jsonl":
+        return write_enriched_jsonl(out_path, transactions, aliases=aliases, model=model, rules=rules)
+    if fmt == "columnar":
+        return write_enriched_columnar(out_path, transactions, aliases=aliases, model=model, rules=rules)
+    raise ValueError(f"Export format must be one of: {', '.join(EXPORT_FORMATS)}")
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import calendar
+from dataclasses import dataclass
+from datetime import date
+from operator import mul
+
+from expense_analyzer.analyze import Summary
+from expense_analyzer.compare import shift_month
+
+
+SEASON = 12  # months
+MIN_TREND_MONTHS = 3  # fewer months of history -> plain average
+
+
+@dataclass(frozen=True)
+class SeriesForecast:
+    name: str
+    method: str  # mean | trend | seasonal
+    values: list[float]  # one value per forecast month
+
+
+@dataclass(frozen=True)
+class Forecast:
+    months: list[str]  # forecast months, oldest first
+    income: SeriesForecast
+    expenses: SeriesForecast
+    categories: list[SeriesForecast]
+
+
+@dataclass(frozen=True)
+class MonthEndProjection:
+    month: str
+    income: float
+    expenses: float
+    net: float
+
+
+def forecast_series(
+    names: list[str],
+    rows: list[list[float]],
+    horizon: int,
+    first_month_index: int = 0,
+) -> list[SeriesForecast]:
+    """
+    Fit every series at once and forecast `horizon` steps ahead.
+
+    All rows share the same time axis, so the least-squares terms that depend
+    only on time (mean, sum of squares, calendar-month positions) are computed
+    once for the whole batch; per series the fit is one dot product for the
+    trend plus one pass over the residuals for the seasonal indices.
+
+    Rules:
+    - Fewer than MIN_TREND_MONTHS points: the mean is repeated
+    - Otherwise a linear trend; with at least two full seasons of history,
+      plus additive month-of-year indices from the detrended residuals
+    - Forecasts never go below zero
+    `first_month_index` is the calendar month (0-11) of the first column.
+    """
+    n = len(rows[0]) if rows else 0
+    if n == 0:
+        return [SeriesForecast(name, "mean", [0.0] * horizon) for name in names]
+
+    t_mean = (n - 1) / 2
+    centered = [t - t_mean for t in range(n)]
+    sxx = sum(c * c for c in centered)
+    future = [n + h - t_mean for h in range(horizon)]
+
+    seasonal = n >= 2 * SEASON
+    slot = [(first_month_index + t) % SEASON for t in range(n)]
+    future_slot = [(first_month_index + n + h) % SEASON for h in range(horizon)]
+    slot_counts = [slot.count(m) for m in range(SEASON)]
+
+    results: list[SeriesForecast] = []
+    for name, row in zip(names, rows):
+        level = sum(row) / n
+        if n < MIN_TREND_MONTHS:
+            results.append(SeriesForecast(name, "mean", [round(max(level, 0.0), 2)] * horizon))
+            continue
+
+        slope = sum(map(mul, centered, row)) / sxx
+        values = [level + slope * f for f in future]
+        method = "trend"
+
+        if seasonal:
+            sums = [0.0] * SEASON
+            for m, c, y in zip(slot, centered, row):
+                sums[m] += y - (level + slope * c)
+            index = [s / k for s, k in zip(sums, slot_counts)]
+            values = [v + index[m] for v, m in zip(values, future_slot)]
+            method = "seasonal"
+
+        results.append(SeriesForecast(name, method, [round(max(v, 0.0), 2) for v in values]))
+
+    return results
+
+
+def _month_range(first: str, last: str) -> list[str]:
+    months = [first]
+    while months[-1] < last:
+        months.append(shift_month(months[-1], 1))
+    return months
+
+
+def forecast_spending(
+    summaries: dict[str, Summary],
+    horizon: int = 3,
+    as_of: date | None = None,
+) -> Forecast:
+    """
+    Forecast income, total expenses and every category for the next `horizon` months.
+
+    Rules:
+    - Models are fitted on complete months only; the month containing `as_of`
+      (default: today) is always the first forecast month
+    - Months without transactions inside the history count as zero
+    - When the data stops before `as_of`, the models are stepped forward over
+      the missing months, so stale data still forecasts the months ahead
+    """
+    if horizon < 1:
+        raise ValueError("horizon must be >= 1")
+
+    as_of = as_of or date.today()
+    current = f"{as_of.year:04d}-{as_of.month:02d}"
+    history = sorted(m for m in summaries if m < current)
+
+    months = _month_range(history[0], history[-1]) if history else []
+    # months between the end of the data and `as_of`, forecast but not reported
+    skip = len(_month_range(shift_month(months[-1], 1), current)) - 1 if months else 0
+    forecast_months = [shift_month(current, h) for h in range(horizon)]
+
+    empty = Summary("", 0.0, 0.0, 0.0, {})
+    rows_by_month = [summaries.get(m, empty) for m in months]
+    categories = sorted({cat for s in rows_by_month for cat in s.by_category})
+
+    names = ["Income", "Expenses", *categories]
+    rows = [
+        [s.income_total for s in rows_by_month],
+        [s.expense_total for s in rows_by_month],
+        *([s.by_category.get(cat, 0.0) for s in rows_by_month] for cat in categories),
+    ]
+    first_month_index = int(months[0][5:7]) - 1 if months else 0
+
+    income, expenses, *by_category = [
+        SeriesForecast(f.name, f.method, f.values[skip:])
+        for f in forecast_series(names, rows, skip + horizon, first_month_index)
+    ]
+    return Forecast(months=forecast_months, income=income, expenses=expenses, categories=by_category)
+
+
+def project_month_end(
+    summaries: dict[str, Summary],
+    forecast: Forecast,
+    as_of: date | None = None,
+) -> MonthEndProjection:
+    """
+    Project income, expenses and net for the month containing `as_of`.
+
+    Rules:
+    - Expenses: spent so far plus the forecast spend for the days left
+    - Income: the larger of income so far and the forecast (salary usually
+      arrives in one payment, so it is not spread over the month)
+    """
+    as_of = as_of or date.today()
+    month = f"{as_of.year:04d}-{as_of.month:02d}"
+    so_far = summaries.get(month, Summary(month, 0.0, 0.0, 0.0, {}))
+
+    if month in forecast.months:
+        idx = forecast.months.index(month)
+        income_fc, expense_fc = forecast.income.values[idx], forecast.expenses.values[idx]
+    else:  # forecast built for another date
+        income_fc = expense_fc = 0.0
+
+    days_in_month = calendar.monthrange(as_of.year, as_of.month)[1]
+    remaining = (days_in_month - as_of.day) / days_in_month
+
+    income = max(so_far.income_total, income_fc)
+    expenses = so_far.expense_total + expense_fc * remaining
+    return MonthEndProjection(
+        month=month,
+        income=round(income, 2),
+        expenses=round(expenses, 2),
+        net=round(income - expenses, 2),
+    )
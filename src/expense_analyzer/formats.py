@@ -0,0 +1,373 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import json
+import math
+import re
+from dataclasses import dataclass, fields
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable
+
+from expense_analyzer.categorize import RULESET_VERSION
+from expense_analyzer.parser import RowError, Transaction
+
+
+@dataclass(frozen=True)
+class FormatProfile:
+    """
+    How a bank export is laid out.
+
+    Use either `amount_column` (signed amounts) or `debit_column` and
+    `credit_column` (unsigned amounts split into money out / money in).
+    """
+
+    name: str
+    delimiter: str = ","
+    date_column: str = "date"
+    description_column: str = "description"
+    amount_column: str | None = "amount"
+    debit_column: str | None = None
+    credit_column: str | None = None
+    date_format: str = "%Y-%m-%d"
+    decimal_sep: str = "."
+    thousands_sep: str = ""
+    encoding: str = "utf-8"
+
+
+BUILTIN_PROFILES: dict[str, FormatProfile] = {
+    "native": FormatProfile(name="native"),
+    "eu-semicolon": FormatProfile(
+        name="eu-semicolon",
+        delimiter=";",
+        date_format="%d/%m/%Y",
+        decimal_sep=",",
+        thousands_sep=".",
+    ),
+    "debit-credit": FormatProfile(
+        name="debit-credit",
+        amount_column=None,
+        debit_column="debit",
+        credit_column="credit",
+        thousands_sep=",",
+    ),
+}
+
+RowConverter = Callable[[list[str], int], Transaction]
+
+
+def _compile_date_parser(date_format: str) -> Callable[[str], date]:
+    """
+    Return the fastest parser for `date_format`.
+    ISO dates use date.fromisoformat; day/month/year layouts with a single
+    separator are split directly; anything else falls back to strptime.
+    """
+    if date_format == "%Y-%m-%d":
+        return date.fromisoformat
+
+    m = re.fullmatch(r"(%[Ymd])([^%\w])(%[Ymd])\2(%[Ymd])", date_format)
+    if m and {m[1], m[3], m[4]} == {"%Y", "%m", "%d"}:
+        sep = m[2]
+        order = (m[1], m[3], m[4])
+        iy, im, iday = order.index("%Y"), order.index("%m"), order.index("%d")
+
+        def parse_split(raw: str) -> date:
+            parts = raw.split(sep)
+            if len(parts) != 3 or len(parts[iy]) != 4:
+                raise ValueError(raw)
+            return date(int(parts[iy]), int(parts[im]), int(parts[iday]))
+
+        return parse_split
+
+    def parse_strptime(raw: str) -> date:
+        return datetime.strptime(raw, date_format).date()
+
+    return parse_strptime
+
+
+def _compile_amount_parser(decimal_sep: str, thousands_sep: str) -> Callable[[str], float]:
+    if decimal_sep == "." and not thousands_sep:
+        return float
+
+    if decimal_sep == ".":
+        return lambda raw: float(raw.replace(thousands_sep, ""))
+
+    if not thousands_sep:
+        return lambda raw: float(raw.replace(decimal_sep, "."))
+
+    return lambda raw: float(raw.replace(thousands_sep, "").replace(decimal_sep, "."))
+
+
+def compile_converter(profile: FormatProfile, header: list[str]) -> RowConverter:
+    """
+    Compile a row converter for `profile` and the file's header row.
+
+    Column positions and date/amount parsers are resolved once, so the
+    per-row work is just indexing and the two specialized parse calls.
+    Raises ValueError if a mapped column is missing from the header.
+
+    Like the native reader, files that also have the enriched export columns
+    (merchant, category, ruleset) keep those values while the ruleset is current.
+    """
+    convert = _compile_row_converter(profile, header)
+
+    names = [h.strip() for h in header]
+    if not {"merchant", "category", "ruleset"}.issubset(names):
+        return convert
+
+    i_merchant, i_category, i_ruleset = names.index("merchant"), names.index("category"), names.index("ruleset")
+    width = max(i_merchant, i_category, i_ruleset)
+
+    def convert_enriched(values: list[str], line_num: int) -> Transaction:
+        txn = convert(values, line_num)
+        if len(values) <= width or values[i_ruleset].strip() != RULESET_VERSION:
+            return txn
+        merchant, category = values[i_merchant].strip(), values[i_category].strip()
+        if not merchant or not category:
+            return txn
+        return Transaction(txn.posted_date, txn.description, txn.amount, merchant, category)
+
+    return convert_enriched
+
+
+def _compile_row_converter(profile: FormatProfile, header: list[str]) -> RowConverter:
+    names = [h.strip() for h in header]
+
+    def index_of(column: str | None) -> int:
+        if column is None or column not in names:
+            raise ValueError(f"CSV is missing column {column!r} required by profile {profile.name!r}")
+        return names.index(column)
+
+    i_date = index_of(profile.date_column)
+    i_desc = index_of(profile.description_column)
+    parse_date = _compile_date_parser(profile.date_format)
+    parse_amount = _compile_amount_parser(profile.decimal_sep, profile.thousands_sep)
+
+    def parse_finite(raw: str, line_num: int) -> float:
+        # same rule as parser.parse_transaction_row: nan/inf are not amounts
+        try:
+            amount = parse_amount(raw)
+        except ValueError:
+            raise RowError("Invalid amount", line_num, repr(raw)) from None
+        if not math.isfinite(amount):
+            raise RowError("Invalid amount", line_num, repr(raw))
+        return amount
+
+    def cell(values: list[str], idx: int) -> str:
+        return values[idx].strip() if idx < len(values) else ""
+
+    def base(values: list[str], line_num: int) -> tuple[date, str]:
+        raw_date = cell(values, i_date)
+        raw_desc = cell(values, i_desc)
+        if not raw_date or not raw_desc:
+            raise RowError("Missing value", line_num)
+        try:
+            return parse_date(raw_date), raw_desc
+        except ValueError:
+            raise RowError("Invalid date", line_num, repr(raw_date)) from None
+
+    if profile.amount_column is not None:
+        i_amount = index_of(profile.amount_column)
+
+        def convert_signed(values: list[str], line_num: int) -> Transaction:
+            posted, desc = base(values, line_num)
+            raw_amount = cell(values, i_amount)
+            if not raw_amount:
+                raise RowError("Missing value", line_num)
+            amount = parse_finite(raw_amount, line_num)
+            return Transaction(posted_date=posted, description=desc, amount=amount)
+
+        return convert_signed
+
+    i_debit = index_of(profile.debit_column)
+    i_credit = index_of(profile.credit_column)
+
+    def convert_split(values: list[str], line_num: int) -> Transaction:
+        posted, desc = base(values, line_num)
+        raw_debit = cell(values, i_debit)
+        raw_credit = cell(values, i_credit)
+        if not raw_debit and not raw_credit:
+            raise RowError("Missing value", line_num)
+        debit = abs(parse_finite(raw_debit, line_num)) if raw_debit else 0.0
+        credit = abs(parse_finite(raw_credit, line_num)) if raw_credit else 0.0
+        return Transaction(posted_date=posted, description=desc, amount=round(credit - debit, 2))
+
+    return convert_split
+
+
+_COLUMN_ALIASES: dict[str, tuple[str, ...]] = {
+    "date": ("date", "posted date", "posting date", "transaction date", "booking date", "value date"),
+    "description": ("description", "memo", "details", "payee", "narrative", "merchant"),
+    "amount": ("amount", "value", "transaction amount"),
+    "debit": ("debit", "withdrawal", "withdrawals", "money out", "paid out"),
+    "credit": ("credit", "deposit", "deposits", "money in", "paid in"),
+}
+_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%d.%m.%Y", "%d-%m-%Y", "%Y/%m/%d")
+_SNIFF_BYTES = 64 * 1024
+_SNIFF_ROWS = 200
+
+
+def _guess_number_format(samples: list[str], delimiter: str) -> tuple[str, str]:
+    """
+    Guess (decimal_sep, thousands_sep) from sample amount strings.
+    """
+    mixed = next((raw for raw in samples if "." in raw and "," in raw), None)
+    if mixed is not None:
+        return (",", ".") if mixed.rfind(",") > mixed.rfind(".") else (".", ",")
+
+    with_comma = [raw for raw in samples if "," in raw]
+    if not with_comma:
+        return ".", ""
+    if delimiter != "," and all(re.search(r",\d{1,2}$", raw) for raw in with_comma):
+        return ",", ""
+    return ".", ","
+
+
+def sniff_profile(csv_path: Path, encoding: str = "utf-8") -> FormatProfile:
+    """
+    Inspect the start of a CSV and guess its FormatProfile.
+
+    Detects the delimiter, maps header names to date/description/amount
+    (or debit/credit) columns, and picks the first date format and number
+    format that fit the sampled rows. Raises ValueError if no mapping fits.
+    """
+    with csv_path.open("r", encoding=encoding, newline="") as f:
+        sample = f.read(_SNIFF_BYTES)
+
+    try:
+        delimiter = csv.Sniffer().sniff("\n".join(sample.splitlines()[:20]), delimiters=",;\t|").delimiter
+    except csv.Error:
+        delimiter = ","
+
+    lines = sample.splitlines()
+    if len(sample) == _SNIFF_BYTES and len(lines) > 1:
+        lines.pop()  # the sample probably ends mid-line
+
+    rows = list(csv.reader(lines[: _SNIFF_ROWS + 1], delimiter=delimiter))
+    if not rows:
+        raise ValueError(f"Cannot detect the format of an empty file: {csv_path}")
+
+    header = [h.strip() for h in rows[0]]
+    lowered = {h.lower(): h for h in header}
+    mapped = {
+        role: next((lowered[a] for a in aliases if a in lowered), None)
+        for role, aliases in _COLUMN_ALIASES.items()
+    }
+    if mapped["date"] is None or mapped["description"] is None:
+        raise ValueError(f"Cannot find date/description columns in header: {header}")
+    if mapped["amount"] is None and (mapped["debit"] is None or mapped["credit"] is None):
+        raise ValueError(f"Cannot find amount or debit/credit columns in header: {header}")
+
+    def column_values(column: str | None) -> list[str]:
+        idx = header.index(column) if column in header else -1
+        return [r[idx].strip() for r in rows[1:] if 0 <= idx < len(r) and r[idx].strip()]
+
+    dates = column_values(mapped["date"])
+    date_format = "%Y-%m-%d"
+    for candidate in _DATE_FORMATS:
+        parse = _compile_date_parser(candidate)
+        try:
+            for raw in dates:
+                parse(raw)
+        except ValueError:
+            continue
+        date_format = candidate
+        break
+
+    amounts = column_values(mapped["amount"]) + column_values(mapped["debit"]) + column_values(mapped["credit"])
+    decimal_sep, thousands_sep = _guess_number_format(amounts, delimiter)
+
+    return FormatProfile(
+        name="sniffed",
+        delimiter=delimiter,
+        date_column=mapped["date"],
+        description_column=mapped["description"],
+        amount_column=mapped["amount"],
+        debit_column=None if mapped["amount"] else mapped["debit"],
+        credit_column=None if mapped["amount"] else mapped["credit"],
+        date_format=date_format,
+        decimal_sep=decimal_sep,
+        thousands_sep=thousands_sep,
+        encoding=encoding,
+    )
+
+
+def load_profile(path: Path) -> FormatProfile:
+    """
+    Load a FormatProfile declared as a JSON object of profile fields.
+    """
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError(f"Format profile must be a JSON object: {path}")
+
+    known = {f.name for f in fields(FormatProfile)}
+    unknown = set(data) - known
+    if unknown:
+        raise ValueError(f"Unknown format profile field(s): {sorted(unknown)}")
+
+    data.setdefault("name", path.stem)
+    for name, value in data.items():
+        _validate_profile_field(name, value)
+
+    if data.get("amount_column", "amount") is None and not (data.get("debit_column") and data.get("credit_column")):
+        raise ValueError("Format profile field 'amount_column' is null but debit_column/credit_column are not set")
+    if data.get("thousands_sep", "") == data.get("decimal_sep", "."):
+        raise ValueError("Format profile fields 'decimal_sep' and 'thousands_sep' must differ")
+    return FormatProfile(**data)
+
+
+_OPTIONAL_COLUMNS = ("amount_column", "debit_column", "credit_column")
+_SINGLE_CHAR_FIELDS = ("delimiter", "decimal_sep")
+
+
+def _validate_profile_field(name: str, value: object) -> None:
+    """
+    Raise ValueError naming `name` if `value` can't be used for that FormatProfile field.
+
+    Rules:
+    - every field is a string; only the amount/debit/credit columns may be null
+    - column names and the profile name are not empty
+    - delimiter and decimal_sep are one character, thousands_sep at most one
+    - date_format round-trips a date; encoding is a known codec
+    """
+    if value is None and name in _OPTIONAL_COLUMNS:
+        return
+    if not isinstance(value, str):
+        raise ValueError(f"Format profile field {name!r} must be a string, got {type(value).__name__}")
+
+    if (name == "name" or name.endswith("_column")) and not value.strip():
+        raise ValueError(f"Format profile field {name!r} must not be empty")
+    if name in _SINGLE_CHAR_FIELDS and len(value) != 1:
+        raise ValueError(f"Format profile field {name!r} must be a single character, got {value!r}")
+    if name == "thousands_sep" and len(value) > 1:
+        raise ValueError(f"Format profile field 'thousands_sep' must be empty or a single character, got {value!r}")
+    if name == "date_format":
+        sample = date(2026, 1, 31)
+        try:
+            ok = datetime.strptime(sample.strftime(value), value).date() == sample
+        except ValueError:
+            ok = False
+        if not ok:
+            raise ValueError(f"Format profile field 'date_format' can't read back full dates: {value!r}")
+    if name == "encoding":
+        try:
+            codecs.lookup(value)
+        except LookupError:
+            raise ValueError(f"Format profile field 'encoding' is not a known encoding: {value!r}") from None
+
+
+def resolve_profile(spec: str, csv_path: Path) -> FormatProfile:
+    """
+    Resolve a --profile value: a builtin name, "auto" (sniff the CSV) or a JSON profile path.
+    """
+    if spec in BUILTIN_PROFILES:
+        return BUILTIN_PROFILES[spec]
+    if spec == "auto":
+        return sniff_profile(csv_path)
+
+    path = Path(spec)
+    if path.suffix == ".json" and path.exists():
+        return load_profile(path)
+
+    raise ValueError(f"Unknown format profile {spec!r}. Use auto, {', '.join(BUILTIN_PROFILES)} or a .json file.")
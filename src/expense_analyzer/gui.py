@@ -5,15 +5,20 @@ from tkinter import ttk, filedialog, messagebox
 from pathlib import Path
 
 from expense_analyzer.parser import load_transactions
-from expense_analyzer.normalize import normalize_description
-from expense_analyzer.categorize import categorize_transaction
-from expense_analyzer.analyze import build_monthly_summary, detect_unusual_spending
+from expense_analyzer.categorize import DEFAULT_RULES, enrich_many
+from expense_analyzer.analyze import Summary, build_monthly_summary, detect_unusual_spending
+from expense_analyzer.budget import MonthBudget, evaluate_budgets
+from expense_analyzer.export import write_enriched_csv
 from expense_analyzer.storage import load_manual_entries, save_manual_entries
 
 APP_ROOT = Path(__file__).resolve().parents[2]  # project root
 MANUAL_PATH = APP_ROOT / "data" / "manual_entries.json"
 SETTINGS_PATH = APP_ROOT / "data" / "settings.json"
 
+# change events arriving within this window are coalesced into one refresh
+REFRESH_DELAY_MS = 150
+VIEWS = ("transactions", "summary", "alerts", "budgets")
+
 
 class ExpenseAnalyzerApp:
     def __init__(self, root: tk.Tk) -> None:
@@ -26,11 +31,25 @@ class ExpenseAnalyzerApp:
         self.manual_transactions = []
         self._row_meta: dict[str, tuple[str, int]] = {}
 
+        # aggregates shared by the summary, month picker and budget views
+        self._summaries: dict[str, Summary] = {}
+        self._budgets: dict[str, MonthBudget] = {}
+
+        # refresh scheduling: pending after() job, whether the data changed, and views to redraw
+        self._refresh_job: str | None = None
+        self._data_dirty = False
+        self._stale_views: set[str] = set()
+
         self.status_var = tk.StringVar(value="Ready. Load a CSV to begin.")
 
-        from expense_analyzer.settings_store import load_settings
+        from expense_analyzer.settings_store import load_category_rules, load_settings
 
         self.settings = load_settings(SETTINGS_PATH)
+        try:
+            self.rules = load_category_rules(SETTINGS_PATH)
+        except ValueError as e:
+            self.rules = DEFAULT_RULES
+            self.status_var.set(f"Using built-in category rules: {e}")
 
         self._build_ui()
         self._update_counts()
@@ -38,7 +57,7 @@ class ExpenseAnalyzerApp:
         self.manual_transactions = load_manual_entries(MANUAL_PATH)
         if self.manual_transactions:
             self.set_status(f"Loaded {len(self.manual_transactions)} manual entries.")
-            self._refresh_all_views()
+            self._schedule_refresh()
 
     def _build_ui(self) -> None:
         # Top bar
@@ -67,6 +86,7 @@ class ExpenseAnalyzerApp:
         self.tabs.add(self.tab_summary, text="Summary")
         self.tabs.add(self.tab_alerts, text="Alerts")
         self.tabs.add(self.tab_budgets, text="Budgets & Goals")
+        self.tabs.bind("<<NotebookTabChanged>>", lambda _e: self._refresh_visible_view())
 
         # Transactions table
         self.txn_tree = ttk.Treeview(
@@ -143,7 +163,7 @@ class ExpenseAnalyzerApp:
         self.month_var = tk.StringVar(value="")
         self.month_menu = ttk.Combobox(top, textvariable=self.month_var, state="readonly", width=12)
         self.month_menu.grid(row=1, column=1, sticky="w", padx=8, pady=(10, 4))
-        self.month_menu.bind("<<ComboboxSelected>>", lambda _e: self._refresh_budget_progress())
+        self.month_menu.bind("<<ComboboxSelected>>", lambda _e: self._schedule_refresh({"budgets"}, data_changed=False))
     
         # Budgets table
         table_frame = ttk.Frame(self.tab_budgets)
@@ -207,7 +227,7 @@ class ExpenseAnalyzerApp:
         self.set_status(
             f"Loaded {len(self.csv_transactions)} CSV transactions (+ {len(self.manual_transactions)} manual)."
         )         
-        self._refresh_all_views()
+        self._schedule_refresh()
 
     def add_expense_dialog(self) -> None:
         """
@@ -278,7 +298,7 @@ class ExpenseAnalyzerApp:
             save_manual_entries(MANUAL_PATH, self.manual_transactions)
             
             self.set_status("Added expense (saved).")
-            self._refresh_all_views()
+            self._schedule_refresh()
     
             win.destroy()
     
@@ -296,8 +316,6 @@ class ExpenseAnalyzerApp:
         Export the combined (CSV + manual) dataset into a new CSV file with
         normalized merchant and inferred category columns.
         """
-        import csv
-    
         transactions = self.csv_transactions + self.manual_transactions
         if not transactions:
             messagebox.showinfo("Export CSV", "There are no transactions to export yet.")
@@ -319,25 +337,7 @@ class ExpenseAnalyzerApp:
         out_path = Path(out_path_str)
     
         try:
-            with out_path.open("w", encoding="utf-8", newline="") as f:
-                writer = csv.DictWriter(
-                    f,
-                    fieldnames=["date", "amount", "merchant", "category", "description"],
-                )
-                writer.writeheader()
-    
-                for txn in transactions:
-                    merchant = normalize_description(txn.description)
-                    category = categorize_transaction(txn)
-                    writer.writerow(
-                        {
-                            "date": str(txn.posted_date),
-                            "amount": f"{txn.amount:.2f}",
-                            "merchant": merchant,
-                            "category": category,
-                            "description": txn.description,
-                        }
-                    )
+            write_enriched_csv(out_path, transactions, rules=self.rules)
     
             self.set_status(f"Exported CSV: {out_path.name}")
             messagebox.showinfo("Export CSV", f"Saved:\n{out_path}")
@@ -350,6 +350,9 @@ class ExpenseAnalyzerApp:
         Manual entries are removed permanently from storage.
         CSV entries are removed only from the loaded CSV session list.
         """
+        # row indices must match the current data before resolving the selection
+        self._flush_refresh()
+
         selection = self.txn_tree.selection()
         if not selection:
             messagebox.showinfo("Clear Entry", "Select a transaction in the Transactions tab first.")
@@ -384,7 +387,7 @@ class ExpenseAnalyzerApp:
                 self.csv_transactions.pop(idx)
     
             self.set_status("Removed CSV entry (session only).")
-            self._refresh_all_views()
+            self._schedule_refresh()
             return
     
         # manual
@@ -405,7 +408,7 @@ class ExpenseAnalyzerApp:
         save_manual_entries(MANUAL_PATH, self.manual_transactions)
     
         self.set_status("Deleted manual entry (saved).")
-        self._refresh_all_views()
+        self._schedule_refresh()
        
     def clear_manual_entries(self) -> None:
 
@@ -437,7 +440,7 @@ class ExpenseAnalyzerApp:
             return
     
         self.set_status("Manual entries cleared.")
-        self._refresh_all_views()
+        self._schedule_refresh()
     
     def _load_settings_into_ui(self) -> None:
         self.income_target_var.set(f"{self.settings.income_target:.2f}")
@@ -479,7 +482,8 @@ class ExpenseAnalyzerApp:
 
         save_settings(SETTINGS_PATH, self.settings)
         self.set_status("Saved budgets & goals.")
-        self._refresh_budget_progress()
+        self._budgets = evaluate_budgets(self._summaries, self.settings)
+        self._schedule_refresh({"budgets"}, data_changed=False)
     
     def _edit_budget_cell(self, event) -> None:
         item = self.budget_tree.identify_row(event.y)
@@ -508,7 +512,7 @@ class ExpenseAnalyzerApp:
     
             self.budget_tree.set(item, "budget", val)
             entry.destroy()
-            self._refresh_budget_progress()
+            self._schedule_refresh({"budgets"}, data_changed=False)
     
         entry.bind("<Return>", commit_edit)
         entry.bind("<FocusOut>", commit_edit)
@@ -516,56 +520,54 @@ class ExpenseAnalyzerApp:
     def _refresh_budget_progress(self) -> None:
         self.budget_progress_text.delete("1.0", "end")
     
-        transactions = self.csv_transactions + self.manual_transactions
-        if not transactions:
+        if not self._budgets:
             self.budget_progress_text.insert("end", "Load a CSV or add expenses to see progress.\n")
             return
     
-        # Pick the most recent month in data
-        summaries = build_monthly_summary(transactions)
-        if not summaries:
-            return
-    
+        # Use the selected month, or the most recent month in data
         chosen = ""
         if hasattr(self, "month_var"):
             chosen = self.month_var.get().strip()
         
-        if chosen and chosen in summaries:
+        if chosen and chosen in self._budgets:
             month_key = chosen
         else:
-            month_key = sorted(summaries.keys())[-1]
+            month_key = sorted(self._budgets.keys())[-1]
         
-        s = summaries[month_key]
-
-        # Read current settings (if not loaded yet, act like zeros)
-        income_target = 0.0
-        savings_goal = 0.0
-        budgets: dict[str, float] = {}
-    
-        if hasattr(self, "settings"):
-            income_target = float(self.settings.income_target)
-            savings_goal = float(self.settings.savings_goal)
-            budgets = dict(self.settings.category_budgets)
+        b = self._budgets[month_key]
     
         lines = []
         lines.append(f"Month: {month_key}\n")
-        lines.append(f"Income: {s.income_total:.2f} / Target: {income_target:.2f}\n")
-        lines.append(f"Expenses: {s.expense_total:.2f}\n")
-        lines.append(f"Net: {s.net_total:.2f} / Savings goal: {savings_goal:.2f}\n\n")
+        lines.append(f"Income: {b.income_total:.2f} / Target: {b.income_target:.2f}\n")
+        lines.append(f"Expenses: {b.expense_total:.2f}\n")
+        if b.days_elapsed < b.days_in_month:
+            lines.append(
+                f"Projected month-end expenses: {b.projected_expenses:.2f} "
+                f"(day {b.days_elapsed} of {b.days_in_month})\n"
+            )
+        lines.append(f"Net: {b.net_total:.2f} / Savings goal: {b.savings_goal:.2f}\n\n")
     
         lines.append("Budgets by category:\n")
-        for cat, spent in s.by_category.items():
-            budget = float(budgets.get(cat, 0.0))
-            remaining = budget - spent
-            lines.append(f"  - {cat}: spent {spent:.2f} / budget {budget:.2f} (remaining {remaining:.2f})\n")
+        for c in b.categories:
+            if not c.spent and not c.budget:
+                continue
+            line = f"  - {c.category}: spent {c.spent:.2f} / budget {c.budget:.2f} (remaining {c.remaining:.2f})"
+            if c.projected != c.spent:
+                line += f", projected {c.projected:.2f}"
+            lines.append(line + "\n")
     
         self.budget_progress_text.insert("end", "".join(lines))
 
-    def _refresh_month_options(self) -> None:
+    def _recompute_aggregates(self) -> None:
+        """
+        Rebuild monthly summaries once per data change and derive budgets from them.
+        """
         transactions = self.csv_transactions + self.manual_transactions
-        summaries = build_monthly_summary(transactions) if transactions else {}
-    
-        months = sorted(summaries.keys())
+        self._summaries = build_monthly_summary(transactions, rules=self.rules) if transactions else {}
+        self._budgets = evaluate_budgets(self._summaries, self.settings)
+
+    def _refresh_month_options(self) -> None:
+        months = sorted(self._summaries.keys())
         current = self.month_var.get().strip()
     
         self.month_menu["values"] = months
@@ -580,16 +582,69 @@ class ExpenseAnalyzerApp:
         else:
             self.month_var.set(months[-1])
 
-    def _refresh_all_views(self) -> None:
-        self._update_counts()
-        self._populate_transactions()
-        self._populate_summary()
-        self._populate_alerts()
+    def _schedule_refresh(self, views: set[str] | None = None, data_changed: bool = True) -> None:
+        """
+        Mark views as stale and refresh them shortly after.
+
+        Rules:
+        - Events within REFRESH_DELAY_MS share one pending refresh (one recompute)
+        - data_changed=True recomputes the shared aggregates before redrawing
+        - Only the visible tab is redrawn; hidden tabs redraw when opened
+        """
+        self._data_dirty = self._data_dirty or data_changed
+        self._stale_views.update(VIEWS if views is None else views)
+        if self._refresh_job is None:
+            self._refresh_job = self.root.after(REFRESH_DELAY_MS, self._run_refresh)
 
-        if hasattr(self, "month_menu"):
+    def _flush_refresh(self) -> None:
+        """
+        Run a pending refresh now instead of waiting for the timer.
+        """
+        if self._refresh_job is not None:
+            self.root.after_cancel(self._refresh_job)
+            self._run_refresh()
+
+    def _run_refresh(self) -> None:
+        self._refresh_job = None
+
+        if self._data_dirty:
+            self._data_dirty = False
+            self._recompute_aggregates()
+            self._update_counts()
             self._refresh_month_options()
 
-        if hasattr(self, "budget_progress_text"):
+        self._refresh_visible_view()
+
+    def _visible_view(self) -> str:
+        selected = self.tabs.select()
+        tabs = {
+            str(self.tab_transactions): "transactions",
+            str(self.tab_summary): "summary",
+            str(self.tab_alerts): "alerts",
+            str(self.tab_budgets): "budgets",
+        }
+        return tabs.get(str(selected), "")
+
+    def _refresh_visible_view(self) -> None:
+        """
+        Redraw the visible tab if it is stale. Also called when the user switches tabs.
+        """
+        if self._data_dirty:
+            # a data refresh is pending; it redraws the visible tab when it runs
+            return
+
+        view = self._visible_view()
+        if view not in self._stale_views:
+            return
+
+        self._stale_views.discard(view)
+        if view == "transactions":
+            self._populate_transactions()
+        elif view == "summary":
+            self._populate_summary()
+        elif view == "alerts":
+            self._populate_alerts()
+        elif view == "budgets":
             self._refresh_budget_progress()
 
     def _populate_transactions(self) -> None:
@@ -604,10 +659,8 @@ class ExpenseAnalyzerApp:
         for i, txn in enumerate(self.manual_transactions):
             rows.append(("manual", i, txn))
     
-        for source, idx, txn in rows:
-            merchant = normalize_description(txn.description)
-            category = categorize_transaction(txn)
-    
+        merchants, categories = enrich_many([txn for _source, _idx, txn in rows], self.rules)
+        for (source, idx, txn), merchant, category in zip(rows, merchants, categories):
             item_id = self.txn_tree.insert(
                 "",
                 "end",
@@ -619,13 +672,7 @@ class ExpenseAnalyzerApp:
     def _populate_summary(self) -> None:
         self.summary_text.delete("1.0", "end")
 
-        transactions = self.csv_transactions + self.manual_transactions
-        if not transactions:
-            return
-
-        summaries = build_monthly_summary(transactions)
-
-        for month, s in summaries.items():
+        for month, s in self._summaries.items():
             self.summary_text.insert("end", f"{month}\n")
             self.summary_text.insert("end", f"  Income:   {s.income_total:.2f}\n")
             self.summary_text.insert("end", f"  Expenses: {s.expense_total:.2f}\n")
@@ -643,7 +690,7 @@ class ExpenseAnalyzerApp:
         if not transactions:
             return
 
-        alerts_by_month = detect_unusual_spending(transactions)
+        alerts_by_month = detect_unusual_spending(transactions, rules=self.rules)
 
         # show all alerts across months for now (v0.1)
         for month, alerts in alerts_by_month.items():
@@ -18,6 +18,9 @@ _COMMON_NOISE = re.compile(
 _MULTI_SPACE = re.compile(r"\s+")
 _TRAILING_NUMBERS = re.compile(r"[\s#-]*\d{2,}$")  # e.g. "#1234", "- 000123"
 
+# everything that decides the output of normalize_description (part of categorize.ruleset_version)
+NORMALIZE_RULES = (_COMMON_NOISE.pattern, _TRAILING_NUMBERS.pattern)
+
 
 def normalize_description(description: str) -> str:
     """
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import csv
+import io
+import mmap
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from expense_analyzer.parser import Transaction, open_row_converter, load_transactions
+
+if TYPE_CHECKING:
+    from expense_analyzer.formats import FormatProfile
+
+
+# files smaller than this are parsed in-process; the pool would only add overhead
+MIN_PARALLEL_BYTES = 8 * 1024 * 1024
+CHUNKS_PER_WORKER = 4
+
+# (start offset, end offset, number of the first line in the chunk)
+Chunk = tuple[int, int, int]
+
+
+def split_chunks(mm: mmap.mmap, data_start: int, parts: int) -> list[Chunk]:
+    """
+    Split mm[data_start:] into about `parts` byte ranges that end on line boundaries.
+
+    Boundaries are quote-aware: a newline inside a quoted field is skipped,
+    using the parity of quote characters seen so far (an escaped "" does not
+    change parity). Each chunk also records its first physical line number,
+    so parse errors report the same line as a sequential read.
+    """
+    size = len(mm)
+    target = max((size - data_start) // max(parts, 1), 1)
+
+    chunks: list[Chunk] = []
+    start = data_start
+    line = 2  # line 1 is the header
+    in_quotes = False
+
+    while start < size:
+        pos = min(start + target, size)
+        scanned = start
+        boundary = size
+        while pos < size:
+            nl = mm.find(b"\n", pos)
+            if nl < 0:
+                break
+            if mm[scanned:nl].count(b'"') % 2:
+                in_quotes = not in_quotes
+            scanned = nl
+            if not in_quotes:
+                boundary = nl + 1
+                break
+            pos = nl + 1
+
+        chunks.append((start, boundary, line))
+        line += mm[start:boundary].count(b"\n")
+        start = boundary
+
+    return chunks
+
+
+def _parse_chunk(
+    csv_path: str,
+    header: list[str],
+    chunk: Chunk,
+    profile: FormatProfile | None,
+) -> tuple[bytes, bytes, list[str], list[tuple[str, str] | None]]:
+    """
+    Parse one chunk in a worker process.
+    Returns packed day ordinals, packed amounts, descriptions (cheap to pickle)
+    and the (merchant, category) each row carried from an enriched export, if any.
+    """
+    start, end, first_line = chunk
+    encoding = profile.encoding if profile else "utf-8"
+
+    with open(csv_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = mm[start:end].decode(encoding)
+
+    f_text = io.StringIO(text, newline="")
+    reader = csv.reader(f_text, delimiter=profile.delimiter) if profile else csv.reader(f_text)
+    _header, convert = open_row_converter(iter([header]), profile)
+
+    ordinals = array("i")
+    amounts = array("d")
+    descriptions: list[str] = []
+    enriched: list[tuple[str, str] | None] = []
+    offset = first_line - 1
+
+    for values in reader:
+        if not values:
+            continue
+        txn = convert(values, offset + reader.line_num)
+        ordinals.append(txn.posted_date.toordinal())
+        amounts.append(txn.amount)
+        descriptions.append(txn.description)
+        enriched.append((txn.merchant, txn.category) if txn.category is not None else None)
+
+    return ordinals.tobytes(), amounts.tobytes(), descriptions, enriched
+
+
+def load_transactions_parallel(
+    csv_path: Path,
+    workers: int | None = None,
+    profile: FormatProfile | None = None,
+) -> list[Transaction]:
+    """
+    Load one large CSV using several processes.
+
+    The file is memory-mapped and split into line-aligned byte ranges that
+    are parsed in a process pool and merged back in file order. Errors are
+    raised for the first bad row in file order, with its real line number.
+    Small files fall back to `load_transactions`.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or csv_path.stat().st_size < MIN_PARALLEL_BYTES:
+        return load_transactions(csv_path, profile)
+
+    encoding = profile.encoding if profile else "utf-8"
+    with csv_path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header_end = mm.find(b"\n")
+        if header_end < 0:
+            return load_transactions(csv_path, profile)
+
+        header_line = mm[:header_end].decode(encoding)
+        delimiter = profile.delimiter if profile else ","
+        header = next(csv.reader([header_line], delimiter=delimiter), [])
+        open_row_converter(iter([header]), profile)  # validate columns before starting workers
+
+        chunks = split_chunks(mm, header_end + 1, workers * CHUNKS_PER_WORKER)
+
+    rows: list[Transaction] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_parse_chunk, str(csv_path), header, chunk, profile) for chunk in chunks]
+
+        # merge in file order so the first failing chunk reports the first bad line
+        for future in futures:
+            raw_ordinals, raw_amounts, descriptions, enriched = future.result()
+            ordinals = array("i")
+            ordinals.frombytes(raw_ordinals)
+            amounts = array("d")
+            amounts.frombytes(raw_amounts)
+            rows.extend(
+                Transaction(date.fromordinal(o), d, a, *(e or (None, None)))
+                for o, d, a, e in zip(ordinals, descriptions, amounts, enriched)
+            )
+
+    return rows
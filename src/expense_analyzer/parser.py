@@ -1,9 +1,18 @@
 from __future__ import annotations
 
 import csv
-from dataclasses import dataclass
+import io
+import math
+import random
+from collections import Counter
+from itertools import islice
+from dataclasses import dataclass, field
 from pathlib import Path
 from datetime import date
+from typing import TYPE_CHECKING, Callable, Iterator
+
+if TYPE_CHECKING:
+    from expense_analyzer.formats import FormatProfile
 
 
 @dataclass(frozen=True)
@@ -11,36 +20,317 @@ class Transaction:
     posted_date: date
     description: str
     amount: float
+    # precomputed by an enriched export (see categorize.RULESET_VERSION); not part of equality
+    merchant: str | None = field(default=None, compare=False)
+    category: str | None = field(default=None, compare=False)
+
+
+class RowError(ValueError):
+    """
+    A CSV row that cannot be converted into a Transaction.
+    `kind` is a short reason such as "Missing value" or "Invalid date".
+    """
+
+    def __init__(self, kind: str, line_num: int, detail: str = "") -> None:
+        self.kind = kind
+        self.line_num = line_num
+        self.detail = detail
+        message = f"{kind} on line {line_num}"
+        super().__init__(f"{message}: {detail}" if detail else message)
+
+    def __reduce__(self):
+        # keep the structured fields when crossing process boundaries
+        return (RowError, (self.kind, self.line_num, self.detail))
+
+
+class RejectLimitExceeded(ValueError):
+    pass
+
+
+@dataclass
+class IngestReport:
+    rows_read: int = 0
+    rejected: int = 0
+    reasons: Counter = field(default_factory=Counter)
+
+    @property
+    def accepted(self) -> int:
+        return self.rows_read - self.rejected
+
+
+REQUIRED_COLUMNS = frozenset({"date", "description", "amount"})
+ENRICHED_COLUMNS = REQUIRED_COLUMNS | {"merchant", "category", "ruleset"}
+
+# the error rate limit only applies once this many rows have been read
+MIN_ROWS_FOR_ERROR_RATE = 100
+
+
+def parse_transaction_row(row: dict[str, str], line_num: int) -> Transaction:
+    """
+    Convert one CSV row (date, description, amount) into a Transaction.
+    Raises RowError (a ValueError) if a value is missing or invalid.
+    """
+    raw_date = (row.get("date") or "").strip()
+    raw_desc = (row.get("description") or "").strip()
+    raw_amount = (row.get("amount") or "").strip()
 
+    if not raw_date or not raw_desc or not raw_amount:
+        raise RowError("Missing value", line_num)
 
-def load_transactions(csv_path: Path) -> list[Transaction]:
+    try:
+        posted = date.fromisoformat(raw_date)
+    except ValueError:
+        raise RowError("Invalid date", line_num, repr(raw_date)) from None
+
+    try:
+        amount = float(raw_amount)
+    except ValueError:
+        raise RowError("Invalid amount", line_num, repr(raw_amount)) from None
+    if not math.isfinite(amount):
+        raise RowError("Invalid amount", line_num, repr(raw_amount))
+
+    return Transaction(posted_date=posted, description=raw_desc, amount=amount)
+
+
+def parse_enriched_row(row: dict[str, str], line_num: int, ruleset: str) -> Transaction:
+    """
+    Convert one row of an enriched export. The exported merchant and category
+    are kept only when the row's ruleset matches `ruleset`.
     """
-    Load transactions from a CSV with columns: date, description, amount.
+    txn = parse_transaction_row(row, line_num)
+    merchant = (row.get("merchant") or "").strip()
+    category = (row.get("category") or "").strip()
+    if (row.get("ruleset") or "").strip() != ruleset or not merchant or not category:
+        return txn
+    return Transaction(txn.posted_date, txn.description, txn.amount, merchant, category)
+
+
+def open_row_converter(
+    reader: Iterator[list[str]],
+    profile: FormatProfile | None,
+) -> tuple[list[str], Callable[[list[str], int], Transaction]]:
+    """
+    Consume the header row and return it with a converter for the remaining rows.
+    """
+    header = next(reader, [])
+
+    if profile is not None:
+        from expense_analyzer.formats import compile_converter
+
+        return header, compile_converter(profile, header)
+
+    if not REQUIRED_COLUMNS.issubset(header):
+        raise ValueError(f"CSV must contain columns: {sorted(REQUIRED_COLUMNS)}")
+
+    if ENRICHED_COLUMNS.issubset(header):
+        from expense_analyzer.categorize import RULESET_VERSION
+
+        return header, lambda values, line_num: parse_enriched_row(dict(zip(header, values)), line_num, RULESET_VERSION)
+
+    return header, lambda values, line_num: parse_transaction_row(dict(zip(header, values)), line_num)
+
+
+def iter_transactions(csv_path: Path, profile: FormatProfile | None = None) -> Iterator[Transaction]:
+    """
+    Stream transactions from a CSV with columns: date, description, amount.
 
     Rules:
     - date: YYYY-MM-DD
     - amount: negative = expense, positive = income
+    - enriched exports (with merchant, category and ruleset columns) keep
+      their merchant and category while the ruleset is current
+    - other layouts can be read by passing a FormatProfile (see formats.py)
     """
-    rows: list[Transaction] = []
+    encoding = profile.encoding if profile else "utf-8"
+    with csv_path.open("r", encoding=encoding, newline="") as f:
+        reader = csv.reader(f, delimiter=profile.delimiter) if profile else csv.reader(f)
+        _header, convert = open_row_converter(reader, profile)
 
-    with csv_path.open("r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
+        for values in reader:
+            if values:
+                yield convert(values, reader.line_num)
 
-        required = {"date", "description", "amount"}
-        if not required.issubset(set(reader.fieldnames or [])):
-            raise ValueError(f"CSV must contain columns: {sorted(required)}")
 
-        for line_num, row in enumerate(reader, start=2):
-            raw_date = (row.get("date") or "").strip()
-            raw_desc = (row.get("description") or "").strip()
-            raw_amount = (row.get("amount") or "").strip()
+def load_transactions(csv_path: Path, profile: FormatProfile | None = None) -> list[Transaction]:
+    """
+    Load all transactions from a CSV (see `iter_transactions` for the format).
+    """
+    return list(iter_transactions(csv_path, profile))
+
+
+def head_transactions(csv_path: Path, n: int, profile: FormatProfile | None = None) -> list[Transaction]:
+    """
+    The first `n` transactions; stops reading as soon as they are parsed.
+    """
+    return list(islice(iter_transactions(csv_path, profile), n))
+
+
+def sample_transactions(
+    csv_path: Path,
+    n: int,
+    profile: FormatProfile | None = None,
+    seed: int | None = None,
+) -> list[Transaction]:
+    """
+    A uniform random sample of `n` transactions in one streaming pass
+    (reservoir sampling, O(n) memory), returned in file order.
+    """
+    rng = random.Random(seed)
+    reservoir: list[tuple[int, Transaction]] = []
+    for i, txn in enumerate(iter_transactions(csv_path, profile)):
+        if i < n:
+            reservoir.append((i, txn))
+        else:
+            j = rng.randint(0, i)
+            if j < n:
+                reservoir[j] = (i, txn)
+    return [txn for _i, txn in sorted(reservoir, key=lambda item: item[0])]
+
+
+_TAIL_BLOCK = 64 * 1024
+
+
+def count_lines(csv_path: Path, end: int | None = None) -> int:
+    """
+    Count physical lines (newlines, plus an unterminated last line) in the
+    first `end` bytes of a file, reading large blocks without parsing CSV.
+    """
+    lines = 0
+    last = b"\n"
+    remaining = end
+    with csv_path.open("rb") as f:
+        while remaining is None or remaining > 0:
+            block = f.read(1 << 20 if remaining is None else min(1 << 20, remaining))
+            if not block:
+                break
+            lines += block.count(b"\n")
+            last = block[-1:]
+            if remaining is not None:
+                remaining -= len(block)
+    return lines + (last != b"\n")
+
+
+def tail_transactions(csv_path: Path, n: int, profile: FormatProfile | None = None) -> list[Transaction]:
+    """
+    The last `n` transactions, read backwards from the end of the file in blocks.
 
-            if not raw_date or not raw_desc or not raw_amount:
-                raise ValueError(f"Missing value on line {line_num}")
+    Only the header and the last lines are read, so the cost does not depend
+    on the file size. Quoted fields spanning several lines are not supported
+    here. Errors still report the real line number.
+    """
+    encoding = profile.encoding if profile else "utf-8"
+    delimiter = profile.delimiter if profile else ","
+
+    with csv_path.open("rb") as f:
+        header_line = f.readline()
+        data_start = f.tell()
 
-            posted = date.fromisoformat(raw_date)
-            amount = float(raw_amount)
+        size = f.seek(0, io.SEEK_END)
+        start = size
+        chunk = b""
+        # n lines need n + 1 newlines before them (or the start of the data)
+        while start > data_start and chunk.count(b"\n") <= n:
+            step = min(_TAIL_BLOCK, start - data_start)
+            start -= step
+            f.seek(start)
+            chunk = f.read(step) + chunk
 
-            rows.append(Transaction(posted_date=posted, description=raw_desc, amount=amount))
+    # (byte offset, line) pairs; the first line is cut off unless the data starts there
+    lines: list[tuple[int, bytes]] = []
+    pos = start
+    for line in chunk.splitlines(keepends=True):
+        lines.append((pos, line))
+        pos += len(line)
+    if start > data_start:
+        lines = lines[1:]
+    lines = [(pos, line) for pos, line in lines if line.strip()][-n:] if n else []
 
+    _header, convert = open_row_converter(csv.reader([header_line.decode(encoding)], delimiter=delimiter), profile)
+    rows: list[Transaction] = []
+    for pos, line in lines:
+        values = next(csv.reader([line.decode(encoding)], delimiter=delimiter))
+        try:
+            rows.append(convert(values, 0))
+        except RowError as e:
+            # rare, so the real line number is only counted when needed
+            raise RowError(e.kind, count_lines(csv_path, pos) + 1, e.detail) from None
     return rows
+
+
+def _check_decoded(values: list[str], line_num: int) -> None:
+    try:
+        "".join(values).encode("utf-8")
+    except UnicodeEncodeError:
+        raise RowError("Invalid encoding", line_num) from None
+
+
+def _check_error_rate(report: IngestReport, max_error_rate: float | None) -> None:
+    if max_error_rate is not None and report.rows_read and report.rejected / report.rows_read > max_error_rate:
+        raise RejectLimitExceeded(f"Reject rate {report.rejected / report.rows_read:.1%} exceeds {max_error_rate:.1%}")
+
+
+def iter_transactions_tolerant(
+    csv_path: Path,
+    report: IngestReport,
+    reject_path: Path | None = None,
+    max_errors: int | None = None,
+    max_error_rate: float | None = None,
+    profile: FormatProfile | None = None,
+) -> Iterator[Transaction]:
+    """
+    Stream transactions like `iter_transactions`, skipping rows that fail to parse.
+
+    Rules:
+    - Bad rows are counted in `report` and, if `reject_path` is given,
+      written there with their line number, reason and original values
+    - Raises RejectLimitExceeded once more than `max_errors` rows are rejected,
+      or once the reject rate exceeds `max_error_rate` (checked on every reject
+      after MIN_ROWS_FOR_ERROR_RATE rows, and for the whole file at the end)
+    - Lines with bytes that are invalid in the file's encoding are rejected
+      as "Invalid encoding" (and written to the sink byte for byte)
+    - A missing required column is still a hard error (ValueError)
+    """
+    encoding = profile.encoding if profile else "utf-8"
+    # undecodable bytes become lone surrogates instead of aborting the whole read
+    with csv_path.open("r", encoding=encoding, errors="surrogateescape", newline="") as f:
+        reader = csv.reader(f, delimiter=profile.delimiter) if profile else csv.reader(f)
+        header, convert = open_row_converter(reader, profile)
+
+        sink = None
+        try:
+            for values in reader:
+                if not values:
+                    continue
+
+                line_num = reader.line_num
+                report.rows_read += 1
+                try:
+                    _check_decoded(values, line_num)
+                    txn = convert(values, line_num)
+                except RowError as e:
+                    error = e
+                else:
+                    yield txn
+                    continue
+
+                report.rejected += 1
+                report.reasons[error.kind] += 1
+
+                if reject_path is not None:
+                    if sink is None:
+                        sink_file = reject_path.open("w", encoding="utf-8", errors="surrogateescape", newline="")
+                        sink = csv.writer(sink_file)
+                        sink.writerow(("line", "reason", *header))
+                    sink.writerow((line_num, str(error), *values))
+
+                if max_errors is not None and report.rejected > max_errors:
+                    raise RejectLimitExceeded(f"Too many rejected rows (more than {max_errors}); last: {error}")
+                if report.rows_read >= MIN_ROWS_FOR_ERROR_RATE:
+                    _check_error_rate(report, max_error_rate)
+        finally:
+            if sink is not None:
+                sink_file.close()
+
+    # short files never reach MIN_ROWS_FOR_ERROR_RATE, and good rows at the end
+    # lower the rate without a check: the whole file is the final sample
+    _check_error_rate(report, max_error_rate)
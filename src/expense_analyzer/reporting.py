@@ -3,10 +3,18 @@ from __future__ import annotations
 import json
 from dataclasses import asdict
 from pathlib import Path
+from typing import Iterable
 
 from expense_analyzer.analyze import Summary
 
 
+REPORT_FORMATS = ("json", "consolidated", "ndjson")
+
+_BUFFER_SIZE = 1 << 20
+_COMPACT = {"separators": (",", ":")}
+_PRETTY = {"indent": 2}
+
+
 def ensure_reports_dir(out_dir: Path) -> Path:
     """
     Ensure an output directory exists and return its resolved path.
@@ -16,12 +24,48 @@ def ensure_reports_dir(out_dir: Path) -> Path:
     return out_dir
 
 
-def write_monthly_summary_json(reports_dir: Path, summary: Summary) -> Path:
+def monthly_summary_path(reports_dir: Path, month: str) -> Path:
+    return reports_dir / f"summary_{month}.json"
+
+
+def write_monthly_summary_json(reports_dir: Path, summary: Summary, compact: bool = False) -> Path:
     """
     Write a monthly summary to reports/ as JSON and return the created file path.
     """
-    out_path = reports_dir / f"summary_{summary.month}.json"
+    out_path = monthly_summary_path(reports_dir, summary.month)
     payload = asdict(summary)
 
-    out_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    out_path.write_text(json.dumps(payload, **(_COMPACT if compact else _PRETTY)), encoding="utf-8")
+    return out_path
+
+
+def write_consolidated_json(reports_dir: Path, summaries: Iterable[Summary], compact: bool = False) -> Path:
+    """
+    Write all summaries into one JSON object keyed by month (reports/summaries.json).
+    The document is streamed through one buffered file, one summary at a time.
+    """
+    out_path = reports_dir / "summaries.json"
+    with out_path.open("w", encoding="utf-8", buffering=_BUFFER_SIZE) as f:
+        f.write("{")
+        for i, summary in enumerate(summaries):
+            sep = "," if i else ""
+            key = json.dumps(summary.month)
+            if compact:
+                f.write(f"{sep}{key}:{json.dumps(asdict(summary), **_COMPACT)}")
+            else:
+                body = json.dumps(asdict(summary), **_PRETTY).replace("\n", "\n  ")
+                f.write(f"{sep}\n  {key}: {body}")
+        f.write("}" if compact else "\n}")
+    return out_path
+
+
+def write_summaries_ndjson(reports_dir: Path, summaries: Iterable[Summary]) -> Path:
+    """
+    Write one compact JSON Summary per line (reports/summaries.ndjson).
+    """
+    out_path = reports_dir / "summaries.ndjson"
+    with out_path.open("w", encoding="utf-8", buffering=_BUFFER_SIZE) as f:
+        for summary in summaries:
+            f.write(json.dumps(asdict(summary), **_COMPACT))
+            f.write("\n")
     return out_path
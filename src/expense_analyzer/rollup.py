@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import json
+import struct
+import sys
+from array import array
+from datetime import date, timedelta
+from itertools import accumulate
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Mapping, Sequence
+
+from expense_analyzer.parser import Transaction
+from expense_analyzer.categorize import DEFAULT_RULES, CategoryRule, categorize_many
+from expense_analyzer.analyze import Summary
+
+if TYPE_CHECKING:
+    from expense_analyzer.classifier import CategoryModel
+
+
+PERIODS = ("day", "week", "month", "quarter", "year")
+
+_MAGIC = b"EXAROLL1"
+_U32 = struct.Struct("<I")
+
+
+def period_key(d: date, period: str) -> str:
+    """
+    Bucket key for a date: YYYY-MM-DD, YYYY-Www (ISO week), YYYY-MM, YYYY-Qn or YYYY.
+    """
+    if period == "day":
+        return d.isoformat()
+    if period == "week":
+        year, week, _ = d.isocalendar()
+        return f"{year:04d}-W{week:02d}"
+    if period == "month":
+        return f"{d.year:04d}-{d.month:02d}"
+    if period == "quarter":
+        return f"{d.year:04d}-Q{(d.month - 1) // 3 + 1}"
+    if period == "year":
+        return f"{d.year:04d}"
+    raise ValueError(f"Period must be one of: {', '.join(PERIODS)}")
+
+
+def _period_start(d: date, period: str) -> date:
+    if period == "day":
+        return d
+    if period == "week":
+        return d - timedelta(days=d.weekday())
+    if period == "month":
+        return d.replace(day=1)
+    if period == "quarter":
+        return date(d.year, (d.month - 1) // 3 * 3 + 1, 1)
+    return date(d.year, 1, 1)
+
+
+def _next_period_start(d: date, period: str) -> date:
+    if period == "day":
+        return d + timedelta(days=1)
+    if period == "week":
+        return d + timedelta(days=7)
+    if period == "year":
+        return date(d.year + 1, 1, 1)
+    months = 1 if period == "month" else 3
+    idx = d.year * 12 + d.month - 1 + months
+    return date(idx // 12, idx % 12 + 1, 1)
+
+
+class RollupCube:
+    """
+    Daily income/expense totals per category, in integer cents, stored as prefix sums.
+
+    prefix[i] is the total of the days before day i, so any date range
+    costs two lookups per series and a report over N periods is O(N x categories)
+    no matter how many transactions were rolled up.
+
+    `expense_counts` holds per-category expense counts (also prefix sums), so a
+    category whose expenses total zero in a range is still reported, as in
+    `build_monthly_summary`. Cubes saved without them fall back to non-zero totals.
+    """
+
+    def __init__(
+        self,
+        start: date,
+        days: int,
+        income: array,
+        expenses: dict[str, array],
+        counts: array,
+        expense_counts: dict[str, array] | None = None,
+    ) -> None:
+        self.start = start
+        self.days = days
+        self.income = income
+        self.expenses = expenses
+        self.counts = counts
+        self.expense_counts = expense_counts
+
+    @classmethod
+    def build(
+        cls,
+        transactions: list[Transaction],
+        aliases: Mapping[str, str] | None = None,
+        model: CategoryModel | None = None,
+        rules: Sequence[CategoryRule] = DEFAULT_RULES,
+    ) -> RollupCube:
+        if not transactions:
+            return cls(date.today(), 0, array("q", [0]), {}, array("q", [0]), {})
+
+        first = min(t.posted_date for t in transactions).toordinal()
+        last = max(t.posted_date for t in transactions).toordinal()
+        days = last - first + 1
+
+        income = array("q", bytes(8 * days))
+        counts = array("q", bytes(8 * days))
+        expenses: dict[str, array] = {}
+        expense_counts: dict[str, array] = {}
+
+        for txn, cat in zip(transactions, categorize_many(transactions, rules, aliases, model)):
+            day = txn.posted_date.toordinal() - first
+            cents = round(txn.amount * 100)
+            counts[day] += 1
+            if txn.amount > 0:
+                income[day] += cents
+            else:
+                series = expenses.get(cat)
+                if series is None:
+                    series = expenses[cat] = array("q", bytes(8 * days))
+                    expense_counts[cat] = array("q", bytes(8 * days))
+                series[day] += -cents
+                expense_counts[cat][day] += 1
+
+        def prefix(daily: array) -> array:
+            return array("q", accumulate(daily, initial=0))
+
+        return cls(
+            date.fromordinal(first),
+            days,
+            prefix(income),
+            {cat: prefix(series) for cat, series in sorted(expenses.items())},
+            prefix(counts),
+            {cat: prefix(series) for cat, series in sorted(expense_counts.items())},
+        )
+
+    def _index(self, d: date) -> int:
+        return min(max(d.toordinal() - self.start.toordinal(), 0), self.days)
+
+    def range_summary(self, key: str, first: date, end: date) -> Summary:
+        """
+        Summary of the half-open date range [first, end) labelled `key`.
+        """
+        a, b = self._index(first), self._index(end)
+        income = self.income[b] - self.income[a]
+        by_cat = {cat: p[b] - p[a] for cat, p in self.expenses.items()}
+        seen = self.expense_counts
+        if seen is None:
+            by_cat = {cat: cents for cat, cents in by_cat.items() if cents}
+        else:
+            by_cat = {cat: cents for cat, cents in by_cat.items() if seen[cat][b] != seen[cat][a]}
+        expenses = sum(by_cat.values())
+        return Summary(
+            month=key,
+            income_total=income / 100,
+            expense_total=expenses / 100,
+            net_total=(income - expenses) / 100,
+            by_category={k: v / 100 for k, v in sorted(by_cat.items(), key=lambda kv: kv[1], reverse=True)},
+        )
+
+    def periods(self, period: str, first: date | None = None, last: date | None = None) -> Iterator[tuple[str, date, date]]:
+        """
+        Yield (key, start, end) for every period with transactions, end exclusive.
+        """
+        if not self.days:
+            return
+        first = max(first or self.start, self.start)
+        end_of_data = self.start + timedelta(days=self.days)
+        stop = min(last + timedelta(days=1), end_of_data) if last else end_of_data
+
+        cursor = _period_start(first, period)
+        while cursor < stop:
+            nxt = _next_period_start(cursor, period)
+            lo, hi = max(cursor, first), min(nxt, stop)
+            if self.counts[self._index(hi)] != self.counts[self._index(lo)]:
+                yield period_key(cursor, period), lo, hi
+            cursor = nxt
+
+    def summaries(self, period: str = "month", first: date | None = None, last: date | None = None) -> dict[str, Summary]:
+        """
+        One Summary per period (keyed by `period_key`), optionally limited to [first, last].
+        """
+        if period not in PERIODS:
+            raise ValueError(f"Period must be one of: {', '.join(PERIODS)}")
+        return {key: self.range_summary(key, lo, hi) for key, lo, hi in self.periods(period, first, last)}
+
+
+def save_rollup(path: Path, cube: RollupCube) -> None:
+    """
+    Persist a cube: magic, u32 header length, JSON header, then raw int64 prefix arrays
+    (income, counts, one per category, then one count series per category if present).
+    """
+    header = {
+        "start": cube.start.isoformat(),
+        "days": cube.days,
+        "categories": list(cube.expenses),
+        "category_counts": cube.expense_counts is not None,
+        "byteorder": sys.byteorder,
+    }
+    raw_header = json.dumps(header).encode("utf-8")
+
+    with path.open("wb") as f:
+        f.write(_MAGIC)
+        f.write(_U32.pack(len(raw_header)))
+        f.write(raw_header)
+        cube.income.tofile(f)
+        cube.counts.tofile(f)
+        for series in cube.expenses.values():
+            series.tofile(f)
+        if cube.expense_counts is not None:
+            for cat in cube.expenses:
+                cube.expense_counts[cat].tofile(f)
+
+
+def load_rollup(path: Path) -> RollupCube:
+    """
+    Load a cube written by `save_rollup`. Raises ValueError for other files
+    and for truncated or corrupt ones.
+    """
+    with path.open("rb") as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"Not a rollup file: {path}")
+        try:
+            (header_len,) = _U32.unpack(f.read(4))
+            header = json.loads(f.read(header_len).decode("utf-8"))
+            length = header["days"] + 1
+
+            def read_series() -> array:
+                series = array("q")
+                series.fromfile(f, length)
+                if header["byteorder"] != sys.byteorder:
+                    series.byteswap()
+                return series
+
+            income = read_series()
+            counts = read_series()
+            expenses = {cat: read_series() for cat in header["categories"]}
+            expense_counts = (
+                {cat: read_series() for cat in header["categories"]} if header.get("category_counts") else None
+            )
+            start = date.fromisoformat(header["start"])
+        except (EOFError, struct.error, KeyError, TypeError, UnicodeDecodeError) as e:
+            raise ValueError(f"Truncated or corrupt rollup file: {path}") from e
+
+    return RollupCube(start, header["days"], income, expenses, counts, expense_counts)
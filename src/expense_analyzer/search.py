@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import json
+import struct
+import sys
+from array import array
+from dataclasses import asdict, dataclass
+from datetime import date
+from pathlib import Path
+from typing import Iterable
+
+from expense_analyzer.normalize import normalize_description
+from expense_analyzer.watch import FileState, file_replaced, read_appended
+
+
+_MAGIC = b"EXASRCH1"
+_U32 = struct.Struct("<I")
+_JOURNAL_SUFFIX = ".journal"
+
+# appended rows are journaled until the journal reaches this fraction of the index file
+JOURNAL_COMPACT_RATIO = 0.25
+
+
+class IndexStale(ValueError):
+    """
+    An indexed file was removed or rewritten since it was indexed; the index must be rebuilt.
+    """
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    posted_date: date
+    amount: float
+    merchant: str
+    description: str
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _haystacks(description: str) -> tuple[str, str]:
+    return normalize_description(description).lower(), description.lower()
+
+
+class SearchIndex:
+    """
+    Trigram index over normalized merchants and raw descriptions.
+
+    Each distinct description is indexed once: its trigrams (from both the
+    merchant and the description) point to the description id, and rows only
+    store (date ordinal, cents, description id) in flat arrays. A query
+    intersects the posting lists of its trigrams, verifies the few candidate
+    descriptions and then filters their rows, so the cost depends on the
+    number of matches rather than on the number of rows.
+
+    Files are indexed from a remembered byte offset, so re-indexing a
+    statement only reads rows appended since the last update, and
+    `append_index` persists only those rows.
+    """
+
+    def __init__(self) -> None:
+        self.files: dict[str, FileState] = {}
+        self.texts: list[str] = []
+        self._text_ids: dict[str, int] = {}
+        self.postings: dict[str, array] = {}
+
+        self.ordinals = array("i")
+        self.cents = array("q")
+        self.row_text = array("i")
+
+        # rows grouped by description: flat ids + offsets, plus rows added since the last compaction
+        self._grouped = array("i")
+        self._group_offsets = array("i", [0])
+        self._pending: dict[int, list[int]] = {}
+
+        # rows [0, _saved_rows) are in the index file or its journal
+        self._saved_rows = 0
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def _text_id(self, description: str) -> int:
+        text_id = self._text_ids.get(description)
+        if text_id is None:
+            text_id = self._text_ids[description] = len(self.texts)
+            self.texts.append(description)
+            merchant, raw = _haystacks(description)
+            for gram in _trigrams(merchant) | _trigrams(raw):
+                posting = self.postings.get(gram)
+                if posting is None:
+                    posting = self.postings[gram] = array("i")
+                posting.append(text_id)
+        return text_id
+
+    def update(self, csv_paths: Iterable[Path]) -> int:
+        """
+        Index rows appended to each file since the last update. Returns the number of new rows.
+        Raises IndexStale if an indexed file was removed or rewritten (the
+        index must then be rebuilt, see `watch.file_replaced`). A row that cannot be parsed raises ValueError once the other
+        files are indexed; its file is retried from the same offset next time.
+        """
+        for name in self.files:
+            if not Path(name).exists():
+                raise IndexStale(f"{Path(name).name} was removed since it was indexed; rebuild the index.")
+
+        added = 0
+        error: ValueError | None = None
+        for path in csv_paths:
+            key = str(path.resolve())
+            state = self.files.get(key)
+            if state is None:
+                state = self.files[key] = FileState()
+            elif file_replaced(path, state):
+                raise IndexStale(f"{path.name} changed since it was indexed; rebuild the index.")
+
+            try:
+                txns = read_appended(path, state)
+            except ValueError as e:
+                error = error or e  # keep indexing the other files
+                continue
+            for txn in txns:
+                self._add_row(txn.posted_date.toordinal(), round(txn.amount * 100), txn.description)
+                added += 1
+
+        if error is not None:
+            raise error
+        return added
+
+    def _add_row(self, ordinal: int, cents: int, description: str) -> None:
+        row = len(self.ordinals)
+        text_id = self._text_id(description)
+        self.ordinals.append(ordinal)
+        self.cents.append(cents)
+        self.row_text.append(text_id)
+        self._pending.setdefault(text_id, []).append(row)
+
+    def _rows_for(self, text_id: int) -> Iterable[int]:
+        rows: Iterable[int] = ()
+        if text_id + 1 < len(self._group_offsets):
+            rows = self._grouped[self._group_offsets[text_id] : self._group_offsets[text_id + 1]]
+        pending = self._pending.get(text_id)
+        return [*rows, *pending] if pending else rows
+
+    def _matching_texts(self, needle: str) -> list[int]:
+        grams = _trigrams(needle)
+        if grams:
+            postings = sorted((self.postings.get(g, array("i")) for g in grams), key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                if not candidates:
+                    break
+                candidates.intersection_update(posting)
+        else:
+            # one or two characters: no trigram to look up, check every distinct description
+            candidates = set(range(len(self.texts)))
+
+        matches = []
+        for text_id in sorted(candidates):
+            merchant, raw = _haystacks(self.texts[text_id])
+            if needle in merchant or needle in raw:
+                matches.append(text_id)
+        return matches
+
+    def search(
+        self,
+        query: str,
+        first: date | None = None,
+        last: date | None = None,
+        min_amount: float | None = None,
+        max_amount: float | None = None,
+        limit: int | None = 50,
+    ) -> list[SearchHit]:
+        """
+        Rows whose merchant or description contains `query` (case-insensitive).
+
+        Rules:
+        - Dates are inclusive; amounts compare the absolute value (so 50 matches
+          both a 50.00 expense and a 50.00 refund)
+        - Results are newest first, at most `limit` (None = all)
+        """
+        needle = query.strip().lower()
+        if not needle:
+            raise ValueError("Search query must not be empty")
+
+        lo = first.toordinal() if first else None
+        hi = last.toordinal() if last else None
+        min_cents = round(min_amount * 100) if min_amount is not None else None
+        max_cents = round(max_amount * 100) if max_amount is not None else None
+
+        rows: list[int] = []
+        for text_id in self._matching_texts(needle):
+            for row in self._rows_for(text_id):
+                day = self.ordinals[row]
+                if (lo is not None and day < lo) or (hi is not None and day > hi):
+                    continue
+                cents = abs(self.cents[row])
+                if (min_cents is not None and cents < min_cents) or (max_cents is not None and cents > max_cents):
+                    continue
+                rows.append(row)
+
+        rows.sort(key=lambda r: (self.ordinals[r], r), reverse=True)
+        if limit is not None:
+            rows = rows[:limit]
+
+        return [
+            SearchHit(
+                posted_date=date.fromordinal(self.ordinals[r]),
+                amount=self.cents[r] / 100,
+                merchant=normalize_description(self.texts[self.row_text[r]]),
+                description=self.texts[self.row_text[r]],
+            )
+            for r in rows
+        ]
+
+    def _compact(self) -> None:
+        """
+        Fold pending rows into the grouped arrays (one pass over the descriptions).
+        """
+        if not self._pending and len(self._group_offsets) == len(self.texts) + 1:
+            return
+
+        grouped = array("i")
+        offsets = array("i", [0])
+        for text_id in range(len(self.texts)):
+            if text_id + 1 < len(self._group_offsets):
+                grouped.extend(self._grouped[self._group_offsets[text_id] : self._group_offsets[text_id + 1]])
+            grouped.extend(self._pending.get(text_id, ()))
+            offsets.append(len(grouped))
+
+        self._grouped, self._group_offsets, self._pending = grouped, offsets, {}
+
+
+def _journal_path(path: Path) -> Path:
+    return path.with_name(path.name + _JOURNAL_SUFFIX)
+
+
+def save_index(path: Path, index: SearchIndex) -> None:
+    """
+    Persist an index: magic, u32 header length, JSON header, then raw arrays
+    (rows, grouped rows, posting lists) in the order listed in the header.
+    Replaces any journal (see `append_index`).
+    """
+    index._compact()
+    grams = list(index.postings)
+    header = {
+        "byteorder": sys.byteorder,
+        "rows": len(index),
+        "texts": index.texts,
+        "grams": grams,
+        "posting_sizes": [len(index.postings[g]) for g in grams],
+        "files": {name: asdict(state) for name, state in index.files.items()},
+    }
+    raw_header = json.dumps(header).encode("utf-8")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as f:
+        f.write(_MAGIC)
+        f.write(_U32.pack(len(raw_header)))
+        f.write(raw_header)
+        index.ordinals.tofile(f)
+        index.cents.tofile(f)
+        index.row_text.tofile(f)
+        index._grouped.tofile(f)
+        index._group_offsets.tofile(f)
+        for g in grams:
+            index.postings[g].tofile(f)
+    _journal_path(path).unlink(missing_ok=True)
+    index._saved_rows = len(index)
+
+
+def append_index(path: Path, index: SearchIndex) -> None:
+    """
+    Persist only the rows added since `index` was loaded or saved, as one JSON
+    line (rows plus file offsets) appended to a journal next to the index.
+    The full index is rewritten instead when there is no index file yet or
+    the journal has grown past JOURNAL_COMPACT_RATIO of it.
+    """
+    journal = _journal_path(path)
+    if not path.exists() or (journal.exists() and journal.stat().st_size > path.stat().st_size * JOURNAL_COMPACT_RATIO):
+        save_index(path, index)
+        return
+    if index._saved_rows == len(index):
+        return
+
+    rows = range(index._saved_rows, len(index))
+    entry = {
+        "rows": [[index.ordinals[r], index.cents[r], index.texts[index.row_text[r]]] for r in rows],
+        "files": {name: asdict(state) for name, state in index.files.items()},
+    }
+    with journal.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+    index._saved_rows = len(index)
+
+
+def load_index(path: Path) -> SearchIndex:
+    """
+    Load an index written by `save_index`, plus rows from its journal (see
+    `append_index`). Returns an empty index if the file doesn't exist.
+    Raises ValueError for files that are not search indexes and for
+    truncated or corrupt ones.
+    """
+    index = SearchIndex()
+    if not path.exists():
+        return index
+
+    with path.open("rb") as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"Not a search index: {path}")
+        try:
+            (header_len,) = _U32.unpack(f.read(4))
+            header = json.loads(f.read(header_len).decode("utf-8"))
+
+            def read(typecode: str, length: int) -> array:
+                values = array(typecode)
+                values.fromfile(f, length)
+                if header["byteorder"] != sys.byteorder:
+                    values.byteswap()
+                return values
+
+            rows = header["rows"]
+            index.ordinals = read("i", rows)
+            index.cents = read("q", rows)
+            index.row_text = read("i", rows)
+            index._grouped = read("i", rows)
+            index._group_offsets = read("i", len(header["texts"]) + 1)
+            index.postings = {g: read("i", size) for g, size in zip(header["grams"], header["posting_sizes"])}
+
+            index.texts = header["texts"]
+            index._text_ids = {text: i for i, text in enumerate(index.texts)}
+            index.files = {name: FileState(**state) for name, state in header["files"].items()}
+        except (EOFError, ValueError, struct.error, KeyError, TypeError) as e:
+            raise ValueError(f"Truncated or corrupt search index: {path}") from e
+
+    journal = _journal_path(path)
+    if journal.exists():
+        with journal.open("rb") as f:
+            good = 0
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                for ordinal, cents, description in entry["rows"]:
+                    index._add_row(ordinal, cents, description)
+                index.files = {name: FileState(**state) for name, state in entry["files"].items()}
+                good += len(line)
+        if good < journal.stat().st_size:
+            # a torn last write: drop it, its rows are read from the statements again
+            with journal.open("r+b") as f:
+                f.truncate(good)
+
+    index._saved_rows = len(index)
+    return index
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Mapping, Sequence
+from urllib.parse import parse_qs, urlsplit
+
+from expense_analyzer.parser import Transaction, load_transactions
+from expense_analyzer.analyze import Alert, Summary, build_monthly_summary, detect_unusual_spending
+from expense_analyzer.budget import evaluate_budgets
+from expense_analyzer.categorize import DEFAULT_RULES, CategoryRule
+from expense_analyzer.categories import summary_at_depth
+from expense_analyzer.settings_store import BudgetSettings, load_settings
+from expense_analyzer.validators import validate_month
+
+if TYPE_CHECKING:
+    from expense_analyzer.classifier import CategoryModel
+
+
+_MAX_HEADER_LINES = 100
+# paths whose answers may need real computation; served from a worker thread
+_SLOW_PATHS = frozenset({"/alerts"})
+
+ALERT_CACHE_SIZE = 8
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+class Dataset:
+    """
+    Statements and settings loaded once and kept in memory with their aggregates.
+
+    `is_stale` reports when any underlying file's size or modification time
+    changed since the last `load`. `rules`, `aliases` and `model` decide
+    categories (see `enrich_many`).
+    """
+
+    def __init__(
+        self,
+        csv_paths: list[Path],
+        settings_path: Path | None = None,
+        aliases: Mapping[str, str] | None = None,
+        model: CategoryModel | None = None,
+        rules: Sequence[CategoryRule] = DEFAULT_RULES,
+    ) -> None:
+        self.csv_paths = csv_paths
+        self.settings_path = settings_path
+        self.aliases = aliases
+        self.model = model
+        self.rules = rules
+        self._signature: tuple = ()
+        self.transactions: list[Transaction] = []
+        self.summaries: dict[str, Summary] = {}
+        self.settings: BudgetSettings | None = None
+        self._alerts: OrderedDict[tuple[float, float, int], dict[str, list[Alert]]] = OrderedDict()
+        self._alerts_lock = threading.Lock()
+        self.load()
+
+    def _current_signature(self) -> tuple:
+        sig = []
+        for path in [*self.csv_paths, *([self.settings_path] if self.settings_path else [])]:
+            try:
+                st = path.stat()
+                sig.append((str(path), st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                sig.append((str(path), None, None))
+        return tuple(sig)
+
+    def load(self) -> None:
+        signature = self._current_signature()
+        transactions: list[Transaction] = []
+        for path in self.csv_paths:
+            transactions.extend(load_transactions(path))
+
+        self.transactions = transactions
+        self.summaries = build_monthly_summary(transactions, aliases=self.aliases, model=self.model, rules=self.rules)
+        self.settings = load_settings(self.settings_path) if self.settings_path else None
+        self._alerts = OrderedDict()
+        self._signature = signature
+
+    def adopt(self, other: Dataset) -> None:
+        """
+        Take over the data of a freshly loaded dataset.
+        """
+        self.transactions = other.transactions
+        self.summaries = other.summaries
+        self.settings = other.settings
+        with self._alerts_lock:
+            self._alerts = other._alerts
+        self._signature = other._signature
+
+    def is_stale(self) -> bool:
+        return self._current_signature() != self._signature
+
+    def alerts(self, multiplier: float = 2.5, min_amount: float = 50.0, min_samples: int = 3) -> dict[str, list[Alert]]:
+        """
+        Alerts for one set of thresholds. The last ALERT_CACHE_SIZE results are
+        kept (least recently used first out), since clients choose the keys.
+        Safe to call from worker threads.
+        """
+        key = (multiplier, min_amount, min_samples)
+        with self._alerts_lock:
+            cache = self._alerts
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+
+        result = detect_unusual_spending(
+            self.transactions,
+            multiplier=multiplier,
+            min_amount=min_amount,
+            min_samples=min_samples,
+            aliases=self.aliases,
+            model=self.model,
+            rules=self.rules,
+        )
+        with self._alerts_lock:
+            if cache is self._alerts:  # not replaced by a reload meanwhile
+                cache[key] = result
+                while len(cache) > ALERT_CACHE_SIZE:
+                    cache.popitem(last=False)
+        return result
+
+
+def handle_query(dataset: Dataset, target: str) -> tuple[int, Any]:
+    """
+    Answer one GET request target (path + query string) and return (status, JSON payload).
+
+    Endpoints:
+    - /months
+    - /summary[?month=YYYY-MM&depth=N]
+    - /alerts[?month=YYYY-MM&multiplier=&min_amount=&min_samples=]
+    - /budget[?month=YYYY-MM&depth=N]   (defaults to the latest month)
+    `depth` rolls nested categories (Parent/Child) up to N levels.
+    """
+    url = urlsplit(target)
+    params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+    try:
+        month = validate_month(params["month"]) if params.get("month") else ""
+        depth = int(params["depth"]) if params.get("depth") else None
+
+        if url.path == "/months":
+            return 200, sorted(dataset.summaries)
+
+        if url.path in ("/summary", "/budget"):
+            if month and month not in dataset.summaries:
+                return 404, {"error": f"Month not found: {month}"}
+
+            if url.path == "/summary":
+                if month:
+                    return 200, asdict(summary_at_depth(dataset.summaries[month], depth))
+                return 200, {k: asdict(summary_at_depth(s, depth)) for k, s in dataset.summaries.items()}
+
+            if not dataset.summaries:
+                return 404, {"error": "No transactions loaded"}
+            month = month or sorted(dataset.summaries)[-1]
+            settings = dataset.settings or BudgetSettings(income_target=0.0, savings_goal=0.0, category_budgets={})
+            return 200, asdict(evaluate_budgets({month: dataset.summaries[month]}, settings, depth=depth)[month])
+
+        if url.path == "/alerts":
+            alerts_by_month = dataset.alerts(
+                multiplier=float(params.get("multiplier", 2.5)),
+                min_amount=float(params.get("min_amount", 50.0)),
+                min_samples=int(params.get("min_samples", 3)),
+            )
+            if month:
+                return 200, [asdict(a) for a in alerts_by_month.get(month, [])]
+            return 200, {k: [asdict(a) for a in v] for k, v in alerts_by_month.items()}
+    except ValueError as e:
+        return 400, {"error": str(e)}
+
+    return 404, {"error": f"Unknown endpoint: {url.path}"}
+
+
+async def _handle_connection(dataset: Dataset, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+
+            headers: dict[str, str] = {}
+            for _ in range(_MAX_HEADER_LINES):
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            parts = request_line.decode("latin-1").split()
+            if len(parts) != 3:
+                status, payload = 400, {"error": "Malformed request line"}
+            elif parts[0] != "GET":
+                status, payload = 405, {"error": "Only GET is supported"}
+            elif urlsplit(parts[1]).path in _SLOW_PATHS:
+                # keep the event loop free for other clients while alerts are computed
+                status, payload = await asyncio.to_thread(handle_query, dataset, parts[1])
+            else:
+                status, payload = handle_query(dataset, parts[1])
+
+            keep_alive = headers.get("connection", "").lower() != "close" and parts[-1:] == ["HTTP/1.1"]
+            body = json.dumps(payload).encode("utf-8")
+            writer.write(
+                (
+                    f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                ).encode("latin-1")
+                + body
+            )
+            await writer.drain()
+
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def _reload_loop(dataset: Dataset, interval: float) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        if not dataset.is_stale():
+            continue
+
+        # parse off the event loop so queries keep being answered from the old data
+        try:
+            fresh = await loop.run_in_executor(
+                None, Dataset, dataset.csv_paths, dataset.settings_path, dataset.aliases, dataset.model, dataset.rules
+            )
+        except (OSError, ValueError):
+            continue  # file is probably mid-write; retry on the next tick
+        dataset.adopt(fresh)
+
+
+async def serve(dataset: Dataset, host: str = "127.0.0.1", port: int = 8765, reload_interval: float = 2.0) -> None:
+    """
+    Serve `dataset` over HTTP/JSON until cancelled.
+    """
+    server = await asyncio.start_server(lambda r, w: _handle_connection(dataset, r, w), host, port)
+    reloader = asyncio.create_task(_reload_loop(dataset, reload_interval))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        reloader.cancel()
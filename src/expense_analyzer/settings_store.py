@@ -4,6 +4,9 @@ import json
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
+from expense_analyzer.categories import normalize_category
+from expense_analyzer.categorize import DEFAULT_RULES, CategoryRule
+
 
 @dataclass
 class BudgetSettings:
@@ -60,6 +63,50 @@ def load_settings(path: Path) -> BudgetSettings:
     )
 
 
+def load_category_rules(path: Path) -> list[CategoryRule]:
+    """
+    Category rules from the "category_rules" list of a settings file, followed
+    by DEFAULT_RULES. The first matching rule wins, so custom rules take
+    precedence over the built-in ones.
+
+    Each rule looks like {"category": "Food/Coffee", "keywords": ["starbucks"]};
+    "/" separates levels of nested categories (see categories.py), so the
+    category tree and --depth rollups work on ordinary statements.
+    Returns DEFAULT_RULES if the file or the key doesn't exist.
+    Raises ValueError for malformed rules.
+    """
+    if not path.exists():
+        return list(DEFAULT_RULES)
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    raw_rules = data.get("category_rules", []) if isinstance(data, dict) else []
+    if not isinstance(raw_rules, list):
+        raise ValueError(f"{path.name}: 'category_rules' must be a list")
+
+    rules: list[CategoryRule] = []
+    for i, item in enumerate(raw_rules, start=1):
+        category = item.get("category") if isinstance(item, dict) else None
+        keywords = item.get("keywords") if isinstance(item, dict) else None
+        if not isinstance(category, str) or not category.strip():
+            raise ValueError(f"{path.name}: category rule #{i} needs a 'category' string")
+        valid_keywords = isinstance(keywords, list) and all(isinstance(k, str) and k.strip() for k in keywords)
+        if not valid_keywords or not keywords:
+            raise ValueError(f"{path.name}: category rule #{i} needs a non-empty 'keywords' list of strings")
+        rules.append(CategoryRule(normalize_category(category), tuple(k.strip().lower() for k in keywords)))
+
+    return rules + list(DEFAULT_RULES)
+
+
 def save_settings(path: Path, settings: BudgetSettings) -> None:
+    """
+    Write budget settings, keeping other keys of an existing file (such as "category_rules").
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(asdict(settings), indent=2), encoding="utf-8")
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+    data.update(asdict(settings))
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
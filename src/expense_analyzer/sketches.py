@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import random
+from collections import defaultdict
+from typing import Any
+
+
+class HeavyHitters:
+    """
+    Weighted Misra-Gries summary for "top merchants by spend".
+
+    Keeps at most 2 x capacity counters. When full, the capacity-th largest
+    counter is subtracted from every counter and non-positive ones are dropped,
+    which costs O(capacity) once every ~capacity updates (amortized O(1)).
+    Estimates never exceed the true total and undercount by at most
+    total_weight / capacity. Two summaries merge by adding counters.
+    """
+
+    def __init__(self, capacity: int = 1000) -> None:
+        self.capacity = capacity
+        self.counters: dict[str, float] = {}
+        self.total = 0.0
+
+    def add(self, item: str, weight: float = 1.0) -> None:
+        self.total += weight
+        self.counters[item] = self.counters.get(item, 0.0) + weight
+        if len(self.counters) > 2 * self.capacity:
+            self._shrink()
+
+    def _shrink(self) -> None:
+        cut = sorted(self.counters.values(), reverse=True)[self.capacity]
+        self.counters = {k: v - cut for k, v in self.counters.items() if v > cut}
+
+    def merge(self, other: HeavyHitters) -> None:
+        self.total += other.total
+        for item, weight in other.counters.items():
+            self.counters[item] = self.counters.get(item, 0.0) + weight
+        if len(self.counters) > 2 * self.capacity:
+            self._shrink()
+
+    def top(self, n: int) -> list[tuple[str, float]]:
+        return sorted(self.counters.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"capacity": self.capacity, "total": self.total, "counters": self.counters}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> HeavyHitters:
+        sketch = cls(int(data["capacity"]))
+        sketch.total = float(data["total"])
+        sketch.counters = {str(k): float(v) for k, v in data["counters"].items()}
+        return sketch
+
+
+class QuantileSketch:
+    """
+    KLL-style quantile sketch.
+
+    Values enter level 0. When a level overflows it is sorted and every other
+    item (random offset) is promoted to the next level with twice the weight.
+    Level capacities shrink geometrically below the top level, so memory is
+    O(k) regardless of how many values are added. Sketches merge level by level.
+    """
+
+    def __init__(self, k: int = 200, seed: int = 0) -> None:
+        self.k = k
+        self.count = 0
+        self.levels: list[list[float]] = [[]]
+        self._rng = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - 1 - level
+        return max(int(self.k * (2 / 3) ** depth), 2)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.levels[0].append(value)
+        if len(self.levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def _compress(self) -> None:
+        for level in range(len(self.levels)):
+            if len(self.levels[level]) < self._capacity(level):
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append([])
+
+            items = sorted(self.levels[level])
+            # keep an odd leftover at this level so promoted weights stay exact
+            keep = [items.pop()] if len(items) % 2 else []
+            offset = self._rng.randint(0, 1)
+            self.levels[level + 1].extend(items[offset::2])
+            self.levels[level] = keep
+
+    def merge(self, other: QuantileSketch) -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.count += other.count
+        self._compress()
+
+    def quantile(self, q: float) -> float:
+        """
+        Approximate q-quantile (0 <= q <= 1). Raises ValueError if the sketch is empty.
+        """
+        weighted = sorted((v, 1 << level) for level, items in enumerate(self.levels) for v in items)
+        if not weighted:
+            raise ValueError("Quantile of an empty sketch")
+
+        target = q * sum(w for _v, w in weighted)
+        seen = 0
+        for value, weight in weighted:
+            seen += weight
+            if seen >= target:
+                return value
+        return weighted[-1][0]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"k": self.k, "count": self.count, "levels": self.levels}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> QuantileSketch:
+        sketch = cls(int(data["k"]))
+        sketch.count = int(data["count"])
+        sketch.levels = [[float(v) for v in items] for items in data["levels"]] or [[]]
+        return sketch
+
+
+class SpendingStats:
+    """
+    Bounded-memory spending statistics: top merchants by spend and
+    per-category amount quantiles. Fed one expense at a time and mergeable
+    across files or shards.
+    """
+
+    def __init__(self, merchant_capacity: int = 1000, k: int = 200) -> None:
+        self.merchants = HeavyHitters(merchant_capacity)
+        self.k = k
+        self.amounts: dict[str, QuantileSketch] = defaultdict(lambda: QuantileSketch(self.k))
+
+    def add(self, merchant: str, category: str, spent: float) -> None:
+        self.merchants.add(merchant, spent)
+        self.amounts[category].add(spent)
+
+    def merge(self, other: SpendingStats) -> None:
+        self.merchants.merge(other.merchants)
+        for category, sketch in other.amounts.items():
+            self.amounts[category].merge(sketch)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "merchants": self.merchants.to_dict(),
+            "k": self.k,
+            "amounts": {cat: sketch.to_dict() for cat, sketch in self.amounts.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SpendingStats:
+        stats = cls(k=int(data["k"]))
+        stats.merchants = HeavyHitters.from_dict(data["merchants"])
+        for cat, sketch in data["amounts"].items():
+            stats.amounts[cat] = QuantileSketch.from_dict(sketch)
+        return stats
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import os
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Mapping, Sequence
+
+from expense_analyzer.parser import REQUIRED_COLUMNS, Transaction, parse_transaction_row
+from expense_analyzer.analyze import RunningMonthlyTotals
+from expense_analyzer.categorize import DEFAULT_RULES, CategoryRule
+
+if TYPE_CHECKING:
+    from expense_analyzer.classifier import CategoryModel
+
+
+FINGERPRINT_BYTES = 4096
+
+
+@dataclass
+class FileState:
+    offset: int = 0
+    line_num: int = 1
+    fieldnames: list[str] = field(default_factory=list)
+    mtime_ns: int = 0  # when the bytes up to `offset` were read
+    fingerprint: str = ""  # see consumed_fingerprint
+
+
+def consumed_fingerprint(path: Path, offset: int) -> str:
+    """
+    Hash of the first and the last FINGERPRINT_BYTES before `offset`, i.e.
+    of bytes already read. Appending leaves it unchanged; rewriting the file
+    almost always changes it.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as f:
+        h.update(f.read(min(offset, FINGERPRINT_BYTES)))
+        if offset > FINGERPRINT_BYTES:
+            start = max(offset - FINGERPRINT_BYTES, FINGERPRINT_BYTES)
+            f.seek(start)
+            h.update(f.read(offset - start))
+    return h.hexdigest()
+
+
+def file_replaced(path: Path, state: FileState) -> bool:
+    """
+    Whether `path` is no longer the file that `state` was read from: it shrank,
+    or it was modified since and the bytes already read are different.
+    """
+    st = path.stat()
+    if st.st_size < state.offset:
+        return True
+    if not state.offset or st.st_mtime_ns == state.mtime_ns:
+        return False
+    return consumed_fingerprint(path, state.offset) != state.fingerprint
+
+
+def read_appended(path: Path, state: FileState) -> list[Transaction]:
+    """
+    Parse the complete rows appended to `path` since `state` and advance `state`.
+    A trailing partial line is left for the next call.
+    """
+    with path.open("rb") as f:
+        mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+        f.seek(state.offset)
+        chunk = f.read()
+
+    # only consume complete lines; a partial last line waits for the next call
+    end = chunk.rfind(b"\n")
+    if end < 0:
+        return []
+    chunk = chunk[: end + 1]
+
+    reader = csv.reader(chunk.decode("utf-8").splitlines())
+    fieldnames = state.fieldnames
+    line_num = state.line_num
+
+    if not fieldnames:
+        fieldnames = [name.strip() for name in next(reader, [])]
+        if not REQUIRED_COLUMNS.issubset(fieldnames):
+            raise ValueError(f"{path.name}: CSV must contain columns: {sorted(REQUIRED_COLUMNS)}")
+
+    rows: list[Transaction] = []
+    for values in reader:
+        line_num += 1
+        if not values:
+            continue
+        try:
+            rows.append(parse_transaction_row(dict(zip(fieldnames, values)), line_num))
+        except ValueError as e:
+            raise ValueError(f"{path.name}: {e}") from e
+
+    state.offset += len(chunk)
+    state.line_num = line_num
+    state.fieldnames = fieldnames
+    state.mtime_ns = mtime_ns
+    state.fingerprint = consumed_fingerprint(path, state.offset)
+    return rows
+
+
+class StatementWatcher:
+    """
+    Tail a directory of statement CSVs and keep running monthly totals.
+
+    Each file's byte offset is remembered, so a poll only parses rows that
+    were appended since the previous poll. A trailing partial line is left
+    for the next poll. If a file disappears or is rewritten (it shrank, or
+    the bytes already read changed, see `file_replaced`), everything is
+    rebuilt from scratch.
+
+    A file with a bad row is skipped (its error is kept in `errors`) and is
+    retried on every poll; its offset only moves once its rows are counted,
+    so no rows are lost while it is broken.
+    """
+
+    def __init__(
+        self,
+        statement_dir: Path,
+        pattern: str = "*.csv",
+        aliases: Mapping[str, str] | None = None,
+        model: CategoryModel | None = None,
+        rules: Sequence[CategoryRule] = DEFAULT_RULES,
+    ) -> None:
+        self.statement_dir = statement_dir
+        self.pattern = pattern
+        self.aliases = aliases
+        self.model = model
+        self.rules = rules
+        self.totals = RunningMonthlyTotals(aliases, model, rules)
+        self.errors: dict[Path, str] = {}
+        self._files: dict[Path, FileState] = {}
+
+    def poll(self) -> set[str]:
+        """
+        Parse newly appended rows and return the set of months whose totals changed.
+        Months in the returned set that are no longer in `totals` were removed by a rebuild.
+        """
+        paths = sorted(self.statement_dir.glob(self.pattern))
+
+        if any(p not in paths for p in self._files) or any(
+            file_replaced(p, state) for p, state in self._files.items()
+        ):
+            stale = set(self.totals.months())
+            self._files.clear()
+            self.errors.clear()
+            self.totals = RunningMonthlyTotals(self.aliases, self.model, self.rules)
+            return stale | self.poll()
+
+        new_rows: list[Transaction] = []
+        advanced: dict[Path, FileState] = {}
+        for path in paths:
+            state = self._files.get(path) or FileState()
+            if path.stat().st_size <= state.offset:
+                continue
+            pending = replace(state)  # only committed once the rows are in the totals
+            try:
+                new_rows.extend(read_appended(path, pending))
+            except ValueError as e:
+                self.errors[path] = str(e)
+                continue
+            self.errors.pop(path, None)
+            advanced[path] = pending
+
+        touched = self.totals.add(new_rows) if new_rows else set()
+        self._files.update(advanced)
+        return touched
@@ -1,7 +1,7 @@
 from datetime import date
 
 from expense_analyzer.parser import Transaction
-from expense_analyzer.analyze import detect_unusual_spending
+from expense_analyzer.analyze import detect_unusual_spending, detect_unusual_spending_rolling
 
 
 def test_detect_unusual_spending_flags_large_outlier() -> None:
@@ -16,3 +16,18 @@ def test_detect_unusual_spending_flags_large_outlier() -> None:
     jan = alerts.get("2026-01", [])
     assert len(jan) == 1
     assert jan[0].amount == 200.0
+
+
+def test_detect_unusual_spending_rolling_uses_previous_months() -> None:
+    txns = [
+        Transaction(date(2026, 1, 5), "Whole Foods", -40.0),
+        Transaction(date(2026, 1, 12), "Whole Foods", -40.0),
+        Transaction(date(2026, 2, 5), "Whole Foods", -40.0),
+        Transaction(date(2026, 3, 1), "Whole Foods", -150.0),
+        Transaction(date(2026, 6, 1), "Whole Foods", -150.0),
+    ]
+
+    alerts = detect_unusual_spending_rolling(txns, window_months=2, min_samples=3)
+    assert [a.posted_date for a in alerts.get("2026-03", [])] == ["2026-03-01"]
+    # January and February have left the 2-month window by June
+    assert alerts.get("2026-06", []) == []
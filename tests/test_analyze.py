@@ -1,7 +1,7 @@
 from datetime import date
 
 from expense_analyzer.parser import Transaction
-from expense_analyzer.analyze import build_monthly_summary
+from expense_analyzer.analyze import build_monthly_summary, detect_recurring_charges
 
 
 def test_build_monthly_summary_math() -> None:
@@ -17,3 +17,30 @@ def test_build_monthly_summary_math() -> None:
     assert s.income_total == 1000.0
     assert s.expense_total == 405.0
     assert s.net_total == 595.0
+
+
+def test_detect_recurring_charges_monthly() -> None:
+    txns = [
+        Transaction(posted_date=date(2026, 1, 13), description="NETFLIX", amount=-15.49),
+        Transaction(posted_date=date(2026, 2, 13), description="NETFLIX", amount=-15.49),
+        Transaction(posted_date=date(2026, 3, 13), description="NETFLIX", amount=-16.99),
+        Transaction(posted_date=date(2026, 1, 20), description="STARBUCKS", amount=-5.0),
+        Transaction(posted_date=date(2026, 1, 21), description="STARBUCKS", amount=-5.0),
+    ]
+
+    charges = detect_recurring_charges(txns)
+    assert len(charges) == 1
+    assert charges[0].merchant == "NETFLIX"
+    assert charges[0].cadence == "monthly"
+    assert charges[0].next_expected == "2026-04-13"
+
+
+def test_recurring_next_expected_clamps_to_month_end() -> None:
+    yearly = [date(2022, 2, 28), date(2023, 2, 28), date(2024, 2, 29)]
+    monthly = [date(2026, 1, 31), date(2026, 2, 28), date(2026, 3, 31)]
+    txns = [Transaction(posted_date=d, description="DOMAIN", amount=-20.0) for d in yearly]
+    txns += [Transaction(posted_date=d, description="GYM", amount=-40.0) for d in monthly]
+
+    by_merchant = {c.merchant: c for c in detect_recurring_charges(txns)}
+    assert by_merchant["DOMAIN"].next_expected == "2025-02-28"
+    assert by_merchant["GYM"].next_expected == "2026-04-30"
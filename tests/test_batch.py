@@ -0,0 +1,39 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from expense_analyzer.batch import load_manifest, run_batch
+
+
+def test_batch_isolates_failing_tenants(tmp_path: Path) -> None:
+    (tmp_path / "good.csv").write_text(
+        "date,description,amount\n2026-01-02,STARBUCKS,-5.00\n2026-01-03,PAYROLL,1000.00\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "bad.csv").write_text("date,description,amount\nnot-a-date,STARBUCKS,-5.00\n", encoding="utf-8")
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(
+        json.dumps({"tenants": [{"name": "good", "statements": ["good.csv"]}, {"name": "bad", "statements": ["bad.csv"]}]}),
+        encoding="utf-8",
+    )
+
+    tenants = load_manifest(manifest, tmp_path / "out")
+    good, bad = run_batch(tenants, workers=2)
+
+    assert good.ok and good.transactions == 2 and good.months == 1
+    assert (tmp_path / "out" / "good" / "alerts.json").exists()
+    assert not bad.ok and "bad.csv" in bad.error
+    assert (tmp_path / "out" / "bad" / "error.txt").exists()
+
+
+def test_load_manifest_rejects_non_string_paths(tmp_path: Path) -> None:
+    manifest = tmp_path / "manifest.json"
+    for tenant in (
+        {"name": "a", "statements": ["a.csv"], "out_dir": 5},
+        {"name": "a", "statements": ["a.csv"], "settings": ["s.json"]},
+        {"name": "a", "statements": [{"path": "a.csv"}]},
+    ):
+        manifest.write_text(json.dumps([tenant]), encoding="utf-8")
+        with pytest.raises(ValueError, match="Tenant a"):
+            load_manifest(manifest, tmp_path / "out")
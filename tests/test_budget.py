@@ -0,0 +1,33 @@
+from datetime import date
+
+from expense_analyzer.analyze import Summary
+from expense_analyzer.budget import evaluate_budgets
+from expense_analyzer.settings_store import BudgetSettings
+
+
+def test_evaluate_budgets_projects_current_month() -> None:
+    summaries = {
+        "2026-01": Summary("2026-01", 2500.0, 100.0, 2400.0, {"Coffee": 100.0}),
+        "2026-02": Summary("2026-02", 0.0, 40.0, -40.0, {"Coffee": 40.0}),
+    }
+    settings = BudgetSettings(income_target=3000.0, savings_goal=500.0, category_budgets={"Coffee": 60.0, "Rent": 800.0})
+
+    budgets = evaluate_budgets(summaries, settings, as_of=date(2026, 2, 7))
+
+    jan = {c.category: c for c in budgets["2026-01"].categories}
+    assert jan["Coffee"].remaining == -40.0
+    assert jan["Coffee"].projected == 100.0
+    assert jan["Rent"].spent == 0.0
+
+    feb = budgets["2026-02"]
+    assert (feb.days_elapsed, feb.days_in_month) == (7, 28)
+    assert feb.projected_expenses == 160.0
+
+
+def test_evaluate_budgets_at_parent_level() -> None:
+    summaries = {"2026-01": Summary("2026-01", 0.0, 50.0, -50.0, {"Food/Coffee": 20.0, "Food/Groceries": 30.0})}
+    settings = BudgetSettings(income_target=0.0, savings_goal=0.0, category_budgets={"Food": 40.0})
+
+    categories = evaluate_budgets(summaries, settings, as_of=date(2026, 3, 1), depth=1)["2026-01"].categories
+
+    assert [(c.category, c.spent, c.remaining) for c in categories] == [("Food", 50.0, -10.0)]
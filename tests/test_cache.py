@@ -0,0 +1,98 @@
+import json
+import os
+import pickle
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from expense_analyzer.cache import STATS_CODEC, AnalysisCache
+from expense_analyzer.cli import app
+from expense_analyzer.sketches import SpendingStats
+
+
+def test_cache_hits_until_input_changes(tmp_path: Path) -> None:
+    csv_path = tmp_path / "bank.csv"
+    csv_path.write_text("date,description,amount\n2026-01-02,STARBUCKS,-5.00\n", encoding="utf-8")
+    cache = AnalysisCache(tmp_path / "cache")
+    calls = []
+
+    def compute() -> dict:
+        calls.append(1)
+        return {"rows": len(calls)}
+
+    assert cache.get_or_compute("summaries", [csv_path], {"period": "month"}, compute) == {"rows": 1}
+    assert cache.get_or_compute("summaries", [csv_path], {"period": "month"}, compute) == {"rows": 1}
+    assert cache.get_or_compute("summaries", [csv_path], {"period": "year"}, compute) == {"rows": 2}
+
+    csv_path.write_text("date,description,amount\n2026-01-02,STARBUCKS,-6.00\n", encoding="utf-8")
+    assert cache.get_or_compute("summaries", [csv_path], {"period": "month"}, compute) == {"rows": 3}
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    csv_path = tmp_path / "bank.csv"
+    csv_path.write_text("x", encoding="utf-8")
+    cache = AnalysisCache(tmp_path / "cache", max_bytes=2500)
+
+    for i in range(3):
+        cache.get_or_compute("blob", [csv_path], {"i": i}, lambda: "x" * 1000)
+        for entry in (tmp_path / "cache").glob("*.entry"):
+            st = entry.stat()
+            os.utime(entry, ns=(st.st_atime_ns, st.st_mtime_ns - 1_000_000_000))  # age existing entries
+
+    assert len(list((tmp_path / "cache").glob("*.entry"))) == 2
+    calls = []
+    cache.get_or_compute("blob", [csv_path], {"i": 0}, lambda: calls.append(1) or "")
+    assert calls == [1]  # the oldest entry was evicted
+
+
+def test_cached_summary_matches_uncached_with_aliases(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "user-cache"))
+    Path("bank.csv").write_text("date,description,amount\n2026-01-02,SBUX STORE 1,-11.00\n", encoding="utf-8")
+    Path("a.json").write_text(json.dumps({"version": 1, "aliases": {"SBUX STORE 1": "STARBUCKS"}}), encoding="utf-8")
+    args = ["summary", "bank.csv", "--aliases", "a.json"]
+
+    uncached = CliRunner().invoke(app, [*args, "--no-cache"])
+    cached = [CliRunner().invoke(app, args) for _ in range(2)]  # miss, then hit
+
+    assert "Coffee" in uncached.output
+    assert [r.output for r in cached] == [uncached.output, uncached.output]
+
+
+def test_cache_lives_outside_the_working_directory_and_never_unpickles(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "user-cache"))
+    Path("bank.csv").write_text("date,description,amount\n2026-01-02,STARBUCKS,-5.00\n", encoding="utf-8")
+
+    first = CliRunner().invoke(app, ["alerts", "bank.csv"])
+    assert first.exit_code == 0, first.output
+    entries = list((tmp_path / "user-cache" / "expense-analyzer").glob("*.entry"))
+    assert {p.name.split("-", 1)[0] for p in entries} == {"alerts", "rows"}
+    assert not Path("data").exists()
+
+    for entry in entries:  # a planted pickle is rejected and recomputed, not executed
+        entry.write_bytes(pickle.dumps(ValueError("planted")))
+    second = CliRunner().invoke(app, ["alerts", "bank.csv"])
+    assert second.output == first.output
+
+
+def test_stats_sketches_round_trip_through_the_cache(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "user-cache"))
+    rows = "".join(f"2026-01-{day:02d},STARBUCKS,-{day}.50\n" for day in range(1, 29))
+    Path("bank.csv").write_text("date,description,amount\n" + rows + "2026-01-30,RENT,-900.00\n", encoding="utf-8")
+
+    stats = SpendingStats(merchant_capacity=10, k=8)
+    for day in range(1, 29):
+        stats.add("STARBUCKS", "Coffee", day + 0.5)
+    restored = STATS_CODEC.decode(STATS_CODEC.encode(stats))
+    assert restored.merchants.top(1) == stats.merchants.top(1)
+    assert restored.amounts["Coffee"].count == 28
+    assert restored.amounts["Coffee"].quantile(0.5) == stats.amounts["Coffee"].quantile(0.5)
+
+    uncached = CliRunner().invoke(app, ["stats", "bank.csv", "--no-cache"])
+    cached = [CliRunner().invoke(app, ["stats", "bank.csv"]) for _ in range(2)]  # miss, then hit
+
+    assert uncached.exit_code == 0, uncached.output
+    assert [r.output for r in cached] == [uncached.output, uncached.output]
+    assert list((tmp_path / "user-cache" / "expense-analyzer").glob("stats-*.entry"))
@@ -0,0 +1,63 @@
+import json
+from datetime import date
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from expense_analyzer import canonical
+from expense_analyzer.canonical import build_alias_map, canonical_form, load_alias_map, save_alias_map
+from expense_analyzer.categorize import enrich_many
+from expense_analyzer.cli import app
+from expense_analyzer.parser import Transaction
+
+
+def test_build_alias_map_merges_variants_into_most_frequent() -> None:
+    counts = {"AMAZON": 5, "AMZN MKTP US*2K3": 2, "AMAZON.COM*AB": 1, "AMAZON PRIME": 3, "STARBUCKS": 4}
+    aliases = build_alias_map(counts)
+    assert aliases == {"AMZN MKTP US*2K3": "AMAZON", "AMAZON.COM*AB": "AMAZON", "AMAZON PRIME": "AMAZON"}
+
+
+def test_canonical_form_drops_processor_prefixes() -> None:
+    assert canonical_form("SQ *BLUE BOTTLE") == "BLUE BOTTLE"
+    assert canonical_form("TST* JOES PIZZA") == "JOES PIZZA"
+    assert canonical_form("PAYPAL *NETFLIX") == "NETFLIX"
+    assert canonical_form("AMZN MKTP US*2K3") == "AMAZON MARKETPLACE US"
+
+
+def test_large_blocks_are_capped_not_dropped(monkeypatch) -> None:
+    monkeypatch.setattr(canonical, "MAX_BLOCK_SIZE", 20)
+    counts = {"AMAZON": 50, "AMZN MKTP US*2K3": 2}
+    counts.update({f"AMAZON STORE {a}{b}": 1 for a in "ABCDEFGHIJ" for b in "ABCDEFGHIJ"})
+    capped = []
+
+    aliases = build_alias_map(counts, on_capped=lambda merchant, size: capped.append((merchant, size)))
+    assert aliases["AMZN MKTP US*2K3"] == "AMAZON"
+    assert capped and capped[0][0] == "AMAZON"
+
+
+def test_alias_map_roundtrip_and_enrich(tmp_path: Path) -> None:
+    path = tmp_path / "aliases.json"
+    save_alias_map(path, {"AMZN MKTP US*2K3": "AMAZON GROCERY"})
+    aliases = load_alias_map(path)
+    assert load_alias_map(tmp_path / "missing.json") == {}
+
+    txns = [Transaction(posted_date=date(2026, 1, 2), description="AMZN MKTP US*2K3", amount=-20.0)]
+    merchants, categories = enrich_many(txns, aliases=aliases)
+    assert merchants == ["AMAZON GROCERY"]
+    assert categories == ["Groceries"]  # falls back to the canonical name's category
+
+
+def test_report_budget_and_forecast_accept_aliases(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    rows = "".join(f"2026-0{m}-02,SBUX STORE 1,-11.00\n" for m in (1, 2, 3))
+    Path("bank.csv").write_text("date,description,amount\n" + rows, encoding="utf-8")
+    Path("a.json").write_text(json.dumps({"version": 1, "aliases": {"SBUX STORE 1": "STARBUCKS"}}), encoding="utf-8")
+
+    result = CliRunner().invoke(app, ["report", "bank.csv", "--aliases", "a.json", "--no-cache"])
+    assert result.exit_code == 0, result.output
+    assert json.loads(Path("reports/summary_2026-01.json").read_text(encoding="utf-8"))["by_category"] == {"Coffee": 11.0}
+
+    for command in (["budget", "bank.csv"], ["forecast", "bank.csv", "--as-of", "2026-03-15"]):
+        result = CliRunner().invoke(app, [*command, "--aliases", "a.json"])
+        assert result.exit_code == 0, result.output
+        assert "Coffee" in result.output
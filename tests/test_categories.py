@@ -0,0 +1,88 @@
+import json
+from datetime import date
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from expense_analyzer.analyze import Summary, build_monthly_summary
+from expense_analyzer.categories import CategoryTree, summary_at_depth
+from expense_analyzer.categorize import DEFAULT_RULES, CategoryRule
+from expense_analyzer.cli import app
+from expense_analyzer.parser import Transaction
+from expense_analyzer.settings_store import load_category_rules, load_settings, save_settings
+
+
+def test_tree_rolls_leaf_totals_up_to_parents() -> None:
+    tree = CategoryTree({"Food/Coffee": 12.5, "Food/Groceries/Produce": 30.0, "Food": 2.0, "Rent": 800.0})
+
+    assert tree.total("Food") == 44.5
+    assert tree.total("Food / Groceries") == 30.0
+    assert tree.nodes["Food"].children == ("Food/Coffee", "Food/Groceries")
+    assert [n.path for n in tree.walk()] == ["Rent", "Food", "Food/Groceries", "Food/Groceries/Produce", "Food/Coffee"]
+    assert tree.at_depth(1) == {"Rent": 800.0, "Food": 44.5}
+    assert tree.at_depth(2) == {"Rent": 800.0, "Food/Groceries": 30.0, "Food/Coffee": 12.5, "Food": 2.0}
+
+
+def test_summary_at_depth_keeps_totals() -> None:
+    s = Summary("2026-01", 0.0, 20.0, -20.0, {"Food/Coffee": 5.0, "Food/Groceries": 15.0})
+
+    assert summary_at_depth(s, None) is s
+    assert summary_at_depth(s, 1).by_category == {"Food": 20.0}
+
+
+def test_category_rules_from_settings_build_a_tree(tmp_path: Path) -> None:
+    settings_path = tmp_path / "settings.json"
+    settings_path.write_text(
+        json.dumps(
+            {
+                "category_budgets": {"Food": 300},
+                "category_rules": [
+                    {"category": "Food / Coffee", "keywords": ["Starbucks"]},
+                    {"category": "Food/Groceries", "keywords": ["whole foods"]},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    rules = load_category_rules(settings_path)
+    txns = [
+        Transaction(date(2026, 1, 3), "STARBUCKS #123", -5.0),
+        Transaction(date(2026, 1, 4), "WHOLE FOODS MARKET", -40.0),
+    ]
+
+    assert rules[0] == CategoryRule("Food/Coffee", ("starbucks",))
+    assert rules[2:] == list(DEFAULT_RULES)
+    by_category = build_monthly_summary(txns, rules=rules)["2026-01"].by_category
+    assert by_category == {"Food/Coffee": 5.0, "Food/Groceries": 40.0}
+    assert CategoryTree(by_category).at_depth(1) == {"Food": 45.0}
+
+    save_settings(settings_path, load_settings(settings_path))
+    assert load_category_rules(settings_path) == rules
+
+
+def test_category_rules_are_validated(tmp_path: Path) -> None:
+    settings_path = tmp_path / "settings.json"
+    assert load_category_rules(settings_path) == list(DEFAULT_RULES)
+
+    settings_path.write_text(json.dumps({"category_rules": [{"category": "Food", "keywords": "cafe"}]}))
+    with pytest.raises(ValueError, match="keywords"):
+        load_category_rules(settings_path)
+
+
+def test_cli_summary_uses_rules_option(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "t.csv").write_text(
+        "date,description,amount\n2026-01-03,STARBUCKS #1,-5.00\n2026-01-04,BLUE BOTTLE,-7.00\n", encoding="utf-8"
+    )
+    (tmp_path / "settings.json").write_text(
+        json.dumps({"category_rules": [{"category": "Food/Coffee", "keywords": ["starbucks", "blue bottle"]}]})
+    )
+
+    result = CliRunner().invoke(
+        app, ["summary", "t.csv", "--rules", "settings.json", "--depth", "1", "--no-cache"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Food" in result.output and "12.00" in result.output
+    assert "Coffee" not in result.output
@@ -1,5 +1,5 @@
 from expense_analyzer.parser import Transaction
-from expense_analyzer.categorize import categorize_transaction
+from expense_analyzer.categorize import categorize_transaction, enrich_many
 from datetime import date
 
 
@@ -11,3 +11,14 @@ def test_income_category_by_amount() -> None:
 def test_keyword_category() -> None:
     txn = Transaction(posted_date=date(2026, 1, 2), description="STARBUCKS #1234", amount=-5.0)
     assert categorize_transaction(txn) == "Coffee"
+
+
+def test_enrich_many_matches_single_categorization() -> None:
+    txns = [
+        Transaction(posted_date=date(2026, 1, 2), description="STARBUCKS #1234", amount=-5.0),
+        Transaction(posted_date=date(2026, 1, 3), description="Salary", amount=100.0),
+        Transaction(posted_date=date(2026, 1, 4), description="STARBUCKS #1234", amount=-4.0),
+    ]
+    merchants, categories = enrich_many(txns)
+    assert merchants == ["STARBUCKS", "SALARY", "STARBUCKS"]
+    assert categories == [categorize_transaction(t) for t in txns]
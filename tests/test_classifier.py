@@ -0,0 +1,95 @@
+from datetime import date
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from expense_analyzer.analyze import detect_unusual_spending
+from expense_analyzer.categorize import enrich_many
+from expense_analyzer.classifier import load_labeled_export, load_model, save_model, train_model
+from expense_analyzer.cli import app
+from expense_analyzer.parser import Transaction
+from expense_analyzer.server import Dataset
+
+
+def test_train_predict_and_roundtrip(tmp_path: Path) -> None:
+    export = tmp_path / "export.csv"
+    export.write_text(
+        "date,amount,merchant,category,description\n"
+        "2026-01-02,-40.00,SHELL OIL,Fuel,SHELL OIL 123\n"
+        "2026-01-03,-35.00,CHEVRON STATION,Fuel,CHEVRON STATION\n"
+        "2026-01-04,-12.00,CHIPOTLE,Dining,CHIPOTLE 55\n"
+        "2026-01-05,-18.00,OLIVE GARDEN,Dining,OLIVE GARDEN\n"
+        "2026-01-06,-9.00,MYSTERY,Uncategorized,MYSTERY\n"
+        "2026-01-08,2500.00,SALARY,Income,SALARY\n",
+        encoding="utf-8",
+    )
+    samples = load_labeled_export(export)
+    assert len(samples) == 4
+
+    path = tmp_path / "model.bin"
+    save_model(path, train_model(samples))
+    model = load_model(path)
+
+    assert model.classes == ["Dining", "Fuel"]
+    assert model.predict("SHELL OIL STATION") == "Fuel"
+    assert model.predict("CHIPOTLE MEXICAN GRILL") == "Dining"
+
+    txns = [
+        Transaction(posted_date=date(2026, 2, 1), description="SHELL OIL 999", amount=-30.0),
+        Transaction(posted_date=date(2026, 2, 2), description="STARBUCKS", amount=-5.0),
+    ]
+    _merchants, categories = enrich_many(txns, model=model)
+    assert categories == ["Fuel", "Coffee"]  # keyword rules still win
+
+
+def test_every_categorizing_command_accepts_model(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    save_model(Path("model.bin"), train_model([("SHELL OIL", "Fuel"), ("CHIPOTLE", "Dining")]))
+    rows = "".join(f"2026-0{m}-05,SHELL OIL,-40.00\n" for m in (1, 2, 3, 4))
+    Path("bank.csv").write_text("date,description,amount\n" + rows + "2026-04-06,SHELL OIL 9,-400.00\n", encoding="utf-8")
+
+    commands = [
+        ["summary", "bank.csv", "--no-cache"],
+        ["compare", "bank.csv"],
+        ["recurring", "bank.csv"],
+        ["stats", "bank.csv"],
+        ["budget", "bank.csv"],
+        ["forecast", "bank.csv", "--as-of", "2026-04-15"],
+        ["alerts", "bank.csv", "--no-cache", "--min-samples", "2", "--multiplier", "1.5"],
+        ["preview", "bank.csv"],
+    ]
+    for command in commands:
+        result = CliRunner().invoke(app, [*command, "--model", "model.bin"])
+        assert result.exit_code == 0, (command, result.output)
+        assert "Fuel" in result.output, command
+
+    Path("statements").mkdir()
+    Path("statements/bank.csv").write_text(Path("bank.csv").read_text(encoding="utf-8"), encoding="utf-8")
+    Path("manifest.json").write_text('[{"name": "t", "statements": ["bank.csv"]}]', encoding="utf-8")
+    written = {
+        ("report", "bank.csv", "--no-cache"): "reports/summary_2026-01.json",
+        ("export", "bank.csv", "--out", "export.csv"): "export.csv",
+        ("watch", "statements", "--once", "--out-dir", "watched"): "watched/summary_2026-01.json",
+        ("batch", "manifest.json", "--out-dir", "tenants", "--workers", "1"): "tenants/t/summaries.json",
+    }
+    for command, out in written.items():
+        result = CliRunner().invoke(app, [*command, "--model", "model.bin"])
+        assert result.exit_code == 0, (command, result.output)
+        assert "Fuel" in Path(out).read_text(encoding="utf-8"), command
+
+    txns = [Transaction(posted_date=date(2026, 1, 5), description="SHELL OIL 1", amount=-40.0)] * 3
+    txns.append(Transaction(posted_date=date(2026, 1, 6), description="SHELL OIL 2", amount=-400.0))
+    model = load_model(Path("model.bin"))
+    (alert,) = detect_unusual_spending(txns, multiplier=1.5, min_samples=2, model=model)["2026-01"]
+    assert alert.category == "Fuel"
+    assert "Fuel" in Dataset([Path("bank.csv")], model=model).summaries["2026-01"].by_category  # serve
+
+
+def test_truncated_model_raises_value_error(tmp_path: Path) -> None:
+    path = tmp_path / "model.bin"
+    save_model(path, train_model([("SHELL OIL", "Fuel"), ("CHIPOTLE", "Dining")]))
+    path.write_bytes(path.read_bytes()[:-5])
+
+    with pytest.raises(ValueError, match="Truncated or corrupt"):
+        load_model(path)
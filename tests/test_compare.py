@@ -0,0 +1,37 @@
+from expense_analyzer.analyze import Summary
+from expense_analyzer.compare import compare_months, shift_month
+
+
+def test_shift_month_crosses_years() -> None:
+    assert shift_month("2026-01", -1) == "2025-12"
+    assert shift_month("2026-03", -12) == "2025-03"
+
+
+def test_compare_months_mom_and_yoy() -> None:
+    summaries = {
+        "2025-02": Summary("2025-02", 0.0, 50.0, -50.0, {"Coffee": 50.0}),
+        "2026-01": Summary("2026-01", 1000.0, 80.0, 920.0, {"Coffee": 80.0}),
+        "2026-02": Summary("2026-02", 1000.0, 130.1, 869.9, {"Coffee": 100.1, "Rent": 30.0}),
+    }
+
+    mom = compare_months(summaries, "mom")
+    assert [c.month for c in mom] == ["2025-02", "2026-01", "2026-02"]
+    deltas = {d.category: d for d in mom[2].categories}
+    assert deltas["Coffee"].delta == 20.1
+    assert deltas["Coffee"].pct_change == 25.1
+    assert deltas["Rent"].pct_change is None
+    assert (deltas["Rent"].new, deltas["Coffee"].new) == (True, False)
+    assert mom[2].expenses.delta == 50.1
+
+    yoy = compare_months(summaries, "yoy")
+    assert [(c.month, c.baseline) for c in yoy] == [("2025-02", "2024-02"), ("2026-01", "2025-01"), ("2026-02", "2025-02")]
+    assert yoy[2].expenses.new is False
+
+
+def test_compare_months_against_missing_baseline_month() -> None:
+    summaries = {"2026-03": Summary("2026-03", 0.0, 40.0, -40.0, {"Coffee": 40.0})}
+
+    (c,) = compare_months(summaries, "mom")
+    assert c.baseline == "2026-02"
+    assert (c.expenses.previous, c.expenses.delta, c.expenses.new) == (0.0, 40.0, True)
+    assert [(d.category, d.delta, d.new) for d in c.categories] == [("Coffee", 40.0, True)]
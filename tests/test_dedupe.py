@@ -0,0 +1,47 @@
+from datetime import date
+from pathlib import Path
+
+from expense_analyzer.parser import Transaction
+from expense_analyzer import dedupe
+from expense_analyzer.dedupe import dedupe_statement_files, dedupe_transactions
+
+
+def test_dedupe_keeps_same_day_repeats_within_a_statement() -> None:
+    first = [
+        Transaction(date(2026, 1, 2), "STARBUCKS #1234", -5.0),
+        Transaction(date(2026, 1, 2), "STARBUCKS #1234", -5.0),
+        Transaction(date(2026, 1, 3), "UBER", -14.2),
+    ]
+    # overlapping export: repeats one coffee and the uber ride, adds a new row
+    second = [
+        Transaction(date(2026, 1, 2), "POS STARBUCKS #1234", -5.0),
+        Transaction(date(2026, 1, 3), "UBER", -14.2),
+        Transaction(date(2026, 1, 4), "NETFLIX", -15.49),
+    ]
+
+    result = dedupe_transactions([first, second], source_names=["a.csv", "b.csv"])
+    assert len(result.transactions) == 4
+    assert [(d.source, d.merchant) for d in result.dropped] == [("b.csv", "STARBUCKS"), ("b.csv", "UBER")]
+
+
+def test_dedupe_statement_files_streams_by_month(tmp_path: Path) -> None:
+    a = tmp_path / "a.csv"
+    b = tmp_path / "b.csv"
+    a.write_text("date,description,amount\n2026-01-30,RENT,-800.00\n2026-02-01,UBER,-10.00\n", encoding="utf-8")
+    b.write_text("date,description,amount\n2026-02-01,UBER,-10.00\n2026-02-03,UBER,-10.00\n", encoding="utf-8")
+
+    dropped = []
+    kept = list(dedupe_statement_files([a, b], on_drop=dropped.append))
+    assert [str(t.posted_date) for t in kept] == ["2026-01-30", "2026-02-01", "2026-02-03"]
+    assert len(dropped) == 1
+
+
+def test_dedupe_statement_files_spills_in_batches(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(dedupe, "SPILL_BUFFER_ROWS", 2)
+    a = tmp_path / "a.csv"
+    b = tmp_path / "b.csv"
+    a.write_text("date,description,amount\n" + "".join(f"2020-{m:02d}-01,RENT,-800.00\n" for m in range(1, 13)), encoding="utf-8")
+    b.write_text("date,description,amount\n2020-12-01,RENT,-800.00\n2021-01-01,RENT,-800.00\n", encoding="utf-8")
+
+    kept = list(dedupe_statement_files([a, b]))
+    assert len(kept) == 13
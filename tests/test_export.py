@@ -0,0 +1,42 @@
+from datetime import date
+from pathlib import Path
+
+from expense_analyzer.categorize import RULESET_VERSION
+from expense_analyzer.parser import Transaction
+from expense_analyzer.export import load_enriched_columnar, write_enriched_columnar, write_enriched_csv
+
+
+TXNS = [
+    Transaction(posted_date=date(2026, 1, 2), description="STARBUCKS #1234", amount=-6.45),
+    Transaction(posted_date=date(2026, 1, 8), description="SALARY", amount=2500.0),
+]
+
+
+def test_write_enriched_csv(tmp_path: Path) -> None:
+    out = tmp_path / "export.csv"
+    assert write_enriched_csv(out, TXNS) == 2
+    lines = out.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "date,amount,merchant,category,description,ruleset"
+    assert lines[1] == f"2026-01-02,-6.45,STARBUCKS,Coffee,STARBUCKS #1234,{RULESET_VERSION}"
+
+
+def test_columnar_round_trip(tmp_path: Path) -> None:
+    out = tmp_path / "export.col"
+    write_enriched_columnar(out, TXNS)
+    cols = load_enriched_columnar(out)
+
+    assert cols.dates == [date(2026, 1, 2), date(2026, 1, 8)]
+    assert cols.amounts == [-6.45, 2500.0]
+    assert cols.merchants == ["STARBUCKS", "SALARY"]
+    assert cols.categories == ["Coffee", "Income"]
+    assert cols.descriptions == ["STARBUCKS #1234", "SALARY"]
+
+
+def test_columnar_keeps_nul_in_strings_and_accepts_iterables(tmp_path: Path) -> None:
+    out = tmp_path / "export.col"
+    txns = [Transaction(posted_date=date(2026, 1, 3), description="ACME\0CORP", amount=-9.0), *TXNS]
+    assert write_enriched_columnar(out, iter(txns)) == 3
+
+    cols = load_enriched_columnar(out)
+    assert cols.descriptions == ["ACME\0CORP", "STARBUCKS #1234", "SALARY"]
+    assert cols.amounts == [-9.0, -6.45, 2500.0]
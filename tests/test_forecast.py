@@ -0,0 +1,45 @@
+from datetime import date
+
+from expense_analyzer.analyze import Summary
+from expense_analyzer.forecast import forecast_series, forecast_spending, project_month_end
+
+
+def test_forecast_series_trend_and_seasonal() -> None:
+    trend, short = forecast_series(["a", "b"], [[10.0, 20.0, 30.0], [5.0, 0.0, 0.0]], horizon=2)
+    assert (trend.method, trend.values) == ("trend", [40.0, 50.0])
+    assert short.values == [0.0, 0.0]  # clamped at zero
+
+    # flat 100 with a December spike, two full years starting in January
+    row = [100.0 + (50.0 if t % 12 == 11 else 0.0) for t in range(24)]
+    (seasonal,) = forecast_series(["c"], [row], horizon=12, first_month_index=0)
+    assert seasonal.method == "seasonal"
+    assert round(seasonal.values[11] - seasonal.values[0], 2) == 50.0
+
+
+def test_forecast_spending_and_month_end() -> None:
+    summaries = {
+        "2026-01": Summary("2026-01", 1000.0, 300.0, 700.0, {"Rent": 300.0}),
+        "2026-02": Summary("2026-02", 1000.0, 300.0, 700.0, {"Rent": 300.0}),
+        "2026-03": Summary("2026-03", 1000.0, 300.0, 700.0, {"Rent": 300.0}),
+        "2026-04": Summary("2026-04", 1000.0, 50.0, 950.0, {"Rent": 50.0}),  # partial month
+    }
+    fc = forecast_spending(summaries, horizon=2, as_of=date(2026, 4, 10))
+    assert fc.months == ["2026-04", "2026-05"]
+    assert fc.categories[0].values == [300.0, 300.0]
+
+    end = project_month_end(summaries, fc, as_of=date(2026, 4, 10))
+    assert end.expenses == 250.0  # 50 so far + 300 x 20/30 remaining
+    assert end.net == 750.0
+
+
+def test_forecast_from_stale_data_starts_at_as_of() -> None:
+    months = ["2025-10", "2025-11", "2025-12"]
+    summaries = {m: Summary(m, 1000.0, 100.0 * i, 0.0, {"Rent": 100.0 * i}) for i, m in enumerate(months, 1)}
+    as_of = date(2026, 4, 15)  # the data stops three full months earlier
+
+    fc = forecast_spending(summaries, horizon=2, as_of=as_of)
+    assert fc.months == ["2026-04", "2026-05"]
+    assert fc.expenses.values == [700.0, 800.0]  # the trend continues over Jan-Mar
+
+    end = project_month_end(summaries, fc, as_of=as_of)
+    assert (end.month, end.income, end.expenses) == ("2026-04", 1000.0, 350.0)  # nothing yet + 700 x 15/30
@@ -0,0 +1,90 @@
+import json
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from expense_analyzer.parser import load_transactions
+from expense_analyzer.formats import BUILTIN_PROFILES, load_profile, sniff_profile
+
+
+EU_CSV = (
+    "Booking Date;Payee;Amount\n"
+    "02/01/2026;STARBUCKS;-6,45\n"
+    "28/01/2026;SALARY;1.250,00\n"
+)
+
+SPLIT_CSV = (
+    "Date,Description,Debit,Credit\n"
+    '2026-01-05,RENT PAYMENT,"1,200.00",\n'
+    "2026-01-08,SALARY,,2500.00\n"
+)
+
+
+def test_builtin_eu_profile(tmp_path: Path) -> None:
+    path = tmp_path / "eu.csv"
+    path.write_text(EU_CSV.replace("Booking Date;Payee;Amount", "date;description;amount"), encoding="utf-8")
+
+    txns = load_transactions(path, BUILTIN_PROFILES["eu-semicolon"])
+    assert [(t.posted_date, t.amount) for t in txns] == [(date(2026, 1, 2), -6.45), (date(2026, 1, 28), 1250.0)]
+
+
+def test_sniff_semicolon_profile(tmp_path: Path) -> None:
+    path = tmp_path / "eu.csv"
+    path.write_text(EU_CSV, encoding="utf-8")
+
+    profile = sniff_profile(path)
+    assert (profile.delimiter, profile.date_format, profile.decimal_sep, profile.thousands_sep) == (";", "%d/%m/%Y", ",", ".")
+    assert [t.amount for t in load_transactions(path, profile)] == [-6.45, 1250.0]
+
+
+def test_sniff_debit_credit_profile(tmp_path: Path) -> None:
+    path = tmp_path / "split.csv"
+    path.write_text(SPLIT_CSV, encoding="utf-8")
+
+    profile = sniff_profile(path)
+    assert (profile.debit_column, profile.credit_column) == ("Debit", "Credit")
+    assert [t.amount for t in load_transactions(path, profile)] == [-1200.0, 2500.0]
+
+
+def test_profiles_reject_non_finite_amounts(tmp_path: Path) -> None:
+    signed = tmp_path / "signed.csv"
+    signed.write_text("date,description,amount\n2026-01-02,STARBUCKS,nan\n", encoding="utf-8")
+    split = tmp_path / "split.csv"
+    split.write_text("date,description,debit,credit\n2026-01-02,STARBUCKS,5.00,inf\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="Invalid amount on line 2: 'nan'"):
+        load_transactions(signed, BUILTIN_PROFILES["native"])
+    with pytest.raises(ValueError, match="Invalid amount on line 2: 'inf'"):  # names the failing column
+        load_transactions(split, BUILTIN_PROFILES["debit-credit"])
+
+
+@pytest.mark.parametrize(
+    ("fields", "field"),
+    [
+        ({"delimiter": ";;"}, "delimiter"),
+        ({"delimiter": 59}, "delimiter"),
+        ({"date_format": "%d"}, "date_format"),
+        ({"date_column": ["date"]}, "date_column"),
+        ({"amount_column": None}, "amount_column"),
+        ({"decimal_sep": ",", "thousands_sep": ","}, "thousands_sep"),
+        ({"encoding": "no-such-codec"}, "encoding"),
+    ],
+)
+def test_load_profile_validates_each_field(tmp_path: Path, fields: dict, field: str) -> None:
+    path = tmp_path / "bank.json"
+    path.write_text(json.dumps(fields), encoding="utf-8")
+
+    with pytest.raises(ValueError, match=field):
+        load_profile(path)
+
+
+def test_load_profile_accepts_a_split_layout(tmp_path: Path) -> None:
+    path = tmp_path / "bank.json"
+    path.write_text(
+        json.dumps({"delimiter": "\t", "amount_column": None, "debit_column": "out", "credit_column": "in"}),
+        encoding="utf-8",
+    )
+
+    profile = load_profile(path)
+    assert (profile.name, profile.delimiter, profile.debit_column) == ("bank", "\t", "out")
@@ -0,0 +1,41 @@
+import mmap
+from pathlib import Path
+
+import pytest
+
+import expense_analyzer.parallel as parallel
+from expense_analyzer.parser import load_transactions
+
+
+ROWS = (
+    "date,description,amount\n"
+    + "".join(f'2026-01-{i % 28 + 1:02d},"SHOP\n{i}",-{i}.50\n' for i in range(40))
+    + "".join(f"2026-02-{i % 28 + 1:02d},UBER {i},-{i}.25\n" for i in range(40))
+)
+
+
+def test_split_chunks_skips_quoted_newlines(tmp_path: Path) -> None:
+    path = tmp_path / "big.csv"
+    path.write_bytes(ROWS.encode("utf-8"))
+
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header_end = mm.find(b"\n") + 1
+        chunks = parallel.split_chunks(mm, header_end, 7)
+        for start, end, _line in chunks:
+            assert mm[start:end].count(b'"') % 2 == 0
+
+    assert chunks[0][0] == header_end
+    assert chunks[-1][1] == path.stat().st_size
+    assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+
+
+def test_parallel_load_matches_sequential(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(parallel, "MIN_PARALLEL_BYTES", 0)
+    path = tmp_path / "big.csv"
+    path.write_text(ROWS, encoding="utf-8")
+
+    assert parallel.load_transactions_parallel(path, workers=2) == load_transactions(path)
+
+    path.write_text(ROWS + "2026-02-30,BAD DATE,-1.00\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="Invalid date on line 122"):
+        parallel.load_transactions_parallel(path, workers=2)
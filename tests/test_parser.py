@@ -0,0 +1,134 @@
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from expense_analyzer.categorize import enrich_many
+from expense_analyzer.export import write_enriched_csv
+from expense_analyzer.formats import BUILTIN_PROFILES
+from expense_analyzer.parser import (
+    IngestReport,
+    RejectLimitExceeded,
+    Transaction,
+    count_lines,
+    head_transactions,
+    iter_transactions_tolerant,
+    load_transactions,
+    sample_transactions,
+    tail_transactions,
+)
+
+
+CSV_WITH_BAD_ROWS = (
+    "date,description,amount\n"
+    "2026-01-02,STARBUCKS,-6.45\n"
+    "2026-13-01,UBER,-14.20\n"
+    "2026-01-05,,-1200.00\n"
+    "2026-01-08,SALARY,abc\n"
+    "2026-01-10,WHOLE FOODS,-54.18\n"
+)
+
+
+def test_load_transactions_strict_reports_line(tmp_path: Path) -> None:
+    path = tmp_path / "bank.csv"
+    path.write_text(CSV_WITH_BAD_ROWS, encoding="utf-8")
+    with pytest.raises(ValueError, match="Invalid date on line 3"):
+        load_transactions(path)
+
+
+def test_tolerant_ingest_writes_rejects(tmp_path: Path) -> None:
+    path = tmp_path / "bank.csv"
+    rejects = tmp_path / "rejects.csv"
+    path.write_text(CSV_WITH_BAD_ROWS, encoding="utf-8")
+
+    report = IngestReport()
+    txns = list(iter_transactions_tolerant(path, report, rejects))
+
+    assert [t.description for t in txns] == ["STARBUCKS", "WHOLE FOODS"]
+    assert (report.rows_read, report.rejected) == (5, 3)
+    assert report.reasons == {"Invalid date": 1, "Missing value": 1, "Invalid amount": 1}
+    lines = rejects.read_text(encoding="utf-8").splitlines()
+    assert lines[1].startswith("3,Invalid date on line 3")
+    assert lines[3].startswith("5,Invalid amount on line 5")
+
+
+def test_tolerant_ingest_enforces_max_errors(tmp_path: Path) -> None:
+    path = tmp_path / "bank.csv"
+    path.write_text(CSV_WITH_BAD_ROWS, encoding="utf-8")
+    with pytest.raises(RejectLimitExceeded):
+        list(iter_transactions_tolerant(path, IngestReport(), max_errors=2))
+
+
+def test_enriched_export_keeps_merchant_and_category_for_current_ruleset(tmp_path: Path) -> None:
+    path = tmp_path / "export.csv"
+    write_enriched_csv(path, [Transaction(posted_date=date(2026, 1, 2), description="STARBUCKS #1234", amount=-6.45)])
+    # a hand-edited category is trusted because the ruleset matches
+    path.write_text(path.read_text(encoding="utf-8").replace(",Coffee,", ",Treats,"), encoding="utf-8")
+    stale = tmp_path / "stale.csv"
+    stale.write_text(path.read_text(encoding="utf-8").rsplit(",", 1)[0] + ",old\n", encoding="utf-8")
+
+    (txn,) = load_transactions(path)
+    assert (txn.merchant, txn.category) == ("STARBUCKS", "Treats")
+    assert enrich_many([txn]) == (["STARBUCKS"], ["Treats"])
+
+    (old,) = load_transactions(stale)
+    assert old.category is None
+    assert old == txn  # enrichment is not part of equality
+    assert enrich_many([old]) == (["STARBUCKS"], ["Coffee"])
+
+    (profiled,) = load_transactions(path, BUILTIN_PROFILES["native"])
+    assert profiled.category == "Treats"
+
+
+def test_precomputed_uncategorized_uses_alias_fallback(tmp_path: Path) -> None:
+    txn = Transaction(date(2026, 1, 2), "SBUX STORE 1", -11.0, "SBUX STORE", "Uncategorized")
+
+    assert enrich_many([txn], aliases={"SBUX STORE": "STARBUCKS"}) == (["STARBUCKS"], ["Coffee"])
+
+
+def test_head_sample_tail_and_count(tmp_path: Path) -> None:
+    path = tmp_path / "bank.csv"
+    path.write_text(
+        "date,description,amount\n" + "".join(f"2026-01-{d:02d},SHOP {d},-{d}.00\n" for d in range(1, 29)),
+        encoding="utf-8",
+    )
+
+    assert [t.amount for t in head_transactions(path, 2)] == [-1.0, -2.0]
+    assert [t.amount for t in tail_transactions(path, 3)] == [-26.0, -27.0, -28.0]
+    assert len(tail_transactions(path, 100)) == 28
+
+    sample = sample_transactions(path, 5, seed=1)
+    assert len(sample) == 5
+    assert sample == sorted(sample, key=lambda t: t.posted_date)  # file order
+
+    assert count_lines(path) == 29
+
+    path.write_text(path.read_text(encoding="utf-8") + "2026-02-01,SHOP,oops\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="Invalid amount on line 30"):
+        tail_transactions(path, 2)
+
+
+def test_tolerant_ingest_rejects_undecodable_lines(tmp_path: Path) -> None:
+    path = tmp_path / "bank.csv"
+    rejects = tmp_path / "rejects.csv"
+    path.write_bytes(b"date,description,amount\n2026-01-02,CAF\xe9,-3.00\n2026-01-03,UBER,-9.00\n")
+
+    report = IngestReport()
+    txns = list(iter_transactions_tolerant(path, report, rejects))
+
+    assert [t.description for t in txns] == ["UBER"]
+    assert report.reasons == {"Invalid encoding": 1}
+    assert b"CAF\xe9" in rejects.read_bytes()  # original bytes kept
+    with pytest.raises(RejectLimitExceeded):
+        list(iter_transactions_tolerant(path, IngestReport(), max_errors=0))
+
+
+def test_tolerant_ingest_checks_error_rate_at_end_of_file(tmp_path: Path) -> None:
+    path = tmp_path / "bank.csv"
+    path.write_text(
+        "date,description,amount\n" + "2026-01-02,SHOP,oops\n" * 3 + "2026-01-03,UBER,-9.00\n", encoding="utf-8"
+    )
+
+    with pytest.raises(RejectLimitExceeded, match="75.0%"):
+        list(iter_transactions_tolerant(path, IngestReport(), max_error_rate=0.05))
+    assert len(list(iter_transactions_tolerant(path, IngestReport(), max_error_rate=0.8))) == 1
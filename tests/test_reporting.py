@@ -1,4 +1,6 @@
-from expense_analyzer.reporting import write_monthly_summary_json
+import json
+
+from expense_analyzer.reporting import write_consolidated_json, write_monthly_summary_json, write_summaries_ndjson
 from expense_analyzer.analyze import Summary
 from pathlib import Path
 
@@ -16,3 +18,19 @@ def test_write_monthly_summary_json(tmp_path: Path) -> None:
     assert out.exists()
     text = out.read_text(encoding="utf-8")
     assert '"month": "2026-01"' in text
+
+
+def test_consolidated_and_ndjson_reports(tmp_path: Path) -> None:
+    summaries = [
+        Summary(month="2026-01", income_total=1000.0, expense_total=200.0, net_total=800.0, by_category={"Rent": 200.0}),
+        Summary(month="2026-02", income_total=0.0, expense_total=5.0, net_total=-5.0, by_category={"Coffee": 5.0}),
+    ]
+
+    for compact in (False, True):
+        doc = json.loads(write_consolidated_json(tmp_path, summaries, compact=compact).read_text(encoding="utf-8"))
+        assert list(doc) == ["2026-01", "2026-02"]
+        assert doc["2026-02"]["by_category"] == {"Coffee": 5.0}
+
+    lines = write_summaries_ndjson(tmp_path, summaries).read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["month"] for line in lines] == ["2026-01", "2026-02"]
+    assert " " not in lines[0]
@@ -0,0 +1,61 @@
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from expense_analyzer.parser import Transaction
+from expense_analyzer.analyze import build_monthly_summary
+from expense_analyzer.rollup import RollupCube, load_rollup, save_rollup
+
+
+TXNS = [
+    Transaction(date(2026, 1, 2), "STARBUCKS", -6.45),
+    Transaction(date(2026, 1, 8), "SALARY", 2500.0),
+    Transaction(date(2026, 2, 5), "RENT PAYMENT", -1200.0),
+    Transaction(date(2026, 4, 1), "UBER", -14.2),
+]
+
+
+def test_rollup_monthly_matches_build_monthly_summary() -> None:
+    assert RollupCube.build(TXNS).summaries("month") == build_monthly_summary(TXNS)
+
+
+def test_rollup_keeps_zero_total_categories(tmp_path: Path) -> None:
+    txns = [*TXNS, Transaction(date(2026, 2, 9), "NETFLIX", 0.0), Transaction(date(2026, 3, 1), "STARBUCKS", -0.0)]
+    cube = RollupCube.build(txns)
+    path = tmp_path / "cube.rollup"
+    save_rollup(path, cube)
+
+    expected = build_monthly_summary(txns)
+    assert expected["2026-02"].by_category == {"Rent": 1200.0, "Subscriptions": 0.0}
+    assert cube.summaries("month") == expected
+    assert load_rollup(path).summaries("month") == expected
+
+
+def test_rollup_quarters_and_ranges() -> None:
+    cube = RollupCube.build(TXNS)
+
+    quarters = cube.summaries("quarter")
+    assert list(quarters) == ["2026-Q1", "2026-Q2"]
+    assert quarters["2026-Q1"].expense_total == 1206.45
+    assert quarters["2026-Q1"].net_total == 1293.55
+
+    weeks = cube.summaries("week", first=date(2026, 1, 1), last=date(2026, 1, 31))
+    assert list(weeks) == ["2026-W01", "2026-W02"]
+
+
+def test_rollup_save_and_load(tmp_path: Path) -> None:
+    cube = RollupCube.build(TXNS)
+    path = tmp_path / "cube.rollup"
+    save_rollup(path, cube)
+
+    assert load_rollup(path).summaries("year") == cube.summaries("year")
+
+
+def test_load_rollup_rejects_truncated_file(tmp_path: Path) -> None:
+    path = tmp_path / "cube.rollup"
+    save_rollup(path, RollupCube.build(TXNS))
+    path.write_bytes(path.read_bytes()[:-8])
+
+    with pytest.raises(ValueError, match="Truncated"):
+        load_rollup(path)
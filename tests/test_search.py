@@ -0,0 +1,97 @@
+import os
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from expense_analyzer.search import IndexStale, SearchIndex, append_index, load_index, save_index
+
+
+def test_search_index_incremental_and_persisted(tmp_path: Path) -> None:
+    csv_path = tmp_path / "statement.csv"
+    csv_path.write_text(
+        "date,description,amount\n"
+        "2026-01-02,STARBUCKS #1234,-5.00\n"
+        "2026-01-05,Uber Trip,-20.00\n",
+        encoding="utf-8",
+    )
+    index = SearchIndex()
+    assert index.update([csv_path]) == 2
+
+    index_path = tmp_path / "search.idx"
+    save_index(index_path, index)
+
+    with csv_path.open("a", encoding="utf-8") as f:
+        f.write("2026-02-03,STARBUCKS #1234,-7.50\n")
+
+    index = load_index(index_path)
+    assert index.update([csv_path]) == 1  # only the appended row is read
+
+    hits = index.search("starb")
+    assert [(h.posted_date, h.amount) for h in hits] == [(date(2026, 2, 3), -7.5), (date(2026, 1, 2), -5.0)]
+    assert hits[0].merchant == "STARBUCKS"
+
+    assert [h.amount for h in index.search("bucks", min_amount=6)] == [-7.5]
+    assert [h.amount for h in index.search("STAR", last=date(2026, 1, 31))] == [-5.0]
+    assert index.search("ub")[0].description == "Uber Trip"  # short queries scan descriptions
+
+
+def test_append_index_journals_new_rows(tmp_path: Path) -> None:
+    csv_path = tmp_path / "statement.csv"
+    csv_path.write_text("date,description,amount\n2026-01-02,STARBUCKS,-5.00\n", encoding="utf-8")
+    index_path = tmp_path / "search.idx"
+    index = SearchIndex()
+    index.update([csv_path])
+    save_index(index_path, index)
+    size = index_path.stat().st_size
+
+    with csv_path.open("a", encoding="utf-8") as f:
+        f.write("2026-01-03,UBER,-9.00\n")
+    index.update([csv_path])
+    append_index(index_path, index)
+
+    assert index_path.stat().st_size == size  # only the journal grew
+    reloaded = load_index(index_path)
+    assert [h.amount for h in reloaded.search("uber")] == [-9.0]
+    assert reloaded.update([csv_path]) == 0
+
+    csv_path.write_text("date,description,amount\n", encoding="utf-8")
+    with pytest.raises(IndexStale):
+        reloaded.update([csv_path])
+
+
+def test_truncated_index_raises_value_error(tmp_path: Path) -> None:
+    csv_path = tmp_path / "bank.csv"
+    csv_path.write_text("date,description,amount\n2026-01-02,STARBUCKS,-5.00\n", encoding="utf-8")
+    index = SearchIndex()
+    index.update([csv_path])
+    path = tmp_path / "search.idx"
+    save_index(path, index)
+
+    for size in (12, path.stat().st_size - 3):
+        path.write_bytes(path.read_bytes()[:size])
+        with pytest.raises(ValueError, match="Truncated or corrupt"):
+            load_index(path)
+
+
+def test_rewritten_or_removed_statement_makes_index_stale(tmp_path: Path) -> None:
+    a, b = tmp_path / "a.csv", tmp_path / "b.csv"
+    a.write_text("date,description,amount\n2026-01-02,STARBUCKS,-5.00\n", encoding="utf-8")
+    b.write_text("date,description,amount\n2026-01-03,UBER,-9.00\n", encoding="utf-8")
+    index = SearchIndex()
+    index.update([a, b])
+
+    with a.open("a", encoding="utf-8") as f:
+        f.write("2026-01-04,STARBUCKS,-6.00\n")
+    assert index.update([a, b]) == 1  # appending is not a rewrite
+
+    a.write_text(a.read_text(encoding="utf-8").replace("STARBUCKS,-5.00", "PEETS CO,-5.00"), encoding="utf-8")
+    os.utime(a, ns=(0, a.stat().st_mtime_ns + 1))  # same size, new contents
+    with pytest.raises(IndexStale, match="a.csv changed"):
+        index.update([a, b])
+
+    index = SearchIndex()
+    index.update([a, b])
+    b.unlink()
+    with pytest.raises(IndexStale, match="b.csv was removed"):
+        index.update([a])
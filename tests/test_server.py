@@ -0,0 +1,65 @@
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from expense_analyzer.cli import app
+from expense_analyzer.server import ALERT_CACHE_SIZE, Dataset, handle_query
+
+
+def _dataset(tmp_path: Path) -> Dataset:
+    statement = tmp_path / "bank.csv"
+    statement.write_text(
+        "date,description,amount\n2026-01-02,STARBUCKS,-6.45\n2026-01-08,SALARY,2500.00\n",
+        encoding="utf-8",
+    )
+    settings = tmp_path / "settings.json"
+    settings.write_text('{"category_budgets": {"Coffee": 10}}', encoding="utf-8")
+    return Dataset([statement], settings)
+
+
+def test_handle_query_summary_and_budget(tmp_path: Path) -> None:
+    dataset = _dataset(tmp_path)
+
+    status, payload = handle_query(dataset, "/summary?month=2026-01")
+    assert status == 200
+    assert payload["expense_total"] == 6.45
+
+    status, payload = handle_query(dataset, "/budget")
+    coffee = next(c for c in payload["categories"] if c["category"] == "Coffee")
+    assert (coffee["spent"], coffee["budget"], coffee["remaining"]) == (6.45, 10.0, 3.55)
+
+    assert handle_query(dataset, "/summary?month=2026-02")[0] == 404
+    assert handle_query(dataset, "/summary?month=bad")[0] == 400
+
+
+def test_dataset_detects_changed_files(tmp_path: Path) -> None:
+    dataset = _dataset(tmp_path)
+    assert not dataset.is_stale()
+
+    with (tmp_path / "bank.csv").open("a", encoding="utf-8") as f:
+        f.write("2026-02-01,UBER,-10.00\n")
+
+    assert dataset.is_stale()
+    dataset.load()
+    assert handle_query(dataset, "/months") == (200, ["2026-01", "2026-02"])
+
+
+def test_alert_cache_is_bounded(tmp_path: Path) -> None:
+    dataset = _dataset(tmp_path)
+
+    for i in range(ALERT_CACHE_SIZE + 5):
+        assert handle_query(dataset, f"/alerts?min_amount={i}")[0] == 200
+
+    assert len(dataset._alerts) == ALERT_CACHE_SIZE
+    assert (2.5, float(ALERT_CACHE_SIZE + 4), 3) in dataset._alerts  # most recent kept
+
+
+def test_serve_reports_unreadable_statements_as_bad_parameters(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    Path("bad.csv").write_text("date,description,amount\nnot-a-date,SHOP,-1.00\n", encoding="utf-8")
+
+    missing = CliRunner().invoke(app, ["serve", "missing.csv"])
+    bad = CliRunner().invoke(app, ["serve", "bad.csv"])
+
+    assert missing.exit_code == 2 and "File not found: missing.csv" in missing.output
+    assert bad.exit_code == 2 and "Invalid value" in bad.output
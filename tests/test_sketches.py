@@ -0,0 +1,36 @@
+import random
+
+from expense_analyzer.sketches import HeavyHitters, QuantileSketch
+
+
+def test_heavy_hitters_finds_top_merchants_and_merges() -> None:
+    a, b = HeavyHitters(capacity=10), HeavyHitters(capacity=10)
+    for i in range(5000):
+        a.add(f"SHOP {i}", 1.0)
+        b.add(f"OTHER {i}", 1.0)
+    a.add("RENT", 3000.0)
+    b.add("RENT", 3000.0)
+    b.add("GROCER", 2500.0)
+
+    a.merge(b)
+    top = [item for item, _spend in a.top(2)]
+    assert top == ["RENT", "GROCER"]
+    assert a.top(1)[0][1] <= 6000.0
+
+
+def test_quantile_sketch_is_accurate_and_bounded() -> None:
+    rng = random.Random(1)
+    values = [rng.uniform(0, 1000) for _ in range(50_000)]
+
+    left, right = QuantileSketch(k=200), QuantileSketch(k=200)
+    for v in values[:25_000]:
+        left.add(v)
+    for v in values[25_000:]:
+        right.add(v)
+    left.merge(right)
+
+    assert left.count == 50_000
+    assert sum(len(level) for level in left.levels) < 1000
+    exact = sorted(values)
+    for q in (0.5, 0.9, 0.99):
+        assert abs(left.quantile(q) - exact[int(q * len(exact)) - 1]) < 20
@@ -0,0 +1,62 @@
+import os
+from pathlib import Path
+
+from expense_analyzer.watch import StatementWatcher
+
+
+def test_watcher_only_parses_appended_rows(tmp_path: Path) -> None:
+    statement = tmp_path / "bank.csv"
+    statement.write_text("date,description,amount\n2026-01-02,STARBUCKS,-6.45\n", encoding="utf-8")
+
+    watcher = StatementWatcher(tmp_path)
+    assert watcher.poll() == {"2026-01"}
+    assert watcher.poll() == set()
+
+    with statement.open("a", encoding="utf-8") as f:
+        f.write("2026-02-01,UBER,-10.00\n2026-02-03,UBER")  # last line is still being written
+
+    assert watcher.poll() == {"2026-02"}
+    assert watcher.totals.summary("2026-02").expense_total == 10.0
+
+    with statement.open("a", encoding="utf-8") as f:
+        f.write(",-5.00\n")
+
+    assert watcher.poll() == {"2026-02"}
+    assert watcher.totals.summary("2026-02").by_category == {"Transport": 15.0}
+    assert watcher.totals.summary("2026-01").expense_total == 6.45
+
+
+def test_watcher_keeps_rows_when_another_file_fails(tmp_path: Path) -> None:
+    good = tmp_path / "a.csv"
+    bad = tmp_path / "b.csv"
+    good.write_text("date,description,amount\n2026-01-02,STARBUCKS,-6.45\n", encoding="utf-8")
+    bad.write_text("date,description,amount\n2026-01-03,UBER,oops\n", encoding="utf-8")
+
+    watcher = StatementWatcher(tmp_path)
+    assert watcher.poll() == {"2026-01"}
+    assert watcher.totals.summary("2026-01").expense_total == 6.45
+    assert "Invalid amount" in watcher.errors[bad]
+
+    bad.write_text("date,description,amount\n2026-01-03,UBER,-10.00\n", encoding="utf-8")
+    assert watcher.poll() == {"2026-01"}
+    assert watcher.totals.summary("2026-01").expense_total == 16.45
+    assert watcher.errors == {}
+
+    bad.unlink()
+    good.unlink()
+    assert watcher.poll() == {"2026-01"}
+    assert "2026-01" not in watcher.totals
+
+
+def test_watcher_rebuilds_when_a_file_is_rewritten_in_place(tmp_path: Path) -> None:
+    statement = tmp_path / "bank.csv"
+    statement.write_text("date,description,amount\n2026-01-02,STARBUCKS,-6.45\n", encoding="utf-8")
+    watcher = StatementWatcher(tmp_path)
+    watcher.poll()
+
+    statement.write_text("date,description,amount\n2026-02-02,STARBUCKS,-7.45\n", encoding="utf-8")
+    os.utime(statement, ns=(0, statement.stat().st_mtime_ns + 1))  # same size, new contents
+
+    assert watcher.poll() == {"2026-01", "2026-02"}
+    assert "2026-01" not in watcher.totals
+    assert watcher.totals.summary("2026-02").expense_total == 7.45